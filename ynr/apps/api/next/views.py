@@ -25,6 +25,50 @@ class ResultsSetPagination(pagination.PageNumberPagination):
     max_page_size = 100
 
 
+class CursorResultsSetPagination(pagination.CursorPagination):
+    """
+    Keyset pagination, where each page is selected with a `WHERE` on the
+    ordering field rather than an `OFFSET`, and there's no `COUNT(*)`.
+    This makes crawling the whole dataset linear-time.
+
+    The ordering comes from the view's `get_cursor_ordering`.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        return view.get_cursor_ordering()
+
+
+class CursorPaginationMixin:
+    """
+    Lets API users opt in to cursor pagination with `?pagination=cursor`.
+    The `next` and `previous` links keep the parameter, so following them
+    continues with cursor pagination.
+    """
+
+    cursor_pagination_class = CursorResultsSetPagination
+    cursor_ordering = ("id",)
+
+    @property
+    def uses_cursor_pagination(self):
+        request = getattr(self, "request", None)
+        if request is None:
+            return False
+        return request.query_params.get("pagination") == "cursor"
+
+    def get_cursor_ordering(self):
+        return self.cursor_ordering
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator") and self.uses_cursor_pagination:
+            self._paginator = self.cursor_pagination_class()
+        return super().paginator
+
+
 class OrganizationViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = (
         Organization.objects.all()
@@ -37,7 +81,7 @@ class OrganizationViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_class = OrganizationFilter
 
 
-class LoggedActionViewSet(viewsets.ReadOnlyModelViewSet):
+class LoggedActionViewSet(CursorPaginationMixin, viewsets.ReadOnlyModelViewSet):
     queryset = extra_models.LoggedAction.objects.order_by("id")
     serializer_class = candidates.api.next.serializers.LoggedActionSerializer
     pagination_class = ResultsSetPagination
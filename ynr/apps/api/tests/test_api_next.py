@@ -1,9 +1,11 @@
+from candidates.models import Ballot
 from candidates.tests.auth import TestUserMixin
 from candidates.tests.factories import MembershipFactory
 from candidates.tests.helpers import TmpMediaRootMixin
 from candidates.tests.uk_examples import UK2015ExamplesMixin
 from django.core.files.storage import DefaultStorage
 from django_webtest import WebTest
+from mock import patch
 from moderation_queue.tests.paths import EXAMPLE_IMAGE_FILENAME
 from official_documents.models import BallotSOPN
 from parties.models import Party
@@ -166,6 +168,20 @@ class TestAPI(
             result_json["candidacies"][0]["previous_party_affiliations"], []
         )
 
+    def test_person_thumbnail_is_stored(self):
+        self.person_image.update_thumbnail_url()
+        self.person_image.refresh_from_db()
+        self.assertIn("/cache/", self.person_image.thumbnail_url)
+
+        with patch(
+            "people.api.next.serializers.SizeLimitedHyperlinkedSorlImageField"
+        ) as sorl_field:
+            response = self.app.get("/api/next/people/2009/")
+        sorl_field.assert_not_called()
+        self.assertEqual(
+            response.json["thumbnail"], self.person_image.thumbnail_url
+        )
+
     def test_all_parties_view(self):
         self.maxDiff = None
         # Test with GB register
@@ -269,6 +285,21 @@ class TestAPI(
             },
         )
 
+    def test_ballots_cursor_pagination(self):
+        ballot_ids = []
+        url = "/api/next/ballots/?pagination=cursor&page_size=2"
+        while url:
+            data = self.app.get(url).json
+            self.assertNotIn("count", data)
+            ballot_ids += [
+                ballot["ballot_paper_id"] for ballot in data["results"]
+            ]
+            url = data["next"]
+        self.assertEqual(
+            sorted(ballot_ids),
+            sorted(Ballot.objects.values_list("ballot_paper_id", flat=True)),
+        )
+
     def test_sopn_on_ballot(self):
         BallotSOPN.objects.create(
             ballot=self.dulwich_post_ballot,
@@ -3,6 +3,9 @@ from datetime import datetime
 from os.path import join
 
 from api.v09.serializers import ImageSerializer
+from candidates.management.commands.candidates_cache_api_to_directory import (
+    PageWriter,
+)
 from candidates.models import LoggedAction, PersonRedirect
 from candidates.models.db import ActionType
 from candidates.tests.auth import TestUserMixin
@@ -406,6 +409,64 @@ class TestAPI(
             "https://candidates.democracyclub.org.uk/api/next/people/818/?format=json",
         )
 
+    @patch(
+        "candidates.management.commands.candidates_cache_api_to_directory.datetime"
+    )
+    def test_cache_api_to_directory_resume(self, mock_datetime):
+        mock_datetime.now.return_value = datetime(2017, 5, 14, 12, 33, 5, 0)
+        directory = join("cached-api", "2017-05-14T12:33:05")
+
+        # Interrupt the run after the first page of ballots
+        write_page = PageWriter.write_page
+
+        def write_one_ballot_page(writer, endpoint, page_number, *args):
+            if endpoint == "ballots" and page_number > 1:
+                raise KeyboardInterrupt()
+            return write_page(writer, endpoint, page_number, *args)
+
+        with patch.object(
+            PageWriter, "write_page", write_one_ballot_page
+        ), self.assertRaises(KeyboardInterrupt):
+            call_command(
+                "candidates_cache_api_to_directory",
+                page_size="3",
+                url_prefix="https://example.com/media/api-cache-for-wcivf",
+            )
+        self.assertTrue(
+            self.storage.exists(join(directory, ".ballots-pages.json"))
+        )
+        self.assertFalse(
+            self.storage.exists(join(directory, "ballots-000002.json"))
+        )
+
+        mock_datetime.now.return_value = datetime(2017, 5, 14, 13, 0, 0, 0)
+        call_command(
+            "candidates_cache_api_to_directory",
+            page_size="3",
+            url_prefix="https://example.com/media/api-cache-for-wcivf",
+            resume=True,
+        )
+        self.assertEqual(
+            set(self.storage.listdir(directory)[1]),
+            {
+                "people-000001.json",
+                "people-000002.json",
+                "ballots-000001.json",
+                "ballots-000002.json",
+                "ballots-000003.json",
+                "ballots-000004.json",
+            },
+        )
+        with self.storage.open(join(directory, "ballots-000004.json")) as f:
+            ballots_4_data = json.loads(f.read().decode("utf8"))
+        self.assertEqual(
+            ballots_4_data["previous"],
+            "https://example.com/media/api-cache-for-wcivf/2017-05-14T12:33:05/ballots-000003.json",
+        )
+        self.assertFalse(
+            self.storage.exists(join("cached-api", "2017-05-14T13:00:00"))
+        )
+
     def _setup_cached_api_directory(self, dir_list):
         """
         Saves a tmp file in settings.MEDIA_ROOT, called `.keep` in each
@@ -9,6 +9,9 @@ from candidates.tests.factories import (
 )
 from candidates.tests.uk_examples import UK2015ExamplesMixin
 from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django_webtest import WebTest
 from elections.uk.tests.ee_postcode_results import (
     ee_se240ag_result,
@@ -74,7 +77,7 @@ class TestUpcomingElectionsAPI(UK2015ExamplesMixin, WebTest):
         london_assembly = ParliamentaryChamberFactory.create(
             slug="london-assembly", name="London Assembly"
         )
-        election_lac = ElectionFactory.create(
+        self.election_lac = election_lac = ElectionFactory.create(
             slug="gla.c.2016-05-05",
             organization=london_assembly,
             name="2016 London Assembly Election (Constituencies)",
@@ -234,6 +237,65 @@ class TestUpcomingElectionsAPI(UK2015ExamplesMixin, WebTest):
 
         self.assertEqual(expected, output)
 
+    def _add_candidates(self, count):
+        ballots = [
+            self.election_lac.ballot_set.get(),
+            self.election_gla.ballot_set.get(post=self.post),
+        ]
+        for ballot in ballots:
+            for i in range(count):
+                person = PersonFactory.create()
+                person.other_names.create(name=f"{person.name} {i}")
+                MembershipFactory.create(
+                    person=person,
+                    post=ballot.post,
+                    party=self.labour_party,
+                    ballot=ballot,
+                )
+
+    def _count_candidates_for_postcode_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.app.get("/api/v0.9/candidates_for_postcode/?postcode=SE24+0AG")
+        return len(queries)
+
+    def test_candidates_for_postcode_query_count(self, mock_requests):
+        mock_requests.get.side_effect = fake_requests_for_every_election
+        self._setup_data()
+        self._add_candidates(1)
+        one_candidate = self._count_candidates_for_postcode_queries()
+        self._add_candidates(3)
+        four_candidates = self._count_candidates_for_postcode_queries()
+        self.assertEqual(one_candidate, four_candidates)
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+            }
+        }
+    )
+    def test_candidates_for_postcode_cached(self, mock_requests):
+        mock_requests.get.side_effect = fake_requests_for_every_election
+        self._setup_data()
+        self._add_candidates(2)
+        url = "/api/v0.9/candidates_for_postcode/?postcode=SE24+0AG"
+        uncached_queries = self._count_candidates_for_postcode_queries()
+        first = self.app.get(url).json
+        cached_queries = self._count_candidates_for_postcode_queries()
+        self.assertLess(cached_queries, uncached_queries)
+        self.assertEqual(self.app.get(url).json, first)
+
+        # Changing a candidate means the ballot is serialized again
+        ballot = self.election_gla.ballot_set.get(post=self.post)
+        person = ballot.membership_set.first().person
+        person.name = "New Name"
+        person.save()
+        output = self.app.get(url).json
+        self.assertIn(
+            "New Name",
+            [candidate["name"] for candidate in output[1]["candidates"]],
+        )
+
 
 class TestCurrentElections(UK2015ExamplesMixin, WebTest):
     def test_future_flag(self):
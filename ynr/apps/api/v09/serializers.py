@@ -356,10 +356,10 @@ class PersonSerializer(MinimalPersonSerializer):
             "other_url": "other_url",
         }
         pi_types_to_notes = {v: k for k, v in notes_tp_pi_types.items()}
-        qs = obj.tmp_person_identifiers.filter(
-            value_type__in=pi_types_to_notes.values()
-        )
-        for pi in qs:
+        # Filter in Python so prefetched identifiers can be used
+        for pi in obj.get_all_identifiers:
+            if pi.value_type not in pi_types_to_notes:
+                continue
             links.append(
                 {"note": pi_types_to_notes[pi.value_type], "url": pi.value}
             )
@@ -1,4 +1,5 @@
 # v0.9 is legacy code: Code in this app should not be edited, but can be used as a reference for new code.
+import hashlib
 import json
 import subprocess
 import sys
@@ -11,7 +12,8 @@ from api.v09 import serializers
 from candidates import models as extra_models
 from dateutil import parser
 from django.contrib.auth.models import User
-from django.db.models import Count, Prefetch, Q
+from django.core.cache import cache
+from django.db.models import Count, Max, Prefetch, Q
 from django.http import Http404, HttpResponse, HttpResponsePermanentRedirect
 from django.views.generic import View
 from elections.models import Election
@@ -27,6 +29,11 @@ from rest_framework.reverse import reverse
 from rest_framework.viewsets import ViewSet
 from ynr_refactoring.views import get_changed_election_slug
 
+# The serialized candidates for a ballot are cached against the last time
+# its memberships and people were modified, but the people's other
+# memberships aren't tracked, so don't keep them for too long
+CANDIDATES_FOR_POSTCODE_CACHE_SECONDS = 60 * 10
+
 
 def parse_date(date_text):
     if date_text == "today":
@@ -107,31 +114,13 @@ class CandidatesAndElectionsForPostcodeViewSet(ViewSet):
             return self._error(str(e))
 
         results = []
-        ballots = ballots.select_related(
-            "post__organization", "election"
-        ).order_by("-ballot_paper_id")
+        ballots = list(
+            ballots.select_related("post__organization", "election").order_by(
+                "-ballot_paper_id"
+            )
+        )
+        candidates_by_ballot = self.get_candidates_by_ballot(request, ballots)
         for ballot in ballots:
-            candidates = []
-            for membership in (
-                ballot.membership_set.filter(ballot__election=ballot.election)
-                .prefetch_related(
-                    Prefetch(
-                        "person__memberships",
-                        Membership.objects.select_related(
-                            "party", "post", "ballot__election"
-                        ),
-                    ),
-                    "person__other_names",
-                )
-                .select_related("person", "person__image")
-            ):
-                candidates.append(
-                    serializers.NoVersionPersonSerializer(
-                        instance=membership.person,
-                        context={"request": request},
-                        read_only=True,
-                    ).data
-                )
             election = {
                 "election_date": str(ballot.election.election_date),
                 "election_name": ballot.election.name,
@@ -142,13 +131,101 @@ class CandidatesAndElectionsForPostcodeViewSet(ViewSet):
                     "post_candidates": None,
                 },
                 "organization": ballot.post.organization.name,
-                "candidates": candidates,
+                "candidates": candidates_by_ballot[ballot.pk],
             }
 
             results.append(election)
 
         return Response(results)
 
+    def get_candidates_cache_keys(self, request, ballots):
+        """
+        A cache key for each ballot's serialized candidates, that changes
+        when a membership or person on the ballot is modified or a
+        membership is added or removed
+        """
+        watermarks = {
+            row["ballot_id"]: row
+            for row in Membership.objects.filter(ballot__in=ballots)
+            .order_by()
+            .values("ballot_id")
+            .annotate(
+                count=Count("pk"),
+                membership_modified=Max("modified"),
+                person_modified=Max("person__modified"),
+            )
+        }
+        cache_keys = {}
+        for ballot in ballots:
+            watermark = watermarks.get(ballot.pk, {})
+            # The serialized data has absolute URLs, so depends on the host
+            version = ":".join(
+                [
+                    request.build_absolute_uri("/"),
+                    str(watermark.get("count", 0)),
+                    str(watermark.get("membership_modified")),
+                    str(watermark.get("person_modified")),
+                ]
+            )
+            cache_keys[ballot.pk] = "candidates-for-postcode:{}:{}".format(
+                ballot.pk, hashlib.md5(version.encode()).hexdigest()
+            )
+        return cache_keys
+
+    def get_candidates_by_ballot(self, request, ballots):
+        """
+        The serialized candidates for each ballot, from the cache or from a
+        single fetch of the memberships on all the uncached ballots
+        """
+        cache_keys = self.get_candidates_cache_keys(request, ballots)
+        cached = cache.get_many(cache_keys.values())
+        candidates_by_ballot = {
+            ballot_id: cached[cache_key]
+            for ballot_id, cache_key in cache_keys.items()
+            if cache_key in cached
+        }
+        uncached_ballots = [
+            ballot
+            for ballot in ballots
+            if ballot.pk not in candidates_by_ballot
+        ]
+        if not uncached_ballots:
+            return candidates_by_ballot
+
+        for ballot in uncached_ballots:
+            candidates_by_ballot[ballot.pk] = []
+        memberships = (
+            Membership.objects.filter(ballot__in=uncached_ballots)
+            .prefetch_related(
+                Prefetch(
+                    "person__memberships",
+                    Membership.objects.select_related(
+                        "party", "post", "ballot__election"
+                    ),
+                ),
+                "person__other_names",
+                "person__tmp_person_identifiers",
+            )
+            .select_related("person", "person__image__uploading_user")
+        )
+        for membership in memberships:
+            candidates_by_ballot[membership.ballot_id].append(
+                serializers.NoVersionPersonSerializer(
+                    instance=membership.person,
+                    context={"request": request},
+                    read_only=True,
+                ).data
+            )
+
+        cache.set_many(
+            {
+                cache_keys[ballot.pk]: candidates_by_ballot[ballot.pk]
+                for ballot in uncached_ballots
+            },
+            CANDIDATES_FOR_POSTCODE_CACHE_SECONDS,
+        )
+        return candidates_by_ballot
+
 
 class CurrentElectionsView(View):
     http_method_names = ["get"]
@@ -205,14 +282,20 @@ class VersionView(View):
 # Now the django-rest-framework based API views:
 class PersonViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
-        queryset = Person.objects.prefetch_related(
-            Prefetch(
-                "memberships",
-                Membership.objects.select_related("party", "post"),
-            ),
-            "memberships__ballot__election",
-            "other_names",
-        ).order_by("id")
+        queryset = (
+            Person.objects.prefetch_related(
+                Prefetch(
+                    "memberships",
+                    Membership.objects.select_related("party", "post"),
+                ),
+                "memberships__ballot__election",
+                "other_names",
+                "version_set",
+            )
+            .select_related("image")
+            .defer("name_search_vector")
+            .order_by("id")
+        )
         date_qs = self.request.query_params.get("updated_gte", None)
         if date_qs:
             date = parser.parse(date_qs)
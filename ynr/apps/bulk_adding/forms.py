@@ -1,8 +1,10 @@
 from django import forms
 from django.core.exceptions import ValidationError
 from django.db.models import Prefetch
+from django.utils.functional import cached_property
 from django.utils.safestring import SafeText, mark_safe
 from elections.models import Election
+from official_documents.models import OfficialDocument
 from parties.forms import (
     PartyIdentifierField,
     PopulatePartiesMixin,
@@ -15,7 +17,7 @@ from people.forms.fields import (
     ValidBallotField,
 )
 from popolo.models import Membership
-from search.utils import search_person_by_name
+from search.utils import search_people_by_names, search_person_by_name
 
 
 class BaseBulkAddFormSet(forms.BaseFormSet):
@@ -98,23 +100,49 @@ class BulkAddFormSet(BaseBulkAddFormSet):
 
 
 class BaseBulkAddReviewFormSet(BaseBulkAddFormSet):
+    def person_names(self):
+        """
+        The names in each form, read from the submitted data or initial data
+        so that it can be used before the forms are built
+        """
+        if self.is_bound:
+            return [
+                self.data.get(f"{self.add_prefix(index)}-name")
+                for index in range(self.total_form_count())
+            ]
+        return [initial.get("name") for initial in self.initial or []]
+
+    @cached_property
+    def suggestions(self):
+        """
+        Suggested people for every name in the formset, found with a single
+        search rather than one per form
+        """
+        names = [name for name in self.person_names() if name]
+        return search_people_by_names(names, synonym=True)
+
     def suggested_people(self, person_name):
-        if person_name:
-            qs = search_person_by_name(
-                person_name, synonym=True
-            ).prefetch_related(
-                Prefetch(
-                    "memberships",
-                    queryset=Membership.objects.select_related(
-                        "party",
-                        "ballot",
-                        "ballot__election",
-                        "ballot__election__organization",
-                    ),
+        if not person_name:
+            return None
+        if person_name in self.suggestions:
+            return self.suggestions[person_name]
+        qs = search_person_by_name(person_name, synonym=True).prefetch_related(
+            Prefetch(
+                "memberships",
+                queryset=Membership.objects.select_related(
+                    "party",
+                    "ballot",
+                    "ballot__post",
+                    "ballot__election",
+                    "ballot__election__organization",
                 ),
-            )
-            return qs[:5]
-        return None
+            ),
+            Prefetch(
+                "memberships__ballot__officialdocument_set",
+                queryset=OfficialDocument.objects.order_by("pk"),
+            ),
+        )
+        return qs[:5]
 
     def format_value(
         self,
@@ -131,13 +159,13 @@ class BaseBulkAddReviewFormSet(BaseBulkAddFormSet):
             name = mark_safe(f"<strong>{name}</strong>")
         suggestion_dict = {"name": name, "object": suggestion}
 
-        candidacies = (
-            suggestion.memberships.select_related(
-                "ballot__post", "ballot__election", "party"
-            )
-            .select_related("ballot__sopn")
-            .order_by("-ballot__election__election_date")[:3]
-        )
+        # Memberships and their ballots' documents are prefetched with the
+        # suggestions
+        candidacies = sorted(
+            suggestion.memberships.all(),
+            key=lambda candidacy: candidacy.ballot.election.election_date,
+            reverse=True,
+        )[:3]
 
         if candidacies:
             suggestion_dict["previous_candidacies"] = []
@@ -158,7 +186,9 @@ class BaseBulkAddReviewFormSet(BaseBulkAddFormSet):
                 election=election_str,
                 party=party_str,
             )
-            sopn = candidacy.ballot.officialdocument_set.first()
+            # The documents are prefetched in pk order, so this is the same
+            # as `first()` without another query
+            sopn = next(iter(candidacy.ballot.officialdocument_set.all()), None)
             if sopn:
                 text += ' (<a href="{0}">SOPN</a>)'.format(
                     sopn.get_absolute_url()
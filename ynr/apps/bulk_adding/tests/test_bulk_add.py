@@ -129,7 +129,7 @@ class TestBulkAdding(TestUserMixin, UK2015ExamplesMixin, WebTest):
             description="Green Party Stop Fracking Now", party=self.green_party
         )
 
-        with self.assertNumQueries(22):
+        with self.assertNumQueries(20):
             response = self.app.get(
                 "/bulk_adding/sopn/parl.65808.2015-05-07/", user=self.user
             )
@@ -157,7 +157,7 @@ class TestBulkAdding(TestUserMixin, UK2015ExamplesMixin, WebTest):
         # make it lower and at least make sure it's not getting bigger.
         #
         # [1]: https://github.com/DemocracyClub/yournextrepresentative/pull/467#discussion_r179186705
-        with self.assertNumQueries(FuzzyInt(49, 53)):
+        with self.assertNumQueries(FuzzyInt(63, 67)):
             response = form.submit()
 
         self.assertEqual(Person.objects.count(), 1)
@@ -240,7 +240,7 @@ class TestBulkAdding(TestUserMixin, UK2015ExamplesMixin, WebTest):
             ballot=self.senedd_ballot,
             uploaded_file="sopn.pdf",
         )
-        with self.assertNumQueries(23):
+        with self.assertNumQueries(21):
             response = self.app.get(
                 f"/bulk_adding/sopn/{self.senedd_ballot.ballot_paper_id}/",
                 user=self.user,
@@ -265,7 +265,7 @@ class TestBulkAdding(TestUserMixin, UK2015ExamplesMixin, WebTest):
         form["form-0-select_person"].select("_new")
 
         # this is a smaller increase but may be unavoidable
-        with self.assertNumQueries(FuzzyInt(53, 58)):
+        with self.assertNumQueries(FuzzyInt(67, 71)):
             response = form.submit()
 
         self.assertEqual(Person.objects.count(), 1)
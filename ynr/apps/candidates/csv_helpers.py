@@ -1,7 +1,10 @@
+import csv
+import io
 from collections import defaultdict
 
 from candidates.models import PersonRedirect
 from django.conf import settings
+from django.core.files.storage import DefaultStorage
 from popolo.models import Membership
 from utils.dict_io import BufferDictWriter
 
@@ -15,6 +18,59 @@ def list_to_csv(membership_list):
     return writer.output
 
 
+class StorageCSVWriter:
+    """
+    Write CSV rows to a file in Django's storage backend as they're made,
+    rather than building the whole file in memory first.
+
+    Rows are buffered and written to the file in chunks of roughly
+    `buffer_size` characters.
+
+    If using S3 (via Django Storages) the file is atomically written when the
+    file is closed. That is, the file can be opened and written to but
+    nothing changes at the public S3 URL until the object is closed. Meaning
+    it's not possible to have a half written file.
+
+    If not using S3, there will be a short time where the file is partially
+    written.
+    """
+
+    def __init__(
+        self, filename, fieldnames=None, storage=None, buffer_size=64 * 1024
+    ):
+        self.filename = filename
+        self.buffer_size = buffer_size
+        self.rows_written = 0
+        storage = storage or DefaultStorage()
+        self.out_file = storage.open(filename, "wb")
+        self.buffer = io.StringIO()
+        self.writer = csv.DictWriter(
+            self.buffer, fieldnames=fieldnames or settings.CSV_ROW_FIELDS
+        )
+        self.writer.writeheader()
+
+    def writerow(self, row):
+        self.writer.writerow(row)
+        self.rows_written += 1
+        if self.buffer.tell() >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        self.out_file.write(self.buffer.getvalue().encode("utf-8"))
+        self.buffer.seek(0)
+        self.buffer.truncate()
+
+    def close(self):
+        self.flush()
+        self.out_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
 def sort_memberships(membership_list):
     return sorted(
         membership_list,
@@ -23,7 +79,16 @@ def sort_memberships(membership_list):
     )
 
 
-def memberships_dicts_for_csv(election_slug=None, post_slug=None):
+def iter_memberships_for_csv(
+    election_slug=None, post_slug=None, chunk_size=4000
+):
+    """
+    Yield `(membership, csv_row)` pairs, ordered by election date, then
+    election slug (descending) and then person ID.
+
+    This means that all the rows for an election, and for an election date,
+    are yielded together.
+    """
     redirects = PersonRedirect.all_redirects_dict()
     memberships = Membership.objects.for_csv()
     if election_slug:
@@ -31,14 +96,24 @@ def memberships_dicts_for_csv(election_slug=None, post_slug=None):
     if post_slug:
         memberships = memberships.filter(ballot__post__slug=post_slug)
 
+    # Because chunk_size is given, the prefetch_related calls in `for_csv`
+    # are run once per chunk rather than once per membership.
+    # See https://docs.djangoproject.com/en/4.2/ref/models/querysets/#iterator
+    # This keeps the number of queries proportional to the number of chunks
+    for membership in memberships.iterator(chunk_size=chunk_size):
+        yield membership, membership.dict_for_csv(redirects=redirects)
+
+
+def memberships_dicts_for_csv(
+    election_slug=None, post_slug=None, chunk_size=4000
+):
     memberships_by_election = defaultdict(list)
     elected_by_election = defaultdict(list)
 
-    # NB by using iterator this will ignore previous prefetch_related
-    # calls see https://docs.djangoproject.com/en/4.0/ref/models/querysets/#iterator
-    for membership in memberships.iterator(chunk_size=4000):
+    for membership, line in iter_memberships_for_csv(
+        election_slug=election_slug, post_slug=post_slug, chunk_size=chunk_size
+    ):
         election_slug = membership.ballot.election.slug
-        line = membership.dict_for_csv(redirects=redirects)
         memberships_by_election[election_slug].append(line)
         if membership.elected:
             elected_by_election[election_slug].append(line)
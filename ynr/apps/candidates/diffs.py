@@ -164,13 +164,56 @@ def get_parents_version_data(parents, id_to_version):
     return [(None, {})]
 
 
-def get_version_diffs(versions):
+def get_diffs_against_parents(version, parent_ids, id_to_version):
+    """Return a list of diffs of a single version against each of its parents"""
+    data = clean_version_data(version["data"])
+    return [
+        {
+            "parent_version_id": parent_with_data[0],
+            "parent_diff": get_version_diff(
+                clean_version_data(parent_with_data[1]), data
+            ),
+        }
+        for parent_with_data in get_parents_version_data(
+            parent_ids, id_to_version
+        )
+    ]
+
+
+def get_diffs_for_versions(versions, version_ids=None):
+    """Return a dict of version ID to the diffs against that version's parents
+
+    If `version_ids` is given then only those versions are diffed, so the
+    cost is proportional to the number of versions asked for rather than
+    the length of the whole history."""
+    if not versions:
+        return {}
+    id_to_parent_ids = get_versions_parent_map(versions)
+    id_to_version = {v["version_id"]: v for v in versions}
+    if version_ids is None:
+        version_ids = id_to_version.keys()
+    return {
+        version_id: get_diffs_against_parents(
+            id_to_version[version_id],
+            id_to_parent_ids[version_id],
+            id_to_version,
+        )
+        for version_id in version_ids
+        if version_id in id_to_version
+    }
+
+
+def get_version_diffs(versions, stored_diffs=None):
     """Add a diff to each of an array of version dicts
 
     The first version is the most recent; the last is the original
-    version."""
+    version.
+
+    `stored_diffs` is an optional dict of version ID to diffs that have
+    already been calculated. Versions in that dict aren't diffed again."""
     if not versions:
         return []
+    stored_diffs = stored_diffs or {}
     id_to_parent_ids = get_versions_parent_map(versions)
     id_to_version = {v["version_id"]: v for v in versions}
     result = []
@@ -182,17 +225,11 @@ def get_version_diffs(versions):
             version_with_diffs["data"]
         )
         version_with_diffs["parent_version_ids"] = id_to_parent_ids[version_id]
-        version_with_diffs["diffs"] = [
-            {
-                "parent_version_id": parent_with_data[0],
-                "parent_diff": get_version_diff(
-                    clean_version_data(parent_with_data[1]),
-                    version_with_diffs["data"],
-                ),
-            }
-            for parent_with_data in get_parents_version_data(
-                id_to_parent_ids[version_id], id_to_version
+        if version_id in stored_diffs:
+            version_with_diffs["diffs"] = stored_diffs[version_id]
+        else:
+            version_with_diffs["diffs"] = get_diffs_against_parents(
+                v, id_to_parent_ids[version_id], id_to_version
             )
-        ]
         result.append(version_with_diffs)
     return result
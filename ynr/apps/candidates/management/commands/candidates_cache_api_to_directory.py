@@ -1,35 +1,133 @@
 import json
+import multiprocessing
 import re
 from datetime import datetime
 from os.path import join
-from urllib.parse import parse_qs, urlsplit
 
 from django.core.files.base import ContentFile
 from django.core.files.storage import DefaultStorage
-from django.core.management.base import BaseCommand
-from django.test import Client
-
-
-def path_and_query(url):
-    split_url = urlsplit(url)
-    return split_url.path + "?" + split_url.query
-
-
-def page_from_url(url):
-    page_values = parse_qs(urlsplit(url).query).get("page")
-    if page_values:
-        return int(page_values[0])
-    return 1
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import RequestFactory
+from elections.api.next.api_views import BallotViewSet
+from people.api.next.api_views import PersonViewSet
+from rest_framework.renderers import JSONRenderer
 
 
 def page_filename(endpoint, page_number):
     return "{}-{:06d}.json".format(endpoint, page_number)
 
 
+def plan_filename(endpoint):
+    return ".{}-pages.json".format(endpoint)
+
+
 def is_timestamped_dir(directory):
     return re.search(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}$", directory)
 
 
+class PageWriter:
+    """
+    Serialises pages of an API endpoint straight from the viewset's queryset
+    and writes them to storage, without making an HTTP request per page.
+
+    Everything needed is passed to `__init__` so that instances can be
+    pickled and used from a process pool.
+    """
+
+    viewsets = {"people": PersonViewSet, "ballots": BallotViewSet}
+
+    def __init__(self, hostname, secure, url_prefix, timestamp):
+        self.hostname = hostname
+        self.secure = secure
+        self.url_prefix = url_prefix
+        self.timestamp = timestamp
+
+    @property
+    def json_directory(self):
+        return join("cached-api", self.timestamp)
+
+    def get_view(self, endpoint):
+        """
+        Set up a viewset as if it was handling a request for the list
+        endpoint, so that its queryset and serializer (including any
+        hyperlinks) are exactly what the API would use.
+
+        This skips authentication, permissions and throttling, as there's no
+        real request.
+        """
+        viewset = self.viewsets[endpoint]
+        django_request = RequestFactory().get(
+            "/api/next/{}/".format(endpoint),
+            {"format": "json"},
+            SERVER_NAME=self.hostname,
+            secure=self.secure,
+        )
+        view = viewset(
+            action_map={"get": "list"},
+            action="list",
+            args=(),
+            kwargs={"version": "next"},
+            format_kwarg=None,
+        )
+        request = view.initialize_request(django_request)
+        request.version, request.versioning_scheme = view.determine_version(
+            request, version="next"
+        )
+        view.request = request
+        return view
+
+    def get_queryset(self, endpoint):
+        view = self.get_view(endpoint)
+        return view.filter_queryset(view.get_queryset())
+
+    def plan(self, endpoint, page_size):
+        """
+        Work out the primary keys on each page, in the order the API would
+        return them.
+        """
+        pks = list(self.get_queryset(endpoint).values_list("pk", flat=True))
+        pages = [pks[i : i + page_size] for i in range(0, len(pks), page_size)]
+        return {"count": len(pks), "pages": pages or [[]]}
+
+    def link(self, endpoint, page_number, page_count):
+        if page_number < 1 or page_number > page_count:
+            return None
+        filename = page_filename(endpoint, page_number)
+        return "/".join([self.url_prefix, self.timestamp, filename])
+
+    def render_page(self, endpoint, page_number, pks, count, page_count):
+        view = self.get_view(endpoint)
+        queryset = view.filter_queryset(view.get_queryset()).filter(pk__in=pks)
+        serializer = view.get_serializer(queryset, many=True)
+        data = {
+            "count": count,
+            "next": self.link(endpoint, page_number + 1, page_count),
+            "previous": self.link(endpoint, page_number - 1, page_count),
+            "results": serializer.data,
+        }
+        return JSONRenderer().render(data)
+
+    def write_page(self, endpoint, page_number, pks, count, page_count):
+        storage = DefaultStorage()
+        filename = join(
+            self.json_directory, page_filename(endpoint, page_number)
+        )
+        if storage.exists(filename):
+            # Written by an earlier run that we're resuming
+            return page_number
+        storage.save(
+            filename,
+            ContentFile(
+                self.render_page(endpoint, page_number, pks, count, page_count)
+            ),
+        )
+        return page_number
+
+    def __call__(self, task):
+        return self.write_page(*task)
+
+
 class Command(BaseCommand):
     help = "Cache the output of the persons and posts endpoints to a directory"
 
@@ -65,11 +163,33 @@ class Command(BaseCommand):
                 "or any of the 4 most recent)"
             ),
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="How many processes to write pages with",
+        )
+        parser.add_argument(
+            "--resume",
+            nargs="?",
+            const=True,
+            help=(
+                "Finish writing a partially written timestamped directory. "
+                "Pass the directory name, or nothing to resume the most "
+                "recent unfinished one"
+            ),
+        )
 
     def update_latest_page(self, output_directory, endpoint):
         latest_page_location = join(output_directory, "latest")
         file_name = join(latest_page_location, page_filename(endpoint, 1))
-        self.storage.save(file_name, ContentFile(self.first_page_json))
+        with self.storage.open(
+            join(self.json_directory, page_filename(endpoint, 1))
+        ) as first_page:
+            first_page_json = first_page.read()
+        if self.storage.exists(file_name):
+            self.storage.delete(file_name)
+        self.storage.save(file_name, ContentFile(first_page_json))
 
     def prune(self):
         all_dirs = []
@@ -107,75 +227,101 @@ class Command(BaseCommand):
             )
         return url_prefix
 
-    def rewrite_link(self, endpoint, url):
-        if not url:
-            return None
-        page = page_from_url(url)
-        filename = page_filename(endpoint, page)
-        return "/".join([self.url_prefix, self.timestamp, filename])
-
-    def get(self, url):
-        kwargs = {"SERVER_NAME": self.hostname}
-        if self.secure:
-            kwargs["wsgi.url_scheme"] = "https"
-            kwargs["secure"] = True
-        return self.client.get(url, **kwargs)
-
-    def rewrite_next_and_previous_links(self, endpoint, data):
-        data["next"] = self.rewrite_link(endpoint, data["next"])
-        data["previous"] = self.rewrite_link(endpoint, data["previous"])
-
-    def get_api_results_to_directory(self, endpoint, json_directory, page_size):
-        url = "/api/next/{endpoint}/?page_size={page_size}&format=json".format(
-            page_size=page_size, endpoint=endpoint
+    def is_unfinished(self, timestamp):
+        directory = join(self.directory_path, timestamp)
+        return any(
+            self.storage.exists(join(directory, plan_filename(endpoint)))
+            for endpoint in self.endpoints
         )
 
-        while url:
-            page = page_from_url(url)
-            output_filename = join(
-                json_directory, page_filename(endpoint, page)
-            )
-            response = self.get(url)
-            if response.status_code != 200:
-                msg = "Unexpected response {0} from {1}"
-                raise Exception(msg.format(response.status_code, url))
-            data = json.loads(response.content.decode("utf-8"))
-            original_next_url = data["next"]
-            self.rewrite_next_and_previous_links(endpoint, data)
-
-            json_page = json.dumps(data, indent=4, sort_keys=True).encode(
-                "utf8"
-            )
-
-            if page == 1:
-                self.first_page_json = json_page
-
-            self.storage.save(output_filename, ContentFile(json_page))
-
-            # Now make sure the next URL works with the test client:
-            if original_next_url:
-                url = path_and_query(original_next_url)
-            else:
-                url = None
+    def get_resume_timestamp(self, resume):
+        if resume is not True:
+            if not self.is_unfinished(resume):
+                raise CommandError(
+                    "{} isn't an unfinished directory".format(resume)
+                )
+            return resume
+        if not self.storage.exists(self.directory_path):
+            raise CommandError("No unfinished directory to resume")
+        directories = [
+            directory
+            for directory in self.storage.listdir(self.directory_path)[0]
+            if is_timestamped_dir(directory)
+        ]
+        for directory in sorted(directories, reverse=True):
+            if self.is_unfinished(directory):
+                return directory
+        raise CommandError("No unfinished directory to resume")
+
+    def load_plan(self, endpoint):
+        filename = join(self.json_directory, plan_filename(endpoint))
+        with self.storage.open(filename) as f:
+            return json.loads(f.read())
+
+    def save_plan(self, endpoint, plan):
+        filename = join(self.json_directory, plan_filename(endpoint))
+        self.storage.save(filename, ContentFile(json.dumps(plan)))
+
+    def write_pages(self, endpoint, plan, workers):
+        # Only send each worker the pks for its page, not the whole plan
+        page_count = len(plan["pages"])
+        tasks = [
+            (endpoint, page_number, pks, plan["count"], page_count)
+            for page_number, pks in enumerate(plan["pages"], start=1)
+        ]
+        if workers == 1:
+            for task in tasks:
+                self.writer(task)
+            return
+
+        # Child processes need their own database connections
+        connections.close_all()
+        with multiprocessing.get_context("fork").Pool(workers) as pool:
+            for _ in pool.imap_unordered(self.writer, tasks):
+                pass
 
     def handle(self, *args, **options):
-        self.client = Client()
         self.directory_path = "cached-api"
         self.storage = DefaultStorage()
         self.secure = not options.get("http", False)
         self.hostname = options["hostname"]
         self.url_prefix = self.get_url_prefix(options["url_prefix"])
 
-        self.timestamp = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
-        json_directory = join(self.directory_path, self.timestamp)
-
         page_size = options["page_size"]
         if not page_size:
             page_size = 200
+
+        resuming = bool(options["resume"])
+        if resuming:
+            self.timestamp = self.get_resume_timestamp(options["resume"])
+        else:
+            self.timestamp = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+        self.json_directory = join(self.directory_path, self.timestamp)
+
+        self.writer = PageWriter(
+            hostname=self.hostname,
+            secure=self.secure,
+            url_prefix=self.url_prefix,
+            timestamp=self.timestamp,
+        )
+
+        # Work out every page up front so that pages can be written in any
+        # order, and so an interrupted run can be resumed with the same pages
+        plans = {}
         for endpoint in self.endpoints:
-            self.get_api_results_to_directory(
-                endpoint, json_directory, page_size
-            )
+            if resuming and self.storage.exists(
+                join(self.json_directory, plan_filename(endpoint))
+            ):
+                plans[endpoint] = self.load_plan(endpoint)
+            elif not resuming:
+                plans[endpoint] = self.writer.plan(endpoint, page_size)
+                self.save_plan(endpoint, plans[endpoint])
+
+        for endpoint, plan in plans.items():
+            self.write_pages(endpoint, plan, options["workers"])
             self.update_latest_page(self.directory_path, endpoint)
+            self.storage.delete(
+                join(self.json_directory, plan_filename(endpoint))
+            )
         if options["prune"]:
             self.prune()
@@ -1,32 +1,11 @@
-from collections import defaultdict
+import resource
+import time
 
-from candidates.csv_helpers import list_to_csv, memberships_dicts_for_csv
-from django.core.files.storage import DefaultStorage
+from candidates.csv_helpers import StorageCSVWriter, iter_memberships_for_csv
 from django.core.management.base import BaseCommand, CommandError
 from elections.models import Election
 
 
-def safely_write(output_filename, memberships_list):
-    """
-    Use Django's storage backend to write the CSV file to the MEDIA_ROOT.
-
-    If using S3 (via Django Storages) the file is atomically written when the
-    file is closed (when the context manager closes).
-
-    That is, the file can be opened and written to but nothing changes at
-    the public S3 URL until the object is closed. Meaning it's not possible to
-    have a half written file.
-
-    If not using S3, there will be a short time where the file is empty
-    during write.
-    """
-
-    csv = list_to_csv(memberships_list)
-    file_store = DefaultStorage()
-    with file_store.open(output_filename, "wb") as out_file:
-        out_file.write(csv.encode("utf-8"))
-
-
 class Command(BaseCommand):
     help = "Output CSV files for all elections"
 
@@ -44,6 +23,28 @@ class Command(BaseCommand):
     def slug_to_file_name(self, slug):
         return "{}-{}.csv".format(self.output_prefix, slug)
 
+    def open_writer(self, slug):
+        return StorageCSVWriter(self.slug_to_file_name(slug))
+
+    def last_election_date_by_slug_date(self, election_slug=None):
+        """
+        The per date files are named after the date at the end of each
+        election's slug, which isn't always the same as its election date.
+        Return the latest election date for each of those slug dates.
+        """
+        elections = Election.objects.all()
+        if election_slug:
+            elections = elections.filter(slug=election_slug)
+        last_dates = {}
+        for slug, election_date in elections.values_list(
+            "slug", "election_date"
+        ):
+            slug_date = slug.split(".")[-1]
+            last_dates[slug_date] = max(
+                election_date, last_dates.get(slug_date, election_date)
+            )
+        return last_dates
+
     def handle(self, **options):
         if options["election"]:
             try:
@@ -59,42 +60,74 @@ class Command(BaseCommand):
 
         self.options = options
         self.output_prefix = "candidates"
-
-        membership_by_election, elected_by_election = memberships_dicts_for_csv(
+        start = time.monotonic()
+
+        # Memberships are ordered by election date and then election, so
+        # only the file for the current election needs to be open. A per
+        # date file is closed once we're past the last election date with
+        # that slug date. If we're not outputting a single election, all
+        # elections are written to the `all` and `elected-all` files as we
+        # go.
+        last_election_dates = self.last_election_date_by_slug_date(
             election_slug
         )
-        # Write a file per election, optionally adding candidates
-        # We still want a file to exist if there are no candidates yet,
+        election_writer = None
+        date_writers = {}
+        all_writer = None
+        elected_writer = None
+        if not election_slug:
+            all_writer = self.open_writer("all")
+            elected_writer = self.open_writer("elected-all")
+
+        written_election_slugs = set()
+        current_slug = None
+        rows = 0
+        for membership, row in iter_memberships_for_csv(election_slug):
+            election = membership.ballot.election
+            if election.slug != current_slug:
+                if election_writer:
+                    election_writer.close()
+                current_slug = election.slug
+                election_writer = self.open_writer(current_slug)
+                written_election_slugs.add(current_slug)
+                for slug_date in list(date_writers):
+                    if last_election_dates[slug_date] < election.election_date:
+                        date_writers.pop(slug_date).close()
+
+            slug_date = election.slug.split(".")[-1]
+            if slug_date not in date_writers:
+                date_writers[slug_date] = self.open_writer(slug_date)
+
+            election_writer.writerow(row)
+            date_writers[slug_date].writerow(row)
+            if all_writer:
+                all_writer.writerow(row)
+                if membership.elected:
+                    elected_writer.writerow(row)
+            rows += 1
+
+        for writer in (
+            election_writer,
+            *date_writers.values(),
+            all_writer,
+            elected_writer,
+        ):
+            if writer:
+                writer.close()
+
+        # Write a file per election, even if there are no candidates yet,
         # as the files linked to as soon as the election is created
-        election_qs = Election.objects.all()
+        election_qs = Election.objects.exclude(slug__in=written_election_slugs)
         if election_slug:
             election_qs = election_qs.filter(slug=election_slug)
         for election in election_qs.iterator():
-            safely_write(
-                self.slug_to_file_name(election.slug),
-                membership_by_election.get(election.slug, []),
-            )
-
-        # Make a CSV file per election date
-        slugs_by_date = defaultdict(list)
-        for slug in membership_by_election:
-            slugs_by_date[slug.split(".")[-1]].append(slug)
-        for date, slugs in slugs_by_date.items():
-            memberships_for_date = []
-            for slug in slugs:
-                memberships_for_date += membership_by_election[slug]
-            safely_write(self.slug_to_file_name(date), memberships_for_date)
-
-        # If we're not outputting a single election, output all elections
-        if not election_slug:
-            sorted_elections = sorted(
-                membership_by_election.keys(),
-                key=lambda key: key.split(".")[-1],
-            )
-            all_memberships = []
-            all_elected = []
-            for slug in sorted_elections:
-                all_memberships += membership_by_election[slug]
-                all_elected += elected_by_election[slug]
-            safely_write(self.slug_to_file_name("all"), all_memberships)
-            safely_write(self.slug_to_file_name("elected-all"), all_elected)
+            self.open_writer(election.slug).close()
+
+        duration = time.monotonic() - start
+        # ru_maxrss is in kilobytes on Linux
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        self.stdout.write(
+            f"Wrote {rows} rows in {duration:.1f}s "
+            f"({rows / max(duration, 0.001):.0f} rows/sec), "
+            f"peak RSS {peak_rss:.1f}MB"
+        )
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from candidates.models import UserDailyActionCount
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = """
+    Recount the actions each user made on each day, that the leaderboards
+    are made from.
+
+    The counts are kept up to date as actions are made, so this is only
+    needed if actions have been deleted or moved to another user.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Only recount the last DAYS days, including today. "
+            "By default every day is recounted",
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options["days"]:
+            since = timezone.localdate() - timedelta(days=options["days"] - 1)
+        UserDailyActionCount.objects.rebuild(since=since)
+        self.stdout.write(
+            f"{UserDailyActionCount.objects.count()} daily action counts"
+        )
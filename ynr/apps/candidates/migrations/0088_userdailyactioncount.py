@@ -0,0 +1,61 @@
+# Generated by Django 4.2.11 on 2026-10-16 10:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def count_existing_actions(apps, schema_editor):
+    LoggedAction = apps.get_model("candidates", "LoggedAction")
+    UserDailyActionCount = apps.get_model("candidates", "UserDailyActionCount")
+    rows = (
+        LoggedAction.objects.filter(user__isnull=False)
+        .annotate(date=TruncDate("created"))
+        .values("user_id", "date", "action_type")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    UserDailyActionCount.objects.bulk_create(
+        (UserDailyActionCount(**row) for row in rows.iterator()),
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("candidates", "0087_alter_loggedaction_action_type"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserDailyActionCount",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("action_type", models.CharField(max_length=64)),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("user", "date", "action_type")},
+            },
+        ),
+        migrations.RunPython(count_existing_actions, migrations.RunPython.noop),
+    ]
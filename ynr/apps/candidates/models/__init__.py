@@ -6,6 +6,7 @@ from candidates.models.auth import (  # noqa
 from candidates.models.db import (  # noqa
     LoggedAction,
     PersonRedirect,
+    UserDailyActionCount,
 )
 from candidates.models.merge import merge_popit_people  # noqa
 from candidates.models.popolo_extra import (  # noqa
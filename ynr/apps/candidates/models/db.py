@@ -4,9 +4,11 @@ from enum import Enum, unique
 
 from django.contrib.auth.models import User
 from django.contrib.postgres.fields import ArrayField
-from django.db import models, transaction
-from django.db.models import JSONField
+from django.db import connection, models, transaction
+from django.db.models import Count, F, JSONField, Q, Sum
+from django.db.models.functions import TruncDate
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.html import escape
 from django.utils.safestring import mark_safe
 from django_extensions.db.models import TimeStampedModel
@@ -317,6 +319,9 @@ class LoggedAction(models.Model):
             self.version_fields = self.person.version_fields(version_id)
         super().save(**kwargs)
 
+        if not has_initial_pk and self.user_id:
+            UserDailyActionCount.objects.record(self)
+
         if (
             not has_initial_pk
             and self.flagged_type
@@ -326,6 +331,119 @@ class LoggedAction(models.Model):
             transaction.on_commit(post_action_to_slack.s(self.pk).delay)
 
 
+class UserDailyActionCountQuerySet(models.QuerySet):
+    def record(self, logged_action):
+        """
+        Count a new LoggedAction.
+
+        This is a single upsert, so actions by the same user at the same time
+        can't lose counts or fail on the unique constraint.
+        """
+        table = self.model._meta.db_table
+        sql = f"""
+            INSERT INTO {table} (user_id, date, action_type, count)
+            VALUES (%s, %s, %s, 1)
+            ON CONFLICT (user_id, date, action_type)
+            DO UPDATE SET count = {table}.count + 1
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql,
+                [
+                    logged_action.user_id,
+                    timezone.localdate(logged_action.created),
+                    logged_action.action_type,
+                ],
+            )
+
+    def rebuild(self, since=None):
+        """
+        Recount the actions on each day from `since`, or on every day if
+        it's None
+        """
+        actions = LoggedAction.objects.filter(user__isnull=False)
+        counts = self.all()
+        if since:
+            actions = actions.filter(created__date__gte=since)
+            counts = counts.filter(date__gte=since)
+        rows = (
+            actions.annotate(date=TruncDate("created"))
+            .values("user_id", "date", "action_type")
+            .annotate(count=Count("pk"))
+            .order_by()
+        )
+        with transaction.atomic():
+            counts.delete()
+            self.bulk_create(
+                (self.model(**row) for row in rows.iterator()),
+                batch_size=5000,
+            )
+
+    def action_counts(self, user, recent_days=30):
+        """
+        The number of actions of each type `user` has made, in one query.
+
+        As well as a key for each action type (with underscores in place
+        of dashes), this has `total_actions` and `last_months_actions`,
+        the number made in the last `recent_days` days including today.
+        """
+        since = timezone.localdate() - timedelta(days=recent_days - 1)
+        rows = (
+            self.filter(user=user)
+            .values("action_type")
+            .annotate(
+                total=Sum("count"),
+                recent=Sum("count", filter=Q(date__gte=since)),
+            )
+            .order_by()
+        )
+        action_counts = {"total_actions": 0, "last_months_actions": 0}
+        for row in rows:
+            action_counts[row["action_type"].replace("-", "_")] = row["total"]
+            action_counts["total_actions"] += row["total"]
+            action_counts["last_months_actions"] += row["recent"] or 0
+        return action_counts
+
+    def leaderboard(self, since=None, until=None):
+        """
+        The number of edits by each user between the dates `since` and
+        `until` inclusive, most first
+        """
+        qs = self.exclude(action_type=ActionType.SET_CANDIDATE_NOT_ELECTED)
+        if since:
+            qs = qs.filter(date__gte=since)
+        if until:
+            qs = qs.filter(date__lte=until)
+        return (
+            qs.values(username=F("user__username"))
+            .annotate(edit_count=Sum("count"))
+            .order_by("-edit_count", "username")
+        )
+
+
+class UserDailyActionCount(models.Model):
+    """
+    The number of actions of each type a user made on each day.
+
+    This is kept up to date as LoggedActions are created, so leaderboards
+    don't need to count every LoggedAction. The
+    `candidates_rebuild_action_counts` command recounts them.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    date = models.DateField()
+    action_type = models.CharField(max_length=64)
+    count = models.PositiveIntegerField(default=0)
+
+    objects = UserDailyActionCountQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ("user", "date", "action_type")
+
+    def __str__(self):
+        return f"{self.user_id} {self.date} {self.action_type}: {self.count}"
+
+
 class PersonRedirect(TimeStampedModel):
     """This represents a redirection from one person ID to another
 
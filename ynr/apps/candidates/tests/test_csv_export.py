@@ -1,7 +1,12 @@
 from datetime import timedelta
+from io import StringIO
 
 import people.tests.factories
-from candidates.csv_helpers import list_to_csv, memberships_dicts_for_csv
+from candidates.csv_helpers import (
+    StorageCSVWriter,
+    list_to_csv,
+    memberships_dicts_for_csv,
+)
 from candidates.models import PersonRedirect
 from candidates.tests.helpers import TmpMediaRootMixin
 from django.conf import settings
@@ -159,6 +164,21 @@ class CSVTests(TmpMediaRootMixin, TestUserMixin, UK2015ExamplesMixin, TestCase):
             all_members += members
         self.assertEqual(list_to_csv(all_members), example_output)
 
+    def test_csv_prefetches_per_chunk(self):
+        """
+        Regression test to check that the prefetches in `Membership.for_csv`
+        are run for each chunk, rather than being dropped by `iterator()`
+        and run again for every membership.
+        """
+        self.assertEqual(Membership.objects.count(), 4)
+        # 1 query for the redirects, 1 for the memberships, then 2 prefetch
+        # queries for each of the 2 chunks
+        with self.assertNumQueries(6):
+            memberships_dicts, elected = memberships_dicts_for_csv(chunk_size=2)
+        self.assertEqual(
+            sum(len(members) for members in memberships_dicts.values()), 4
+        )
+
     def test_create_csv_management_command(self):
         # An empty media directory
         self.assertEqual(
@@ -181,6 +201,37 @@ class CSVTests(TmpMediaRootMixin, TestUserMixin, UK2015ExamplesMixin, TestCase):
             },
         )
 
+    def test_create_csv_management_command_matches_in_memory_csv(self):
+        memberships_dicts, elected = memberships_dicts_for_csv()
+        all_members = []
+        for members in memberships_dicts.values():
+            all_members += members
+
+        call_command("candidates_create_csv", stdout=StringIO())
+
+        self.assertEqual(
+            self.storage.open("candidates-all.csv").read().decode("utf-8"),
+            list_to_csv(all_members),
+        )
+        self.assertEqual(
+            self.storage.open("candidates-parl.2015-05-07.csv")
+            .read()
+            .decode("utf-8"),
+            list_to_csv(memberships_dicts["parl.2015-05-07"]),
+        )
+
+    def test_storage_csv_writer_flushes_in_chunks(self):
+        with StorageCSVWriter(
+            "chunked.csv", fieldnames=["id", "name"], buffer_size=10
+        ) as writer:
+            for i in range(5):
+                writer.writerow({"id": i, "name": f"Person {i}"})
+        self.assertEqual(writer.rows_written, 5)
+        self.assertEqual(
+            self.storage.open("chunked.csv").read().decode("utf-8"),
+            "id,name\r\n" + "".join(f"{i},Person {i}\r\n" for i in range(5)),
+        )
+
     def test_create_csv_management_command_single_election(self):
         # An empty media directory
         self.assertEqual(
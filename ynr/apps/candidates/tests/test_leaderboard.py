@@ -1,7 +1,14 @@
-from candidates.models import LoggedAction
+from datetime import date
+from io import StringIO
+
+from candidates.models import LoggedAction, UserDailyActionCount
 from candidates.models.db import ActionType
+from candidates.views.mixins import ContributorsMixin
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django_webtest import WebTest
+from freezegun import freeze_time
 from people.tests.factories import PersonFactory
 
 from .auth import TestUserMixin
@@ -79,3 +86,149 @@ class TestLeaderboardView(TestUserMixin, WebTest):
             "9,sjorford,0\r\n"
             "10,TwitterBot,0\r\n",
         )
+
+
+class TestUserDailyActionCount(TestUserMixin, TestCase):
+    def setUp(self):
+        self.user2 = User.objects.create_user(
+            "jane", "jane@example.com", "notagoodpassword"
+        )
+
+    def make_action(self, user, action_type=ActionType.PERSON_UPDATE):
+        return LoggedAction.objects.create(
+            user=user, action_type=action_type, ip_address="127.0.0.1"
+        )
+
+    def get_counts(self):
+        return list(
+            UserDailyActionCount.objects.order_by(
+                "user__username", "date", "action_type"
+            ).values_list("user__username", "date", "action_type", "count")
+        )
+
+    def make_actions(self):
+        with freeze_time("2024-05-01 12:00"):
+            self.make_action(self.user)
+            self.make_action(self.user2)
+        # After midnight in London, but not in UTC
+        with freeze_time("2024-05-31 23:30"):
+            self.make_action(self.user)
+        with freeze_time("2024-06-01 12:00"):
+            self.make_action(self.user)
+            self.make_action(self.user, ActionType.PERSON_CREATE)
+            self.make_action(self.user2)
+            self.make_action(self.user2, ActionType.SET_CANDIDATE_NOT_ELECTED)
+            self.make_action(self.user2, ActionType.SET_CANDIDATE_NOT_ELECTED)
+            # Actions without a user aren't counted
+            self.make_action(None)
+
+    def test_counted_when_actions_are_made(self):
+        self.make_actions()
+        self.assertEqual(
+            self.get_counts(),
+            [
+                ("jane", date(2024, 5, 1), "person-update", 1),
+                ("jane", date(2024, 6, 1), "person-update", 1),
+                ("jane", date(2024, 6, 1), "set-candidate-not-elected", 2),
+                ("john", date(2024, 5, 1), "person-update", 1),
+                ("john", date(2024, 6, 1), "person-create", 1),
+                ("john", date(2024, 6, 1), "person-update", 2),
+            ],
+        )
+
+    def test_counting_is_one_query(self):
+        action = self.make_action(self.user)
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                UserDailyActionCount.objects.record(action)
+        self.assertEqual(UserDailyActionCount.objects.get().count, 3)
+
+    def test_rebuild(self):
+        self.make_actions()
+        counts = self.get_counts()
+        LoggedAction.objects.filter(
+            action_type=ActionType.SET_CANDIDATE_NOT_ELECTED
+        ).delete()
+        UserDailyActionCount.objects.filter(date=date(2024, 5, 1)).update(
+            count=10
+        )
+
+        UserDailyActionCount.objects.rebuild(since=date(2024, 6, 1))
+        self.assertEqual(
+            self.get_counts(),
+            [
+                ("jane", date(2024, 5, 1), "person-update", 10),
+                ("jane", date(2024, 6, 1), "person-update", 1),
+                ("john", date(2024, 5, 1), "person-update", 10),
+                ("john", date(2024, 6, 1), "person-create", 1),
+                ("john", date(2024, 6, 1), "person-update", 2),
+            ],
+        )
+
+        call_command("candidates_rebuild_action_counts", stdout=StringIO())
+        counts.remove(
+            ("jane", date(2024, 6, 1), "set-candidate-not-elected", 2)
+        )
+        self.assertEqual(self.get_counts(), counts)
+
+    def test_leaderboard(self):
+        self.make_actions()
+        leaderboard = UserDailyActionCount.objects.leaderboard
+        self.assertEqual(
+            list(leaderboard()),
+            [
+                {"username": "john", "edit_count": 4},
+                {"username": "jane", "edit_count": 2},
+            ],
+        )
+        self.assertEqual(
+            list(leaderboard(since=date(2024, 6, 1))),
+            [
+                {"username": "john", "edit_count": 3},
+                {"username": "jane", "edit_count": 1},
+            ],
+        )
+        self.assertCountEqual(
+            list(leaderboard(until=date(2024, 5, 31))),
+            [
+                {"username": "john", "edit_count": 1},
+                {"username": "jane", "edit_count": 1},
+            ],
+        )
+
+    @override_settings(
+        LEADERBOARD_WINDOWS=[
+            {"title": "Today", "days": 1},
+            {"title": "May", "since": "2024-05-01", "until": "2024-05-31"},
+        ]
+    )
+    def test_leaderboard_windows(self):
+        self.make_actions()
+        with freeze_time("2024-06-01 18:00"):
+            leaderboards = ContributorsMixin().get_leaderboards()
+        self.assertEqual(
+            [(board["title"], list(board["rows"])) for board in leaderboards],
+            [
+                (
+                    "All Time",
+                    [
+                        {"username": "john", "edit_count": 4},
+                        {"username": "jane", "edit_count": 2},
+                    ],
+                ),
+                (
+                    "Today",
+                    [
+                        {"username": "john", "edit_count": 3},
+                        {"username": "jane", "edit_count": 1},
+                    ],
+                ),
+                (
+                    "May",
+                    [
+                        {"username": "jane", "edit_count": 1},
+                        {"username": "john", "edit_count": 1},
+                    ],
+                ),
+            ],
+        )
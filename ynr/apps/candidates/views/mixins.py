@@ -1,56 +1,43 @@
-from datetime import timedelta
+from datetime import date, timedelta
 
 from dateutil.parser import parse
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import Count, F
 from django.utils import timezone
 
-from ..models import LoggedAction
+from ..models import LoggedAction, UserDailyActionCount
 
 
 class ContributorsMixin(object):
+    def get_leaderboard_windows(self):
+        """
+        The (title, since, until) dates of each leaderboard in
+        `LEADERBOARD_WINDOWS`
+        """
+        today = timezone.localdate()
+        windows = []
+        for window in settings.LEADERBOARD_WINDOWS:
+            if "days" in window:
+                since = today - timedelta(days=window["days"] - 1)
+                until = None
+            else:
+                since = date.fromisoformat(window["since"])
+                until = window.get("until")
+                if until:
+                    until = date.fromisoformat(until)
+            windows.append((window["title"], since, until))
+        return windows
+
     def get_leaderboards(self, all_time=True):
-        result = []
-        boards = [
-            (
-                "In the last week",
-                timezone.now() - timedelta(days=7),
-                timezone.now(),
-            ),
-            # (
-            #     "May 2024 Elections",
-            #     timezone.make_aware(parse("2024-03-01")),
-            #     timezone.make_aware(parse("2024-05-31")),
-            # ),
-            (
-                "Since the 4 July 2024 General Election Announcement",
-                timezone.make_aware(parse("2024-05-22")),
-                timezone.now(),
-            ),
-        ]
+        boards = self.get_leaderboard_windows()
         if all_time:
             boards.insert(0, ("All Time", None, None))
 
+        result = []
         for title, since, until in boards:
-            interesting_actions = LoggedAction.objects.exclude(
-                action_type="set-candidate-not-elected"
+            rows = UserDailyActionCount.objects.leaderboard(
+                since=since, until=until
             )
-
-            if since:
-                qs = interesting_actions.filter(created__gt=since)
-            else:
-                qs = interesting_actions
-
-            if until:
-                qs = qs.filter(created__lt=until)
-
-            rows = (
-                qs.annotate(username=F("user__username"))
-                .values("username")
-                .annotate(edit_count=Count("user"))
-                .order_by("-edit_count")
-            )
-
             leaderboard = {"title": title, "rows": rows[:25]}
             result.append(leaderboard)
         return result
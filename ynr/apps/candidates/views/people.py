@@ -34,7 +34,6 @@ from popolo.models import NotStandingValidationError
 
 from ynr.apps.people.merging import InvalidMergeError, PersonMerger
 
-from ..diffs import get_version_diffs
 from ..models import (
     TRUSTED_TO_MERGE_GROUP_NAME,
     Ballot,
@@ -162,12 +161,8 @@ class RevertPersonView(LoginRequiredMixin, View):
 
         with transaction.atomic():
             person = get_object_or_404(Person, id=person_id)
-            versions = person.versions
-            data_to_revert_to = None
-            for version in versions:
-                if version["version_id"] == version_id:
-                    data_to_revert_to = version["data"]
-                    break
+            version = person.version_set.filter(version_id=version_id).first()
+            data_to_revert_to = version.data if version else None
 
             if not data_to_revert_to:
                 message = "Couldn't find the version {0} of person {1}"
@@ -439,7 +434,7 @@ class UpdatePersonView(LoginRequiredMixin, ProcessInlineFormsMixin, UpdateView):
         context["current_locked_ballots"] = person.memberships.filter(
             ballot__election__current=True, ballot__candidates_locked=True
         )
-        context["versions"] = get_version_diffs(person.versions)
+        context["versions"] = person.version_diffs
 
         return context
 
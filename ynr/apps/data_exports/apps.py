@@ -16,12 +16,16 @@ def create_materialized_view_when_migrations_disabled(**kwargs):
 
     """
     if settings.MIGRATION_MODULES.__class__.__name__ == "DisableMigrations":
-        migration = importlib.import_module(
-            "data_exports.migrations.0002_create_sql", package=None
-        )
+        for migration_name in (
+            "0002_create_sql",
+            "0003_materialized_memberships_unique_index",
+        ):
+            migration = importlib.import_module(
+                f"data_exports.migrations.{migration_name}", package=None
+            )
 
-        with connection.cursor() as cursor:
-            cursor.execute(migration.SQL_STR)
+            with connection.cursor() as cursor:
+                cursor.execute(migration.SQL_STR)
 
 
 class DataExportsConfig(AppConfig):
@@ -31,3 +35,4 @@ class DataExportsConfig(AppConfig):
         post_migrate.connect(
             create_materialized_view_when_migrations_disabled, sender=self
         )
+        import data_exports.signals  # noqa
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from data_exports.models import MaterializedMemberships
 from django.core.management.base import BaseCommand
 
@@ -5,5 +7,51 @@ from django.core.management.base import BaseCommand
 class Command(BaseCommand):
     help = "Updates the MaterializedMemberships materialized view"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--if-requested",
+            action="store_true",
+            help=(
+                "Only refresh if the underlying data has changed and there "
+                "have been no more changes for --debounce seconds, or if the "
+                "view is older than --max-age seconds"
+            ),
+        )
+        parser.add_argument(
+            "--debounce",
+            type=int,
+            default=60,
+            help="Seconds without edits to wait for before refreshing",
+        )
+        parser.add_argument(
+            "--max-age",
+            type=int,
+            default=15 * 60,
+            help="Always refresh a view that was refreshed this many seconds ago",
+        )
+        parser.add_argument(
+            "--blocking",
+            action="store_true",
+            help=(
+                "Use a plain REFRESH rather than REFRESH CONCURRENTLY. This is "
+                "faster, but blocks reads from the view while it runs"
+            ),
+        )
+
     def handle(self, *args, **options):
-        MaterializedMemberships.refresh_view()
+        if options["if_requested"]:
+            refreshed = MaterializedMemberships.refresh_if_requested(
+                debounce=timedelta(seconds=options["debounce"]),
+                max_age=timedelta(seconds=options["max_age"]),
+            )
+        else:
+            MaterializedMemberships.refresh_view(
+                concurrently=not options["blocking"]
+            )
+            refreshed = True
+
+        if refreshed and options["verbosity"] > 1:
+            status = MaterializedMemberships.refresh_status()
+            self.stdout.write(
+                f"Refreshed in {status.duration.total_seconds():.2f}s"
+            )
@@ -0,0 +1,27 @@
+"""
+Add a unique index to the materialized view.
+
+Postgres needs a unique index on a materialized view before it can be
+refreshed with `REFRESH MATERIALIZED VIEW CONCURRENTLY`, which allows reading
+from the view while it's being refreshed.
+
+Any later migration that re-creates the view needs to re-create this index.
+
+"""
+
+from django.db import migrations
+
+SQL_STR = """
+CREATE UNIQUE INDEX IF NOT EXISTS materialized_memberships_id_idx
+ON materialized_memberships (id);
+"""
+
+REVERSE_SQL_STR = """
+DROP INDEX IF EXISTS materialized_memberships_id_idx;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [("data_exports", "0002_create_sql")]
+
+    operations = [migrations.RunSQL(SQL_STR, REVERSE_SQL_STR)]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.11 on 2024-05-20 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("data_exports", "0003_materialized_memberships_unique_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MaterializedViewRefresh",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("view_name", models.CharField(max_length=255, unique=True)),
+                ("requested_at", models.DateTimeField(null=True)),
+                ("refresh_started_at", models.DateTimeField(null=True)),
+                ("refreshed_at", models.DateTimeField(null=True)),
+                ("duration", models.DurationField(null=True)),
+            ],
+        ),
+    ]
@@ -1,23 +1,126 @@
-from typing import List, Optional, TextIO
+import time
+from datetime import timedelta
+from typing import Iterator, List, Optional, TextIO
 
 from data_exports.csv_fields import csv_fields, get_core_fieldnames
 from django.db import connection, models, transaction
 from django.db.models import Count, IntegerField, JSONField
 from django.db.models.expressions import Case, When
 from django.db.models.functions import Coalesce
+from django.utils import timezone
 from utils.db import LastWord, NullIfBlank
 from ynr_refactoring.settings import PersonIdentifierFields
 
 
+class MaterializedViewRefresh(models.Model):
+    """
+    Records when a materialized view was last refreshed, how long that took
+    and when data it depends on last changed.
+
+    `requested_at` is bumped after edits to the underlying tables, and is used
+    to debounce refreshes so that a burst of edits results in a single refresh
+    once things have gone quiet.
+    """
+
+    view_name = models.CharField(max_length=255, unique=True)
+    requested_at = models.DateTimeField(null=True)
+    refresh_started_at = models.DateTimeField(null=True)
+    refreshed_at = models.DateTimeField(null=True)
+    duration = models.DurationField(null=True)
+
+    def __str__(self):
+        return self.view_name
+
+    @property
+    def refresh_pending(self) -> bool:
+        """
+        True if the underlying data has changed since the last refresh started
+        """
+        if not self.requested_at:
+            return False
+        if not self.refresh_started_at:
+            return True
+        return self.requested_at > self.refresh_started_at
+
+    @property
+    def staleness(self) -> Optional[timedelta]:
+        if not self.refresh_started_at:
+            return None
+        return timezone.now() - self.refresh_started_at
+
+
 class MaterializedModelMixin:
     @classmethod
-    @transaction.atomic
-    def refresh_view(cls):
-        with connection.cursor() as cursor:
-            cursor.execute(
-                "REFRESH MATERIALIZED VIEW {}".format(cls._meta.db_table)
+    def refresh_status(cls) -> MaterializedViewRefresh:
+        status, _ = MaterializedViewRefresh.objects.get_or_create(
+            view_name=cls._meta.db_table
+        )
+        return status
+
+    @classmethod
+    def refresh_view(cls, concurrently=True):
+        """
+        Refresh the view, recording how long it took.
+
+        `REFRESH MATERIALIZED VIEW CONCURRENTLY` doesn't take an exclusive
+        lock on the view, so reads can carry on while it runs. It needs a
+        unique index on the view, and is slower than a plain refresh, so pass
+        `concurrently=False` if nothing needs to read the view at the time.
+        """
+        started_at = timezone.now()
+        start = time.monotonic()
+        sql = "REFRESH MATERIALIZED VIEW {}{}".format(
+            "CONCURRENTLY " if concurrently else "", cls._meta.db_table
+        )
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql)
+        MaterializedViewRefresh.objects.update_or_create(
+            view_name=cls._meta.db_table,
+            defaults={
+                "refresh_started_at": started_at,
+                "refreshed_at": timezone.now(),
+                "duration": timedelta(seconds=time.monotonic() - start),
+            },
+        )
+
+    @classmethod
+    def request_refresh(cls):
+        """
+        Mark the view as out of date. This doesn't refresh the view itself,
+        see `refresh_if_requested`.
+        """
+        updated = MaterializedViewRefresh.objects.filter(
+            view_name=cls._meta.db_table
+        ).update(requested_at=timezone.now())
+        if not updated:
+            MaterializedViewRefresh.objects.update_or_create(
+                view_name=cls._meta.db_table,
+                defaults={"requested_at": timezone.now()},
             )
 
+    @classmethod
+    def refresh_if_requested(
+        cls, debounce: timedelta, max_age: Optional[timedelta] = None
+    ) -> bool:
+        """
+        Refresh the view if there have been changes since the last refresh
+        and no more changes in the last `debounce`, or if the last refresh
+        started longer than `max_age` ago.
+
+        Returns True if the view was refreshed.
+        """
+        status = cls.refresh_status()
+        now = timezone.now()
+        quiet = status.refresh_pending and now - status.requested_at >= debounce
+        too_old = max_age is not None and (
+            not status.refresh_started_at
+            or now - status.refresh_started_at >= max_age
+        )
+        if not (quiet or too_old):
+            return False
+        cls.refresh_view()
+        return True
+
 
 class MaterializedMembershipsQuerySet(models.QuerySet):
     def _fieldnames(self, extra_fields: Optional[List] = None):
@@ -50,7 +153,7 @@ class MaterializedMembershipsQuerySet(models.QuerySet):
         self._fieldnames(extra_fields)
         return self._with_fields(extra_fields)
 
-    def write_csv(self, file_like: TextIO, extra_fields: Optional[List] = None):
+    def iter_csv(self, extra_fields: Optional[List] = None) -> Iterator[bytes]:
         """
         Asks Postgres to make a CSV for us, rather than using Django/Python to do it.
 
@@ -78,7 +181,9 @@ class MaterializedMembershipsQuerySet(models.QuerySet):
            order. To ensure the orders can be controlled we wrap the ORM query in an outer
            query that selects the fields in the same order as the selected fields.
 
-        :param file_like: a file-like object that copy_expert can write to
+        The CSV is yielded in chunks as Postgres sends them, so the whole file
+        is never held in memory.
+
         :param extra_fields: exrta headers defined in `csv_fields` to add to the CSV
             (core headers always included)
 
@@ -94,8 +199,19 @@ class MaterializedMembershipsQuerySet(models.QuerySet):
         with connection.cursor() as cur:
             sql = cur.mogrify(sql, params)
             with cur.copy(sql) as copy:
-                for row in copy:
-                    file_like.write(row)
+                for chunk in copy:
+                    yield bytes(chunk)
+
+    def write_csv(self, file_like: TextIO, extra_fields: Optional[List] = None):
+        """
+        Write the CSV made by `iter_csv` to a file-like object
+
+        :param file_like: a file-like object that the CSV can be written to
+        :param extra_fields: exrta headers defined in `csv_fields` to add to the CSV
+            (core headers always included)
+        """
+        for chunk in self.iter_csv(extra_fields=extra_fields):
+            file_like.write(chunk)
 
     def percentage_for_fields(self):
         identifier_fields = sorted(pi.name for pi in PersonIdentifierFields)
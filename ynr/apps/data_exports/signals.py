@@ -0,0 +1,27 @@
+from candidates.models import Ballot
+from data_exports.models import MaterializedMemberships
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from parties.models import Party
+from people.models import Person, PersonIdentifier
+from popolo.models import Membership
+
+MEMBERSHIP_VIEW_SOURCES = (Membership, Person, PersonIdentifier, Ballot, Party)
+
+
+def request_materialized_memberships_refresh(sender, **kwargs):
+    """
+    Mark the materialized memberships view as out of date when any of the
+    tables it's made from change.
+
+    The view is refreshed by `update_data_export_view --if-requested` once
+    the edits have stopped for a while, rather than after every change.
+    """
+    if kwargs.get("raw"):
+        return
+    transaction.on_commit(MaterializedMemberships.request_refresh)
+
+
+for model in MEMBERSHIP_VIEW_SOURCES:
+    post_save.connect(request_materialized_memberships_refresh, sender=model)
+    post_delete.connect(request_materialized_memberships_refresh, sender=model)
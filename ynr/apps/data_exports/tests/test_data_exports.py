@@ -1,4 +1,6 @@
 import csv
+import gzip
+from datetime import timedelta
 
 from candidates.models import Ballot
 from candidates.tests.uk_examples import UK2015ExamplesMixin
@@ -8,6 +10,7 @@ from data_exports.templatetags.data_field_value import data_cell
 from django.core.management import call_command
 from django.test import TestCase
 from django.urls import reverse
+from freezegun import freeze_time
 from people.models import Person
 
 
@@ -26,7 +29,7 @@ class TestMaterializedMemberships(UK2015ExamplesMixin, TestCase):
 
     def test_csv_simple_memberships(self):
         req = self.client.get(reverse("data_export"))
-        csv_data = csv_to_dicts(req.content)
+        csv_data = csv_to_dicts(req.getvalue())
         self.assertEqual(
             csv_data.fieldnames,
             get_core_fieldnames(),
@@ -36,14 +39,14 @@ class TestMaterializedMemberships(UK2015ExamplesMixin, TestCase):
         req = self.client.get(
             reverse("data_export") + "?extra_fields=votes_cast"
         )
-        csv_data = csv_to_dicts(req.content)
+        csv_data = csv_to_dicts(req.getvalue())
         self.assertTrue(
             "votes_cast" in csv_data.fieldnames,
         )
 
     def test_random_header_cant_be_added(self):
         req = self.client.get(reverse("data_export") + "?extra_fields=made_up")
-        csv_data = csv_to_dicts(req.content)
+        csv_data = csv_to_dicts(req.getvalue())
         self.assertFalse(
             "made_up" in csv_data.fieldnames,
         )
@@ -55,7 +58,7 @@ class TestMaterializedMemberships(UK2015ExamplesMixin, TestCase):
         MaterializedMemberships.refresh_view()
 
         req = self.client.get(reverse("data_export"))
-        csv_data = csv_to_dicts(req.content)
+        csv_data = csv_to_dicts(req.getvalue())
         expected_person_id = Person.objects.all().first().pk
         self.assertDictEqual(
             next(csv_data),
@@ -116,7 +119,7 @@ class TestMaterializedMemberships(UK2015ExamplesMixin, TestCase):
         MaterializedMemberships.refresh_view()
 
         req = self.client.get(reverse("data_export"))
-        csv_data = csv_to_dicts(req.content)
+        csv_data = csv_to_dicts(req.getvalue())
         headers = list(next(csv_data).keys())
         self.assertListEqual(
             headers,
@@ -136,7 +139,7 @@ class TestMaterializedMemberships(UK2015ExamplesMixin, TestCase):
         )
 
         req = self.client.get(reverse("data_export") + "?field_group=results")
-        csv_data = csv_to_dicts(req.content)
+        csv_data = csv_to_dicts(req.getvalue())
         headers = list(next(csv_data).keys())
         self.assertListEqual(
             headers,
@@ -178,7 +181,7 @@ class TestMaterializedMemberships(UK2015ExamplesMixin, TestCase):
                 "field_group": "election",
             },
         )
-        csv_data = csv_to_dicts(req.content)
+        csv_data = csv_to_dicts(req.getvalue())
         headers = list(next(csv_data).keys())
         self.assertListEqual(
             headers,
@@ -202,3 +205,107 @@ class TestMaterializedMemberships(UK2015ExamplesMixin, TestCase):
                 "organisation_name",
             ],
         )
+
+    def test_csv_is_streamed(self):
+        self.create_lots_of_candidates(
+            self.earlier_election, ((self.labour_party, 16), (self.ld_party, 8))
+        )
+        MaterializedMemberships.refresh_view()
+        req = self.client.get(reverse("data_export"))
+        self.assertTrue(req.streaming)
+        self.assertEqual(req["Content-Type"], "text/csv")
+        csv_data = csv_to_dicts(req.getvalue())
+        self.assertEqual(len(list(csv_data)), 24)
+
+    def test_gzipped_csv(self):
+        self.create_lots_of_candidates(
+            self.earlier_election, ((self.labour_party, 16), (self.ld_party, 8))
+        )
+        MaterializedMemberships.refresh_view()
+        plain = self.client.get(reverse("data_export")).getvalue()
+        req = self.client.get(
+            reverse("data_export"), data={"compression": "gzip"}
+        )
+        self.assertEqual(req["Content-Type"], "application/gzip")
+        self.assertIn(".csv.gz", req["Content-Disposition"])
+        self.assertNotIn("compression", req["Content-Disposition"])
+        self.assertEqual(gzip.decompress(req.getvalue()), plain)
+
+
+class TestMaterializedViewRefresh(UK2015ExamplesMixin, TestCase):
+    def test_refresh_records_status(self):
+        MaterializedMemberships.refresh_view()
+        status = MaterializedMemberships.refresh_status()
+        self.assertEqual(status.view_name, "materialized_memberships")
+        self.assertIsNotNone(status.refreshed_at)
+        self.assertIsNotNone(status.duration)
+        self.assertFalse(status.refresh_pending)
+
+    def test_concurrent_and_blocking_refresh(self):
+        self.create_lots_of_candidates(
+            self.earlier_election, ((self.labour_party, 2),)
+        )
+        MaterializedMemberships.refresh_view(concurrently=True)
+        self.assertEqual(MaterializedMemberships.objects.count(), 2)
+        # People's IDs are based on the election, so use another election
+        self.create_lots_of_candidates(self.election, ((self.ld_party, 2),))
+        MaterializedMemberships.refresh_view(concurrently=False)
+        self.assertEqual(MaterializedMemberships.objects.count(), 4)
+
+    def test_edits_request_refresh(self):
+        MaterializedMemberships.refresh_view()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_lots_of_candidates(
+                self.earlier_election, ((self.labour_party, 1),)
+            )
+        self.assertTrue(
+            MaterializedMemberships.refresh_status().refresh_pending
+        )
+
+    def test_refresh_if_requested_debounces(self):
+        with freeze_time("2024-05-02 10:00:00"):
+            MaterializedMemberships.refresh_view()
+        with freeze_time("2024-05-02 10:05:00"):
+            MaterializedMemberships.request_refresh()
+            self.create_lots_of_candidates(
+                self.earlier_election, ((self.labour_party, 2),)
+            )
+        with freeze_time("2024-05-02 10:05:30"):
+            # Still within the debounce window
+            self.assertFalse(
+                MaterializedMemberships.refresh_if_requested(
+                    debounce=timedelta(seconds=60)
+                )
+            )
+            self.assertEqual(MaterializedMemberships.objects.count(), 0)
+        with freeze_time("2024-05-02 10:06:01"):
+            self.assertTrue(
+                MaterializedMemberships.refresh_if_requested(
+                    debounce=timedelta(seconds=60)
+                )
+            )
+            self.assertEqual(MaterializedMemberships.objects.count(), 2)
+            # Nothing has changed since, so there's nothing to do
+            self.assertFalse(
+                MaterializedMemberships.refresh_if_requested(
+                    debounce=timedelta(seconds=60)
+                )
+            )
+
+    def test_refresh_if_requested_max_age(self):
+        with freeze_time("2024-05-02 10:00:00"):
+            MaterializedMemberships.refresh_view()
+        with freeze_time("2024-05-02 10:16:00"):
+            self.assertTrue(
+                MaterializedMemberships.refresh_if_requested(
+                    debounce=timedelta(seconds=60),
+                    max_age=timedelta(minutes=15),
+                )
+            )
+
+    def test_data_home_shows_staleness(self):
+        MaterializedMemberships.refresh_view()
+        MaterializedMemberships.request_refresh()
+        req = self.client.get(reverse("data_home"))
+        self.assertContains(req, "It was last updated")
+        self.assertContains(req, "Recent edits will appear in the next update")
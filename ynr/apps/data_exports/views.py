@@ -1,8 +1,9 @@
 import datetime
-from typing import List, Union
+import zlib
+from typing import Iterator, List, Union
 
 from django.core.paginator import Paginator
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.utils.text import slugify
 from django.views import View
 from django.views.generic import TemplateView
@@ -72,6 +73,7 @@ class DataHomeView(DataFilterMixin, TemplateView):
         context = super().get_context_data(**kwargs)
 
         context.update(self.get_filter_data())
+        context["refresh_status"] = MaterializedMemberships.refresh_status()
 
         paginator = Paginator(
             context["objects"],
@@ -82,25 +84,49 @@ class DataHomeView(DataFilterMixin, TemplateView):
         return context
 
 
+def gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """
+    Compress an iterator of bytes with gzip as it's consumed
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
 class DataExportView(DataFilterMixin, View):
+    """
+    Stream a CSV of the filtered memberships, as Postgres makes it.
+
+    Add `compression=gzip` to the query string to download a gzipped CSV,
+    compressed on the fly.
+    """
+
     def get(self, request, *args, **kwargs):
         context = self.get_filter_data()
-        content_type = "text/csv"
+        gzipped = request.GET.get("compression") == "gzip"
+        content_type = "application/gzip" if gzipped else "text/csv"
         date_str = datetime.datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
         filename_dict = dict(context["filter_set"].data)
         filename_dict.pop("format", None)
+        filename_dict.pop("compression", None)
         file_str = slugify(
             "__".join(f"{key}_{value}" for key, value in filename_dict.items())
         )
+        extension = "csv.gz" if gzipped else "csv"
         headers = {
-            "Content-Disposition": f'attachment; filename="dc-candidates-{file_str}-{date_str}.csv"'
+            "Content-Disposition": f'attachment; filename="dc-candidates-{file_str}-{date_str}.{extension}"'
         }
 
-        response = HttpResponse(
+        content = context["objects"].iter_csv(
+            extra_fields=context["extra_fields"]
+        )
+        if gzipped:
+            content = gzip_chunks(content)
+        return StreamingHttpResponse(
+            content,
             content_type=content_type,
             headers=headers,
         )
-        context["objects"].write_csv(
-            response, extra_fields=context["extra_fields"]
-        )
-        return response
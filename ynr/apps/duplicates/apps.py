@@ -1,7 +1,31 @@
 from __future__ import unicode_literals
 
+import importlib
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.db import connection
+from django.db.models.signals import post_migrate
+
+
+def create_trigram_indexes_when_migrations_disabled(**kwargs):
+    """
+    The trigram indexes are managed in a migration, but migrations are
+    disabled when running tests, so create them after the tables are made.
+    """
+    if settings.MIGRATION_MODULES.__class__.__name__ == "DisableMigrations":
+        migration = importlib.import_module(
+            "duplicates.migrations.0004_name_trigram_indexes"
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(migration.SQL_STR)
 
 
 class DuplicatesConfig(AppConfig):
     name = "duplicates"
+
+    def ready(self):
+        post_migrate.connect(
+            create_trigram_indexes_when_migrations_disabled, sender=self
+        )
@@ -0,0 +1,267 @@
+"""
+Find people that are likely to be duplicates of each other.
+
+Comparing every person with every other person isn't possible with the
+number of people we have, so people are first put in to "blocks" that share
+a cheap key:
+
+* their normalised surname and first initial
+* a phonetic (Soundex) key of their first name and surname
+* a name (or other name) that Postgres' `pg_trgm` says is similar
+
+Only people in the same block are compared. Blocks with more than
+`max_block_size` people in them are ignored, as a key that common doesn't
+tell us anything, and this keeps the number of comparisons close to linear
+in the number of people.
+
+Each pair is then scored on how similar their names are, and whether they
+share a party, an area or an identifier.
+
+"""
+
+import itertools
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from duplicates.models import DuplicateSuggestion
+from people.models import Person, PersonIdentifier
+from popolo.models import Membership, OtherName
+from search.utils import normalise_search_name
+
+PARTY_WEIGHT = 0.2
+AREA_WEIGHT = 0.2
+# A shared email address or social media account is enough on its own for
+# people with similar names
+IDENTIFIER_WEIGHT = 1.0
+
+SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+TRIGRAM_PAIRS_SQL = """
+    WITH names AS (
+        SELECT id AS person_id, name FROM people_person
+        UNION
+        SELECT object_id, name FROM popolo_othername
+        WHERE content_type_id = %(content_type_id)s
+    )
+    SELECT names.person_id, people_person.id
+    FROM names
+    JOIN people_person ON people_person.name %% names.name
+    WHERE people_person.id <> names.person_id
+    UNION
+    SELECT names.person_id, popolo_othername.object_id
+    FROM names
+    JOIN popolo_othername ON popolo_othername.name %% names.name
+    WHERE popolo_othername.content_type_id = %(content_type_id)s
+    AND popolo_othername.object_id <> names.person_id
+"""
+
+
+def soundex(word: str) -> str:
+    """
+    The American Soundex code for a word that's already been normalised to
+    lower case ASCII letters
+    """
+    if not word:
+        return ""
+    code = word[0].upper()
+    previous = SOUNDEX_CODES.get(word[0], "")
+    for letter in word[1:]:
+        digit = SOUNDEX_CODES.get(letter, "")
+        if digit and digit != previous:
+            code += digit
+        if letter not in "hw":
+            previous = digit
+    return (code + "000")[:4]
+
+
+def trigrams(name: str) -> Set[str]:
+    """
+    The same trigrams that `pg_trgm` would make for a name
+    """
+    result = set()
+    for word in re.findall(r"[^\W_]+", name.lower()):
+        padded = f"  {word} "
+        result.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def trigram_similarity(name: str, other_name: str) -> float:
+    a, b = trigrams(name), trigrams(other_name)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def blocking_keys(name: str) -> List[Tuple[str, str]]:
+    words = normalise_search_name(name).split()
+    if not words:
+        return []
+    first_name, surname = words[0], words[-1]
+    return [
+        ("surname", f"{surname} {first_name[0]}"),
+        ("phonetic", f"{soundex(first_name)} {soundex(surname)}"),
+    ]
+
+
+class ScoredPair(NamedTuple):
+    person_id: int
+    other_person_id: int
+    score: float
+
+
+class DuplicateFinder:
+    def __init__(
+        self,
+        threshold: float = 1.2,
+        max_block_size: int = 100,
+        trigram_threshold: float = 0.6,
+    ):
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+        self.trigram_threshold = trigram_threshold
+        self.person_content_type = ContentType.objects.get_for_model(Person)
+
+    def get_names(self) -> Dict[int, Set[str]]:
+        """
+        Every name (including other names) for each person
+        """
+        names = defaultdict(set)
+        for person_id, name in Person.objects.values_list("pk", "name"):
+            names[person_id].add(name)
+        other_names = OtherName.objects.filter(
+            content_type=self.person_content_type
+        ).values_list("object_id", "name")
+        for person_id, name in other_names:
+            if person_id in names:
+                names[person_id].add(name)
+        return names
+
+    def blocked_pairs(self, names: Dict[int, Set[str]]) -> Set[Tuple[int, int]]:
+        blocks = defaultdict(set)
+        for person_id, person_names in names.items():
+            for name in person_names:
+                for key in blocking_keys(name):
+                    blocks[key].add(person_id)
+
+        pairs = set()
+        for block in blocks.values():
+            if len(block) > self.max_block_size:
+                continue
+            pairs.update(itertools.combinations(sorted(block), 2))
+        return pairs
+
+    def trigram_pairs(self) -> Set[Tuple[int, int]]:
+        """
+        Pairs of people with similar names, using the trigram indexes on
+        person and other names
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.similarity_threshold', %s, true)",
+                [str(self.trigram_threshold)],
+            )
+            cursor.execute(
+                TRIGRAM_PAIRS_SQL,
+                {"content_type_id": self.person_content_type.pk},
+            )
+            return {
+                tuple(sorted(pair)) for pair in cursor.fetchall() if all(pair)
+            }
+
+    def known_pairs(self) -> Set[Tuple[int, int]]:
+        """
+        Pairs that already have a suggestion, including those that have been
+        marked as not being duplicates
+        """
+        return set(
+            DuplicateSuggestion.objects.values_list(
+                "person_id", "other_person_id"
+            )
+        )
+
+    def get_evidence(self, person_ids: Iterable[int], chunk_size=5000):
+        """
+        The parties, areas and identifiers of each person, as dicts of
+        person ID to a set
+        """
+        parties = defaultdict(set)
+        areas = defaultdict(set)
+        identifiers = defaultdict(set)
+        person_ids = sorted(person_ids)
+        for i in range(0, len(person_ids), chunk_size):
+            chunk = person_ids[i : i + chunk_size]
+            memberships = Membership.objects.filter(
+                person_id__in=chunk
+            ).values_list("person_id", "party_id", "ballot__post_id")
+            for person_id, party_id, post_id in memberships:
+                if party_id:
+                    parties[person_id].add(party_id)
+                areas[person_id].add(post_id)
+            person_identifiers = (
+                PersonIdentifier.objects.filter(person_id__in=chunk)
+                .exclude(value="")
+                .values_list("person_id", "value_type", "value")
+            )
+            for person_id, value_type, value in person_identifiers:
+                identifiers[person_id].add((value_type, value.strip().lower()))
+        return parties, areas, identifiers
+
+    def score(self, names, evidence, person_id, other_person_id) -> float:
+        parties, areas, identifiers = evidence
+        score = max(
+            trigram_similarity(name, other_name)
+            for name in names[person_id]
+            for other_name in names[other_person_id]
+        )
+        if parties[person_id] & parties[other_person_id]:
+            score += PARTY_WEIGHT
+        if areas[person_id] & areas[other_person_id]:
+            score += AREA_WEIGHT
+        if identifiers[person_id] & identifiers[other_person_id]:
+            score += IDENTIFIER_WEIGHT
+        return score
+
+    def find(self) -> List[ScoredPair]:
+        """
+        Scored pairs of people that are likely to be duplicates and don't
+        already have a suggestion, best first
+        """
+        names = self.get_names()
+        pairs = self.blocked_pairs(names) | self.trigram_pairs()
+        pairs = {
+            pair
+            for pair in pairs - self.known_pairs()
+            if pair[0] in names and pair[1] in names
+        }
+        evidence = self.get_evidence(set(itertools.chain(*pairs)))
+
+        scored = []
+        for person_id, other_person_id in pairs:
+            score = self.score(names, evidence, person_id, other_person_id)
+            if score >= self.threshold:
+                scored.append(ScoredPair(person_id, other_person_id, score))
+        return sorted(scored, key=lambda pair: (-pair.score, pair[:2]))
+
+    def create_suggestions(self, user: User) -> List[DuplicateSuggestion]:
+        suggestions = [
+            DuplicateSuggestion(
+                person_id=pair.person_id,
+                other_person_id=pair.other_person_id,
+                user=user,
+            )
+            for pair in self.find()
+        ]
+        return DuplicateSuggestion.objects.bulk_create(
+            suggestions, batch_size=1000, ignore_conflicts=True
+        )
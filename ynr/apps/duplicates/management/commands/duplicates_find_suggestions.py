@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from duplicates.detection import DuplicateFinder
+from people.models import Person
+
+
+class Command(BaseCommand):
+    help = """
+    Look for people that are likely to be duplicates of each other and add
+    a duplicate suggestion for each pair. Pairs that already have a
+    suggestion, including those marked as not duplicates, are skipped.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=1.2,
+            help=(
+                "The minimum score for a suggestion. Name similarity scores "
+                "up to 1, with more for a shared party, area or identifier"
+            ),
+        )
+        parser.add_argument(
+            "--max-block-size",
+            type=int,
+            default=100,
+            help="Ignore blocking keys shared by more people than this",
+        )
+        parser.add_argument(
+            "--trigram-threshold",
+            type=float,
+            default=0.6,
+            help="How similar names need to be to be compared",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print the pairs that would be suggested",
+        )
+
+    def handle(self, *args, **options):
+        finder = DuplicateFinder(
+            threshold=options["threshold"],
+            max_block_size=options["max_block_size"],
+            trigram_threshold=options["trigram_threshold"],
+        )
+        if options["dry_run"]:
+            pairs = finder.find()
+            people = Person.objects.only("name").in_bulk(
+                {pk for pair in pairs for pk in pair[:2]}
+            )
+            for pair in pairs:
+                self.stdout.write(
+                    "{:.2f}\t{} ({})\t{} ({})".format(
+                        pair.score,
+                        people[pair.person_id].name,
+                        pair.person_id,
+                        people[pair.other_person_id].name,
+                        pair.other_person_id,
+                    )
+                )
+            return
+
+        user, _ = User.objects.get_or_create(
+            username=settings.DUPLICATE_BOT_USERNAME
+        )
+        suggestions = finder.create_suggestions(user)
+        self.stdout.write(f"Added {len(suggestions)} duplicate suggestions")
@@ -0,0 +1,33 @@
+"""
+Add trigram indexes to person names and other names.
+
+These are used to find people with similar names when looking for likely
+duplicates, see `duplicates.detection`.
+
+"""
+
+from django.db import migrations
+
+SQL_STR = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS people_person_name_trgm_idx
+ON people_person USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS popolo_othername_name_trgm_idx
+ON popolo_othername USING gin (name gin_trgm_ops);
+"""
+
+REVERSE_SQL_STR = """
+DROP INDEX IF EXISTS people_person_name_trgm_idx;
+DROP INDEX IF EXISTS popolo_othername_name_trgm_idx;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("duplicates", "0003_reasoning_as_textfield"),
+        ("people", "0052_incremental_name_search"),
+        ("popolo", "0051_alter_membership_deselected_and_more"),
+        ("search", "0001_initial"),
+    ]
+
+    operations = [migrations.RunSQL(SQL_STR, REVERSE_SQL_STR)]
@@ -0,0 +1,119 @@
+from candidates.tests.auth import TestUserMixin
+from candidates.tests.factories import MembershipFactory
+from candidates.tests.uk_examples import UK2015ExamplesMixin
+from django.core.management import call_command
+from django.test import TestCase
+from duplicates.detection import (
+    DuplicateFinder,
+    blocking_keys,
+    soundex,
+    trigram_similarity,
+)
+from duplicates.models import DuplicateSuggestion
+from people.models import PersonIdentifier
+from people.tests.factories import PersonFactory
+
+
+class TestDetectionHelpers(TestCase):
+    def test_soundex(self):
+        self.assertEqual(soundex("robert"), "R163")
+        self.assertEqual(soundex("rupert"), "R163")
+        self.assertEqual(soundex("ashcraft"), "A261")
+        self.assertEqual(soundex("smith"), soundex("smyth"))
+
+    def test_trigram_similarity(self):
+        self.assertEqual(trigram_similarity("Henry Jekyll", "henry jekyll"), 1)
+        self.assertEqual(trigram_similarity("Henry Jekyll", "Edward Hyde"), 0)
+        self.assertGreater(
+            trigram_similarity("Henry Jekyll", "Henry Jeckyll"), 0.5
+        )
+
+    def test_blocking_keys(self):
+        self.assertEqual(
+            blocking_keys("Henry  Jékyll"),
+            [("surname", "jekyll h"), ("phonetic", "H560 J240")],
+        )
+        self.assertEqual(blocking_keys(" $ "), [])
+
+
+class TestDuplicateFinder(TestUserMixin, UK2015ExamplesMixin, TestCase):
+    def make_candidate(self, name, ballot=None, party=None):
+        person = PersonFactory(name=name)
+        MembershipFactory(
+            person=person,
+            ballot=ballot or self.dulwich_post_ballot,
+            party=party or self.labour_party,
+        )
+        return person
+
+    def test_finds_people_with_the_same_name_and_party(self):
+        person = self.make_candidate("Henry Jekyll")
+        other_person = self.make_candidate(
+            "Henry Jekyll", ballot=self.camberwell_post_ballot
+        )
+        self.make_candidate("Edward Hyde")
+        self.make_candidate(
+            "Henry Jekyll", ballot=self.local_ballot, party=self.green_party
+        )
+
+        pairs = DuplicateFinder().find()
+        self.assertEqual(
+            [pair[:2] for pair in pairs], [(person.pk, other_person.pk)]
+        )
+        self.assertAlmostEqual(pairs[0].score, 1.2)
+
+    def test_finds_similar_names_with_a_shared_identifier(self):
+        person = PersonFactory(name="John Smith")
+        other_person = PersonFactory(name="Jon Smyth")
+        for p in (person, other_person):
+            PersonIdentifier.objects.create(
+                person=p, value_type="email", value="JOHN@example.com"
+            )
+        pairs = DuplicateFinder().find()
+        self.assertEqual(
+            [pair[:2] for pair in pairs], [(person.pk, other_person.pk)]
+        )
+
+    def test_finds_people_by_other_names(self):
+        person = self.make_candidate("Harry Jekyll")
+        person.other_names.create(name="Henry Jekyll")
+        other_person = self.make_candidate("Henry Jekyll")
+
+        pairs = DuplicateFinder().find()
+        self.assertEqual(
+            [pair[:2] for pair in pairs], [(person.pk, other_person.pk)]
+        )
+
+    def test_large_blocks_are_ignored(self):
+        for i in range(3):
+            self.make_candidate(f"Henry Jekyll{'l' * i}")
+        finder = DuplicateFinder(max_block_size=2)
+        names = finder.get_names()
+        self.assertEqual(finder.blocked_pairs(names), set())
+        finder.max_block_size = 3
+        self.assertEqual(len(finder.blocked_pairs(names)), 3)
+
+    def test_skips_known_pairs(self):
+        person = self.make_candidate("Henry Jekyll")
+        other_person = self.make_candidate("Henry Jekyll")
+        DuplicateSuggestion.objects.create(
+            person=person,
+            other_person=other_person,
+            user=self.user,
+            status=DuplicateSuggestion.STATUS.not_duplicate,
+        )
+        self.assertEqual(DuplicateFinder().find(), [])
+
+    def test_command_creates_suggestions(self):
+        person = self.make_candidate("Henry Jekyll")
+        other_person = self.make_candidate("Henry Jekyll")
+        call_command("duplicates_find_suggestions")
+        suggestion = DuplicateSuggestion.objects.get()
+        self.assertEqual(suggestion.person, person)
+        self.assertEqual(suggestion.other_person, other_person)
+        self.assertTrue(suggestion.open)
+        self.assertEqual(suggestion.user.username, "DuplicateBot")
+
+        # Running again doesn't add the pair again
+        call_command("duplicates_find_suggestions")
+        self.assertEqual(DuplicateSuggestion.objects.count(), 1)
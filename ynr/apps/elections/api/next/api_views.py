@@ -1,5 +1,5 @@
 import elections.api.next.serializers
-from api.next.views import ResultsSetPagination
+from api.next.views import CursorPaginationMixin, ResultsSetPagination
 from candidates import models as extra_models
 from candidates.api.next.serializers import LoggedActionSerializer
 from django.db.models import Prefetch
@@ -28,7 +28,7 @@ class ElectionViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = ResultsSetPagination
 
 
-class BallotViewSet(viewsets.ReadOnlyModelViewSet):
+class BallotViewSet(CursorPaginationMixin, viewsets.ReadOnlyModelViewSet):
     """
     A paginated list of all ballots
 
@@ -78,15 +78,24 @@ class BallotViewSet(viewsets.ReadOnlyModelViewSet):
             raise ValidationError(detail=error)
 
         is_last_updated_query = self.request.query_params.get("last_updated")
-        if is_last_updated_query:
+        if is_last_updated_query and not self.uses_cursor_pagination:
             queryset = queryset[:1000]
 
         return queryset
 
+    def get_cursor_ordering(self):
+        if self.request.query_params.get("last_updated"):
+            return ("last_updated", "id")
+        return ("id",)
+
     def list(self, request, *args, **kwargs):
         """
         If the last_updated filter param is used objects are ordered oldest
         changes first, and in maximum chunks of 200
+
+        Add `pagination=cursor` to page through results with a cursor rather
+        than page numbers. This is much faster for deep pages, and removes the
+        limit on the number of objects returned by last_updated requests.
         """
         return super().list(request, *args, **kwargs)
         # TEMP return a paginated response to increase speed 2022 elections imported
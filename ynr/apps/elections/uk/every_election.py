@@ -1,14 +1,19 @@
+import hashlib
+import re
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
-from time import sleep
-from urllib.parse import urlencode
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
 import requests
 from candidates.models import Ballot, PartySet
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.dateparse import parse_datetime
 from elections.models import Election as YNRElection
 from popolo.models import Organization, Post
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 ALWAYS_USES_LISTS = ["europarl"]
 
@@ -333,12 +338,147 @@ def is_mayor_or_pcc_ballot(election):
     ] in ["mayor", "pcc"]
 
 
+class EEAPIClient:
+    """
+    Fetch JSON from the EveryElection API.
+
+    All requests share a pooled session that retries failed requests with a
+    backoff, and lists of URLs are fetched with at most `max_workers`
+    requests in flight at once.
+
+    Responses with an `ETag` or `Last-Modified` header are cached, and the
+    next request for the same URL is made conditional on them. If EE replies
+    with "304 Not Modified" the cached JSON is used instead.
+    """
+
+    RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+    def __init__(self, max_workers=None, timeout=None):
+        self.max_workers = max_workers or getattr(
+            settings, "EE_MAX_CONCURRENT_REQUESTS", 4
+        )
+        self.timeout = timeout or getattr(settings, "EE_REQUEST_TIMEOUT", 30)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_maxsize=self.max_workers,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=1,
+                status_forcelist=self.RETRY_STATUSES,
+                allowed_methods=["GET"],
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def cache_key(self, url):
+        return "ee-api:{}".format(hashlib.sha256(url.encode()).hexdigest())
+
+    def get(self, url):
+        cache_key = self.cache_key(url)
+        cached = cache.get(cache_key)
+        headers = {}
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        req = self.session.get(url, headers=headers, timeout=self.timeout)
+        if cached and req.status_code == 304:
+            return cached["data"]
+        req.raise_for_status()
+        data = req.json()
+
+        etag = req.headers.get("ETag")
+        last_modified = req.headers.get("Last-Modified")
+        if etag or last_modified:
+            cache.set(
+                cache_key,
+                {"etag": etag, "last_modified": last_modified, "data": data},
+                settings.EE_CACHE_SECONDS,
+            )
+        return data
+
+    def get_many(self, urls):
+        """
+        The JSON for each URL, in the same order as `urls`
+        """
+        urls = list(urls)
+        if len(urls) < 2:
+            return [self.get(url) for url in urls]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self.get, urls))
+
+    def get_results(self, urls):
+        """
+        Every result from each paginated list URL in `urls`.
+
+        The first page of each list is fetched concurrently, then the rest
+        of the pages of each list.
+        """
+        results = []
+        for page in self.get_many(urls):
+            results.extend(page["results"])
+            results.extend(self.get_remaining_results(page))
+        return results
+
+    def get_remaining_results(self, page):
+        next_url = page.get("next")
+        if not next_url:
+            return []
+
+        page_urls = self.get_page_urls(next_url, page["count"])
+        if page_urls is not None:
+            return [
+                result
+                for page in self.get_many(page_urls)
+                for result in page["results"]
+            ]
+
+        # We don't know how to page through this list, so follow the `next`
+        # links one at a time
+        results = []
+        while next_url:
+            page = self.get(next_url)
+            results.extend(page["results"])
+            next_url = page.get("next")
+        return results
+
+    def get_page_urls(self, next_url, count):
+        """
+        The URL for every page from `next_url` onwards, if the list uses
+        limit/offset pagination. Otherwise None.
+        """
+        parsed = urlparse(next_url)
+        params = parse_qs(parsed.query, keep_blank_values=True)
+        try:
+            limit = int(params["limit"][0])
+            offset = int(params["offset"][0])
+        except (KeyError, ValueError):
+            return None
+        if limit < 1:
+            return None
+
+        page_urls = []
+        for page_offset in range(offset, count, limit):
+            params["offset"] = [str(page_offset)]
+            query = urlencode(params, doseq=True)
+            page_urls.append(urlunparse(parsed._replace(query=query)))
+        return page_urls
+
+
 class EveryElectionImporter(object):
-    def __init__(self, query_args=None, election_id=None):
+    # How many elections to ask EE about in each request when looking
+    # elections up by ID
+    ELECTION_IDS_PER_REQUEST = 50
+
+    def __init__(self, query_args=None, election_id=None, client=None):
         self.election_id = election_id
         self.EE_BASE_URL = getattr(
             settings, "EE_BASE_URL", "https://elections.democracyclub.org.uk/"
         )
+        self.client = client or EEAPIClient()
 
         self.election_tree: dict[str:EEElection] = {}
         if query_args is None:
@@ -360,9 +500,7 @@ class EveryElectionImporter(object):
         url = f"{self.EE_BASE_URL}api/elections/"
         if self.election_id:
             url = f"{url}{self.election_id}"
-            req = requests.get(url)
-            req.raise_for_status()
-            data = req.json()
+            data = self.client.get(url)
             election_id = data["election_id"]
             self.election_tree[election_id] = EEElection(data)
         else:
@@ -370,42 +508,53 @@ class EveryElectionImporter(object):
             self.query_args["identifier_type"] = "election"
             params = urlencode(OrderedDict(sorted(self.query_args.items())))
             url = f"{url}?{params}"
-            total = None
-            seen = 0
             print("Importing elections")
-            while url:
-                req = requests.get(url)
-                req.raise_for_status()
-                data = req.json()
-                total = data["count"]
-
-                for result in data["results"]:
-                    election_id = result["election_id"]
-                    self.election_tree[election_id] = EEElection(result)
-                    seen += 1
-                print(f"Added {seen} of {total}")
-                url = data.get("next")
-            # Second pass: get the children
+            for result in self.client.get_results([url]):
+                election_id = result["election_id"]
+                self.election_tree[election_id] = EEElection(result)
+            print(f"Added {len(self.election_tree)} elections")
+
+            # Second pass: get the children. Every child of an election is
+            # in the same list, so we only need to ask for each list once
             print("Importing ballots")
-            for election_id, election in self.election_tree.copy().items():
-                if not settings.RUNNING_TESTS:
-                    sleep(1)
+            child_urls = {}
+            for election in self.election_tree.values():
                 for child in election["children"]:
-                    parts = child.split(".")
-                    date = parts.pop(-1)
-                    parent_prefix = ".".join(parts[:2])
-
-                    url = f"{self.EE_BASE_URL}api/elections/?poll_open_date={date}&election_id_regex={parent_prefix}"
-                    if deleted:
-                        url = f"{url}&deleted=1"
-                    while url:
-                        req = requests.get(url)
-                        req.raise_for_status()
-                        data = req.json()
-                        for result in data["results"]:
-                            election_id = result["election_id"]
-                            self.election_tree[election_id] = EEElection(result)
-                        url = data.get("next")
+                    child_urls[self.get_child_url(child, deleted)] = None
+            for result in self.client.get_results(child_urls):
+                election_id = result["election_id"]
+                self.election_tree[election_id] = EEElection(result)
+
+    def get_child_url(self, child, deleted=False):
+        parts = child.split(".")
+        date = parts.pop(-1)
+        parent_prefix = ".".join(parts[:2])
+
+        url = f"{self.EE_BASE_URL}api/elections/?poll_open_date={date}&election_id_regex={parent_prefix}"
+        if deleted:
+            url = f"{url}&deleted=1"
+        return url
+
+    def get_elections_by_id(self, election_ids):
+        """
+        Get the given elections from EE, asking about
+        `ELECTION_IDS_PER_REQUEST` of them in each request.
+
+        Returns a dict of election ID to `EEElection`. Elections EE doesn't
+        know about aren't included.
+        """
+        election_ids = sorted(election_ids)
+        urls = []
+        for i in range(0, len(election_ids), self.ELECTION_IDS_PER_REQUEST):
+            batch = election_ids[i : i + self.ELECTION_IDS_PER_REQUEST]
+            regex = "^({})$".format("|".join(re.escape(e) for e in batch))
+            params = urlencode({"election_id_regex": regex})
+            urls.append(f"{self.EE_BASE_URL}api/elections/?{params}")
+
+        return {
+            result["election_id"]: EEElection(result)
+            for result in self.client.get_results(urls)
+        }
 
     @property
     def ballot_ids(self):
@@ -3,12 +3,15 @@
 
 import logging
 import re
+import time
 from urllib.parse import quote, urljoin
 
 import requests
 from candidates.models import Ballot
 from django.conf import settings
 from django.core.cache import cache
+from elections.uk.models import Postcode
+from requests.exceptions import RequestException
 
 
 class BaseMapItException(Exception):
@@ -34,8 +37,64 @@ EE_BASE_URL = getattr(
 )
 
 
-def ballot_paper_ids_from_ee(url, cache_key, exception):
-    r = requests.get(url)
+# The outcomes of looking up ballots in EE, that `count_lookup` keeps a count
+# of:
+# - "hit": a fresh result was in the cache
+# - "stale": an expired result was served while another request refreshed it,
+#   or because EE couldn't be reached
+# - "negative": EE said the postcode or coordinates were bad recently
+# - "coalesced": another request was already asking EE, and we used its result
+# - "miss": we asked EE
+# - "error": we asked EE and didn't get an answer
+LOOKUP_OUTCOMES = ["hit", "stale", "negative", "coalesced", "miss", "error"]
+
+
+def count_lookup(outcome):
+    cache_key = f"geolookup-count:{outcome}"
+    try:
+        cache.incr(cache_key)
+    except ValueError:
+        # The first lookup with this outcome
+        cache.add(cache_key, 1, timeout=None)
+
+
+def get_lookup_counts():
+    """
+    The number of EE lookups with each outcome in `LOOKUP_OUTCOMES`
+    """
+    counts = cache.get_many([f"geolookup-count:{o}" for o in LOOKUP_OUTCOMES])
+    return {
+        outcome: counts.get(f"geolookup-count:{outcome}", 0)
+        for outcome in LOOKUP_OUTCOMES
+    }
+
+
+def result_from_cache_entry(entry, exception):
+    if "error" in entry:
+        raise exception(entry["error"])
+    return entry["ballot_paper_ids"]
+
+
+def wait_for_cache_entry(cache_key):
+    """
+    Wait for the request that's asking EE to cache its result. Returns None
+    if it doesn't arrive in time.
+    """
+    deadline = time.monotonic() + settings.EE_LOOKUP_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(0.1)
+        entry = cache.get(cache_key)
+        if isinstance(entry, dict):
+            return entry
+    return None
+
+
+def fetch_ballot_paper_ids_from_ee(url, cache_key, exception):
+    try:
+        r = requests.get(url, timeout=settings.EE_LOOKUP_TIMEOUT)
+    except RequestException:
+        raise UnknownGeoException(f'Couldn’t get a response for "{url}"')
+
     if r.status_code == 200:
         ee_result = r.json()
         ballot_paper_ids = [
@@ -43,14 +102,80 @@ def ballot_paper_ids_from_ee(url, cache_key, exception):
             for e in ee_result["results"]
             if not e["group_type"]
         ]
-        cache.set(cache_key, ballot_paper_ids, settings.EE_CACHE_SECONDS)
+        cache.set(
+            cache_key,
+            {
+                "ballot_paper_ids": ballot_paper_ids,
+                "fresh_until": time.time() + settings.EE_CACHE_SECONDS,
+            },
+            settings.EE_CACHE_SECONDS + settings.EE_CACHE_STALE_SECONDS,
+        )
         return ballot_paper_ids
+
     if r.status_code == 400:
-        ee_result = r.json()
-        raise exception(ee_result["detail"])
-    if r.status_code == 404:
-        raise exception(f'The url "{url}" couldn’t be found')
-    raise UnknownGeoException(f'Unknown error for "{url}"')
+        error = r.json()["detail"]
+    elif r.status_code == 404:
+        error = f'The url "{url}" couldn’t be found'
+    else:
+        raise UnknownGeoException(f'Unknown error for "{url}"')
+    cache.set(cache_key, {"error": error}, settings.EE_NEGATIVE_CACHE_SECONDS)
+    raise exception(error)
+
+
+def ballot_paper_ids_from_ee(url, cache_key, exception):
+    """
+    The IDs of the ballots EE returns for `url`, cached under `cache_key`.
+
+    Results are fresh for `EE_CACHE_SECONDS`. After that they're served for
+    up to `EE_CACHE_STALE_SECONDS` more, while a single request asks EE for
+    a new result. Bad postcodes and coordinates are cached for
+    `EE_NEGATIVE_CACHE_SECONDS`.
+
+    Only one request asks EE about a `cache_key` at a time. If there's
+    nothing in the cache, other requests wait for its result.
+    """
+    entry = cache.get(cache_key)
+    if not isinstance(entry, dict):
+        # Nothing cached, or a list of IDs cached by an older version
+        entry = None
+
+    if entry and "error" in entry:
+        count_lookup("negative")
+        return result_from_cache_entry(entry, exception)
+    if entry and entry["fresh_until"] > time.time():
+        count_lookup("hit")
+        return result_from_cache_entry(entry, exception)
+
+    lock_key = f"{cache_key}:lock"
+    locked = cache.add(lock_key, True, settings.EE_LOOKUP_TIMEOUT + 1)
+    if not locked:
+        # Another request is asking EE
+        if entry:
+            count_lookup("stale")
+            return result_from_cache_entry(entry, exception)
+        new_entry = wait_for_cache_entry(cache_key)
+        if new_entry:
+            count_lookup("coalesced")
+            return result_from_cache_entry(new_entry, exception)
+
+    try:
+        ballot_paper_ids = fetch_ballot_paper_ids_from_ee(
+            url, cache_key, exception
+        )
+    except UnknownGeoException:
+        if entry:
+            count_lookup("stale")
+            return result_from_cache_entry(entry, exception)
+        count_lookup("error")
+        raise
+    except BaseMapItException:
+        count_lookup("miss")
+        raise
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    count_lookup("miss")
+    return ballot_paper_ids
 
 
 def get_ballots(url, cache_key, exception):
@@ -67,14 +192,19 @@ def get_ballots_from_postcode(
         raise BadPostcodeException(
             f'There were disallowed characters in "{original_postcode}"'
         )
-    cache_key = f"geolookup-postcodes:{current_only}:{postcode}"
-    cached_result = cache.get(cache_key)
-    if cached_result:
-        if ids_only:
-            # return list of IDS from cache
-            return cached_result
-        return Ballot.objects.filter(ballot_paper_id__in=cached_result)
 
+    # The local index only has the current divisions for each postcode, so
+    # past ballots under old boundaries are only found by EE
+    if settings.USE_LOCAL_POSTCODE_LOOKUP and current_only:
+        ballot_paper_ids = Postcode.objects.ballot_paper_ids(postcode)
+        # Postcodes that aren't in the local index, or that the index
+        # doesn't find any ballots for, are looked up in EE
+        if ballot_paper_ids:
+            if ids_only:
+                return ballot_paper_ids
+            return Ballot.objects.filter(ballot_paper_id__in=ballot_paper_ids)
+
+    cache_key = f"geolookup-postcodes:{current_only}:{postcode}"
     url = urljoin(EE_BASE_URL, f"/api/elections/?postcode={quote(postcode)}")
     if current_only:
         url = f"{url}&current=1"
@@ -96,8 +226,4 @@ def get_ballots_from_coords(coords, current_only=True):
     if current_only:
         url = f"{url}&current=1"
     cache_key = f"geolookup-coords:{current_only}:{coords}"
-    cached_result = cache.get(cache_key)
-    if cached_result:
-        return Ballot.objects.filter(ballot_paper_id__in=cached_result)
-
     return get_ballots(url, cache_key, BadCoordinatesException)
@@ -86,13 +86,18 @@ class Command(BaseCommand):
         window in EE doesn't update election objects.
 
         Rather, grab elections we think might no longer be current
-        and check with EE
+        and check with EE. Elections that have been deleted in EE are dealt
+        with by `delete_deleted_elections`.
         """
         might_not_be_current = Election.objects.past().current()
+        importer = EveryElectionImporter()
+        remote_elections = importer.get_elections_by_id(
+            might_not_be_current.values_list("slug", flat=True)
+        )
         for election in might_not_be_current:
-            importer = EveryElectionImporter(election_id=election.slug)
-            importer.build_election_tree()
-            current = importer.election_tree[election.slug].get("current")
+            if election.slug not in remote_elections:
+                continue
+            current = remote_elections[election.slug].get("current")
             if not current:
                 election.current = False
                 election.save()
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from elections.uk.geo_helpers import get_lookup_counts
+
+
+class Command(BaseCommand):
+    help = "Show how many postcode and coordinate lookups had each outcome"
+
+    def handle(self, *args, **options):
+        for outcome, count in get_lookup_counts().items():
+            self.stdout.write(f"{outcome}: {count}")
@@ -0,0 +1,106 @@
+import csv
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from elections.uk.models import Postcode, normalise_postcode
+
+# The ONSPD columns for the kinds of division we have elections for: wards,
+# county electoral divisions, local authorities, counties, Westminster
+# constituencies and police force areas
+ONSPD_DIVISION_COLUMNS = ["osward", "ced", "oslaua", "oscty", "pcon", "pfa"]
+
+
+class Command(BaseCommand):
+    help = """
+    Import the divisions each postcode is in, for looking up ballots without
+    asking EveryElection (see USE_LOCAL_POSTCODE_LOOKUP).
+
+    Takes a CSV with a row per postcode, like the ONS Postcode Directory
+    (ONSPD). A dump with a row per postcode and division, like one from
+    EveryElection, also works if it's sorted by postcode.
+
+    Replaces all the postcodes already imported.
+    """
+
+    BATCH_SIZE = 5000
+
+    def add_arguments(self, parser):
+        parser.add_argument("filename", help="Path to the CSV to import")
+        parser.add_argument(
+            "--postcode-column",
+            default="pcds",
+            help="The column with the postcode in. Default: %(default)s",
+        )
+        parser.add_argument(
+            "--division-columns",
+            default=",".join(ONSPD_DIVISION_COLUMNS),
+            help="""
+            Comma separated columns with division codes in. Codes without
+            a prefix are assumed to be GSS codes. Default: %(default)s
+            """,
+        )
+
+    def get_identifier(self, code):
+        code = code.strip()
+        # ONSPD uses codes ending in 99999999 for "no division of this type"
+        if not code or code.endswith("99999999"):
+            return None
+        if ":" in code:
+            return code
+        return f"gss:{code}"
+
+    def get_postcodes(self, rows, postcode_column, division_columns):
+        """
+        Yield a `Postcode` for each postcode in `rows`, merging the
+        divisions from consecutive rows for the same postcode
+        """
+        postcode = None
+        for row in rows:
+            # ONSPD includes postcodes that are no longer used
+            if row.get("doterm"):
+                continue
+            row_postcode = normalise_postcode(row[postcode_column])
+            if postcode and postcode.postcode != row_postcode:
+                yield postcode
+                postcode = None
+            if not postcode:
+                postcode = Postcode(
+                    postcode=row_postcode, division_identifiers=[]
+                )
+            for column in division_columns:
+                identifier = self.get_identifier(row.get(column) or "")
+                if (
+                    identifier
+                    and identifier not in postcode.division_identifiers
+                ):
+                    postcode.division_identifiers.append(identifier)
+        if postcode:
+            yield postcode
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        division_columns = [
+            column.strip()
+            for column in options["division_columns"].split(",")
+            if column.strip()
+        ]
+        Postcode.objects.all().delete()
+
+        count = 0
+        batch = []
+        with open(options["filename"], newline="") as f:
+            postcodes = self.get_postcodes(
+                csv.DictReader(f),
+                options["postcode_column"],
+                division_columns,
+            )
+            for postcode in postcodes:
+                batch.append(postcode)
+                if len(batch) == self.BATCH_SIZE:
+                    Postcode.objects.bulk_create(batch)
+                    count += len(batch)
+                    batch = []
+        Postcode.objects.bulk_create(batch)
+        count += len(batch)
+
+        self.stdout.write(f"Imported {count} postcodes")
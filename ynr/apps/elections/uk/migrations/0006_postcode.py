@@ -0,0 +1,35 @@
+# Generated by Django 4.2.11 on 2026-10-16 10:14
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("uk", "0005_add_favourite_biscuits"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Postcode",
+            fields=[
+                (
+                    "postcode",
+                    models.CharField(
+                        help_text="Lower case, without spaces",
+                        max_length=10,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "division_identifiers",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=100),
+                        help_text="\n        The identifiers of the divisions this postcode is in, in the same\n        form as `Post.identifier`, e.g. `gss:E05000105`\n        ",
+                        size=None,
+                    ),
+                ),
+            ],
+        ),
+    ]
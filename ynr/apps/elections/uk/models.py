@@ -0,0 +1,68 @@
+from candidates.models import Ballot
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+from django.db.models import F, Func
+
+
+def normalise_postcode(postcode):
+    return "".join(postcode.lower().split())
+
+
+class PostcodeQuerySet(models.QuerySet):
+    def ballot_paper_ids(self, postcode, current_only=True):
+        """
+        The IDs of the ballots for the divisions that `postcode` is in. This
+        is empty if we don't know about `postcode`.
+
+        This is a single query: the ballots for posts with any of the
+        postcode's division identifiers, found with a subquery.
+        """
+        division_identifiers = (
+            self.filter(postcode=normalise_postcode(postcode))
+            .annotate(
+                identifier=Func(
+                    F("division_identifiers"),
+                    function="unnest",
+                    output_field=models.CharField(),
+                )
+            )
+            .values("identifier")
+        )
+        ballots = Ballot.objects.filter(
+            post__identifier__in=division_identifiers
+        )
+        if current_only:
+            ballots = ballots.filter(election__current=True)
+        return list(
+            ballots.order_by(
+                "election__election_date", "ballot_paper_id"
+            ).values_list("ballot_paper_id", flat=True)
+        )
+
+
+class Postcode(models.Model):
+    """
+    The divisions a postcode is in, imported from an ONS Postcode Directory
+    or EveryElection dump by `uk_import_postcode_divisions`.
+
+    If `USE_LOCAL_POSTCODE_LOOKUP` is set, these are used to find the
+    current ballots for a postcode without asking EveryElection.
+    """
+
+    postcode = models.CharField(
+        max_length=10,
+        primary_key=True,
+        help_text="Lower case, without spaces",
+    )
+    division_identifiers = ArrayField(
+        models.CharField(max_length=100),
+        help_text="""
+        The identifiers of the divisions this postcode is in, in the same
+        form as `Post.identifier`, e.g. `gss:E05000105`
+        """,
+    )
+
+    objects = PostcodeQuerySet.as_manager()
+
+    def __str__(self):
+        return self.postcode
@@ -111,13 +111,17 @@ def create_mock_with_fixtures(
         make_per_election_fixtures_from_pages([deleted], deleted=True)
     )
 
-    def mock(url):
+    def mock(url, **kwargs):
         url_params = parse_qs(urlparse(url).query)
         for fixture_url, fixture in fixtures.items():
             params = parse_qs(urlparse(fixture_url).query)
             if params == url_params:
                 return Mock(
-                    **{"json.return_value": fixture, "status_code": 200}
+                    **{
+                        "json.return_value": fixture,
+                        "status_code": 200,
+                        "headers": {},
+                    }
                 )
         raise ValueError(f"Can't find {url_params} in {fixtures.keys()}")
 
@@ -143,7 +147,9 @@ class EE_ImporterTest(WebTest):
     @patch("elections.uk.every_election.requests")
     @freeze_time("2018-02-02")
     def setUp(self, mock_requests):
-        mock_requests.get.side_effect = fake_requests_current_elections
+        mock_requests.Session.return_value.get.side_effect = (
+            fake_requests_current_elections
+        )
 
         self.ee_importer = every_election.EveryElectionImporter()
         self.ee_importer.build_election_tree()
@@ -260,10 +266,12 @@ class EE_ImporterTest(WebTest):
     @patch("elections.uk.every_election.requests")
     def test_create_from_all_elections(self, mock_requests):
         query_args = {"poll_open_date": "2019-01-17", "current": "True"}
-        mock_requests.get.side_effect = create_mock_with_fixtures(
-            query_args,
-            current_elections_parents,
-            [current_elections, current_elections_page_2],
+        mock_requests.Session.return_value.get.side_effect = (
+            create_mock_with_fixtures(
+                query_args,
+                current_elections_parents,
+                [current_elections, current_elections_page_2],
+            )
         )
         self.ee_importer = every_election.EveryElectionImporter(query_args)
         self.ee_importer.build_election_tree()
@@ -277,7 +285,7 @@ class EE_ImporterTest(WebTest):
     @patch("elections.uk.every_election.requests")
     @freeze_time("2018-02-02")
     def test_import_management_command(self, mock_requests):
-        mock_requests.get.side_effect = (
+        mock_requests.Session.return_value.get.side_effect = (
             fake_requests_each_type_of_election_on_one_day
         )
 
@@ -321,7 +329,7 @@ class EE_ImporterTest(WebTest):
     def test_delete_elections_no_matches(self, mock_requests):
         # import some data
         # just so we've got a non-empty DB
-        mock_requests.get.side_effect = (
+        mock_requests.Session.return_value.get.side_effect = (
             fake_requests_each_type_of_election_on_one_day
         )
         call_command("uk_create_elections_from_every_election")
@@ -332,11 +340,13 @@ class EE_ImporterTest(WebTest):
         # but none of the elections in the
         # local_highland fixture
         # match anything we just imported
-        mock_requests.get.side_effect = create_mock_with_fixtures(
-            {"poll_open_date__gte": "2018-01-03"},
-            no_results,
-            ballot_pages=[],
-            deleted=local_highland,
+        mock_requests.Session.return_value.get.side_effect = (
+            create_mock_with_fixtures(
+                {"poll_open_date__gte": "2018-01-03"},
+                no_results,
+                ballot_pages=[],
+                deleted=local_highland,
+            )
         )
         # this should finish cleanly without complaining
         call_command("uk_create_elections_from_every_election")
@@ -349,10 +359,12 @@ class EE_ImporterTest(WebTest):
     @freeze_time("2018-02-02")
     def test_delete_elections_with_matches(self, mock_requests):
         # import some data
-        mock_requests.get.side_effect = create_mock_with_fixtures(
-            {"poll_open_date__gte": "2018-01-03"},
-            local_highland_parent,
-            [local_highland],
+        mock_requests.Session.return_value.get.side_effect = (
+            create_mock_with_fixtures(
+                {"poll_open_date__gte": "2018-01-03"},
+                local_highland_parent,
+                [local_highland],
+            )
         )
         call_command("uk_create_elections_from_every_election")
         self.assertEqual(every_election.Ballot.objects.all().count(), 1)
@@ -360,12 +372,14 @@ class EE_ImporterTest(WebTest):
 
         # now we've switched the fixtures round
         # so the records we just imported are deleted in EE
-        mock_requests.get.side_effect = create_mock_with_fixtures(
-            {"poll_open_date__gte": "2018-01-03"},
-            no_results,
-            [no_results],
-            # TODO: mock all URLS for deleted results
-            deleted=local_highland,
+        mock_requests.Session.return_value.get.side_effect = (
+            create_mock_with_fixtures(
+                {"poll_open_date__gte": "2018-01-03"},
+                no_results,
+                [no_results],
+                # TODO: mock all URLS for deleted results
+                deleted=local_highland,
+            )
         )
         call_command("uk_create_elections_from_every_election")
 
@@ -380,7 +394,7 @@ class EE_ImporterTest(WebTest):
     ):
         # import some data
         # just so we've got a non-empty DB
-        mock_requests.get.side_effect = (
+        mock_requests.Session.return_value.get.side_effect = (
             fake_requests_each_type_of_election_on_one_day
         )
         call_command("uk_create_elections_from_every_election")
@@ -391,11 +405,13 @@ class EE_ImporterTest(WebTest):
         # the same election/s as deleted and not deleted
         # this makes no sense and shouldn't happen but
         # if it does we should not delete anything
-        mock_requests.get.side_effect = create_mock_with_fixtures(
-            {"poll_open_date__gte": "2018-01-03"},
-            local_highland_parent,
-            [local_highland],
-            deleted=local_highland,
+        mock_requests.Session.return_value.get.side_effect = (
+            create_mock_with_fixtures(
+                {"poll_open_date__gte": "2018-01-03"},
+                local_highland_parent,
+                [local_highland],
+                deleted=local_highland,
+            )
         )
 
         # make sure we throw an exception
@@ -413,10 +429,12 @@ class EE_ImporterTest(WebTest):
         self, mock_requests
     ):
         # import some data
-        mock_requests.get.side_effect = create_mock_with_fixtures(
-            {"poll_open_date__gte": "2018-01-03"},
-            parents=local_highland_parent,
-            ballot_pages=[local_highland],
+        mock_requests.Session.return_value.get.side_effect = (
+            create_mock_with_fixtures(
+                {"poll_open_date__gte": "2018-01-03"},
+                parents=local_highland_parent,
+                ballot_pages=[local_highland],
+            )
         )
         call_command("uk_create_elections_from_every_election")
         self.assertEqual(every_election.Ballot.objects.all().count(), 1)
@@ -438,11 +456,13 @@ class EE_ImporterTest(WebTest):
             "previous": None,
             "results": [local_highland["results"][0]],
         }
-        mock_requests.get.side_effect = create_mock_with_fixtures(
-            {"poll_open_date__gte": "2018-01-03"},
-            parents=local_highland_parent,
-            ballot_pages=[current_elections],
-            deleted=deleted_elections,
+        mock_requests.Session.return_value.get.side_effect = (
+            create_mock_with_fixtures(
+                {"poll_open_date__gte": "2018-01-03"},
+                parents=local_highland_parent,
+                ballot_pages=[current_elections],
+                deleted=deleted_elections,
+            )
         )
 
         # make sure we throw an exception
@@ -458,10 +478,12 @@ class EE_ImporterTest(WebTest):
     @freeze_time("2018-02-02")
     def test_delete_elections_with_related_membership(self, mock_requests):
         # import some data
-        mock_requests.get.side_effect = create_mock_with_fixtures(
-            {"poll_open_date__gte": "2018-01-03"},
-            local_highland_parent,
-            [local_highland],
+        mock_requests.Session.return_value.get.side_effect = (
+            create_mock_with_fixtures(
+                {"poll_open_date__gte": "2018-01-03"},
+                local_highland_parent,
+                [local_highland],
+            )
         )
         call_command("uk_create_elections_from_every_election")
         self.assertEqual(every_election.Ballot.objects.all().count(), 1)
@@ -476,11 +498,13 @@ class EE_ImporterTest(WebTest):
 
         # now we've switched the fixtures round
         # so the records we just imported are deleted in EE
-        mock_requests.get.side_effect = create_mock_with_fixtures(
-            {"poll_open_date__gte": "2018-01-03"},
-            no_results,
-            [no_results],
-            deleted=local_highland,
+        mock_requests.Session.return_value.get.side_effect = (
+            create_mock_with_fixtures(
+                {"poll_open_date__gte": "2018-01-03"},
+                no_results,
+                [no_results],
+                deleted=local_highland,
+            )
         )
         # make sure we throw an exception
         with self.assertRaises(Exception):
@@ -499,11 +523,13 @@ class EE_ImporterTest(WebTest):
         :param mock_requests:
         :return:
         """
-        mock_requests.get.side_effect = create_mock_with_fixtures(
-            {"poll_open_date__gte": "2018-01-03"},
-            duplicate_post_names_parent,
-            [duplicate_post_names],
-            deleted=no_results,
+        mock_requests.Session.return_value.get.side_effect = (
+            create_mock_with_fixtures(
+                {"poll_open_date__gte": "2018-01-03"},
+                duplicate_post_names_parent,
+                [duplicate_post_names],
+                deleted=no_results,
+            )
         )
         call_command("uk_create_elections_from_every_election")
         post_a, post_b = Post.objects.all().order_by(
@@ -529,21 +555,25 @@ class EE_ImporterTest(WebTest):
         Test that posts imported before GSS codes aren't duplicated
         at the point we have GSS codes for them in EE
         """
-        mock_requests.get.side_effect = create_mock_with_fixtures(
-            {"poll_open_date__gte": "2019-04-02"},
-            get_changing_identifier_code_result_parent,
-            [pre_gss_result],
-            deleted=no_results,
+        mock_requests.Session.return_value.get.side_effect = (
+            create_mock_with_fixtures(
+                {"poll_open_date__gte": "2019-04-02"},
+                get_changing_identifier_code_result_parent,
+                [pre_gss_result],
+                deleted=no_results,
+            )
         )
         self.assertEqual(Post.objects.count(), 0)
         call_command("uk_create_elections_from_every_election")
         self.assertEqual(Post.objects.count(), 1)
 
-        mock_requests.get.side_effect = create_mock_with_fixtures(
-            {"poll_open_date__gte": "2019-04-02"},
-            get_changing_identifier_code_result_parent,
-            [post_gss_result],
-            deleted=no_results,
+        mock_requests.Session.return_value.get.side_effect = (
+            create_mock_with_fixtures(
+                {"poll_open_date__gte": "2019-04-02"},
+                get_changing_identifier_code_result_parent,
+                [post_gss_result],
+                deleted=no_results,
+            )
         )
 
         call_command("uk_create_elections_from_every_election")
@@ -570,10 +600,12 @@ class EE_ImporterTest(WebTest):
         self.assertEqual(Ballot.objects.all().count(), 1)
         old_ballot = Ballot.objects.get()
 
-        mock_requests.get.side_effect = create_mock_with_fixtures(
-            {"poll_open_date__gte": "2019-04-02"},
-            parents=replaced_election_parents,
-            ballot_pages=[replaced_election],
+        mock_requests.Session.return_value.get.side_effect = (
+            create_mock_with_fixtures(
+                {"poll_open_date__gte": "2019-04-02"},
+                parents=replaced_election_parents,
+                ballot_pages=[replaced_election],
+            )
         )
 
         call_command("uk_create_elections_from_every_election")
@@ -586,10 +618,12 @@ class EE_ImporterTest(WebTest):
     def test_create_duplicate_post_election(self, mock_requests):
         self.assertEqual(Ballot.objects.all().count(), 0)
 
-        mock_requests.get.side_effect = create_mock_with_fixtures(
-            {"poll_open_date__gte": "2019-04-02"},
-            duplicate_post_and_election_parents,
-            [duplicate_post_and_election],
+        mock_requests.Session.return_value.get.side_effect = (
+            create_mock_with_fixtures(
+                {"poll_open_date__gte": "2019-04-02"},
+                duplicate_post_and_election_parents,
+                [duplicate_post_and_election],
+            )
         )
 
         call_command("uk_create_elections_from_every_election")
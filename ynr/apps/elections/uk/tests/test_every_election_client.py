@@ -0,0 +1,235 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from candidates.tests.factories import ElectionFactory
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from elections.models import Election
+from elections.uk.every_election import EEAPIClient, EveryElectionImporter
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+def make_election(election_id, children=None, current=True):
+    return {
+        "election_id": election_id,
+        "children": children or [],
+        "group": None,
+        "group_type": "election" if children else None,
+        "current": current,
+    }
+
+
+class FakeEveryElection(ThreadingHTTPServer):
+    """
+    Enough of the EveryElection API to test the importer against: a list of
+    elections that can be filtered and is paginated with limit/offset, and
+    conditional GETs using an ETag.
+    """
+
+    page_size = 2
+    etag = '"v1"'
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeEveryElectionHandler)
+        self.elections = []
+        self.requests = []
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return "http://{}:{}/".format(*self.server_address)
+
+    def filter_elections(self, params):
+        elections = self.elections
+        if "election_id_regex" in params:
+            regex = re.compile(params["election_id_regex"])
+            elections = [e for e in elections if regex.search(e["election_id"])]
+        if "poll_open_date" in params:
+            elections = [
+                e
+                for e in elections
+                if e["election_id"].endswith(params["poll_open_date"])
+            ]
+        if "identifier_type" in params:
+            elections = [e for e in elections if e["group_type"] == "election"]
+        return elections
+
+
+class FakeEveryElectionHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        with self.server.lock:
+            self.server.requests.append((url, dict(self.headers)))
+
+        if self.headers.get("If-None-Match") == self.server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        limit = int(params.pop("limit", self.server.page_size))
+        offset = int(params.pop("offset", 0))
+        elections = self.server.filter_elections(params)
+
+        next_url = None
+        if offset + limit < len(elections):
+            params.update({"limit": limit, "offset": offset + limit})
+            next_url = (
+                f"{self.server.base_url}api/elections/?{urlencode(params)}"
+            )
+        body = json.dumps(
+            {
+                "count": len(elections),
+                "next": next_url,
+                "results": elections[offset : offset + limit],
+            }
+        ).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", self.server.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeEveryElectionMixin:
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.fake_ee = FakeEveryElection()
+        cls.fake_ee_thread = threading.Thread(
+            target=cls.fake_ee.serve_forever, daemon=True
+        )
+        cls.fake_ee_thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.fake_ee.shutdown()
+        cls.fake_ee.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        self.fake_ee.elections = []
+        self.fake_ee.requests = []
+        settings_override = override_settings(EE_BASE_URL=self.fake_ee.base_url)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def request_paths(self):
+        return [
+            (url.path, parse_qs(url.query)) for url, _ in self.fake_ee.requests
+        ]
+
+
+class TestEEAPIClient(FakeEveryElectionMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.fake_ee.elections = [
+            make_election(f"local.place-{i}.2024-05-02") for i in range(7)
+        ]
+        self.url = f"{self.fake_ee.base_url}api/elections/"
+
+    def test_get_results_fetches_every_page_in_order(self):
+        client = EEAPIClient(max_workers=3)
+        results = client.get_results([self.url])
+        self.assertEqual(results, self.fake_ee.elections)
+        # The first page, then the other 3 pages at once
+        self.assertEqual(len(self.fake_ee.requests), 4)
+
+    def test_get_page_urls(self):
+        client = EEAPIClient()
+        self.assertEqual(
+            client.get_page_urls(f"{self.url}?a=1&limit=2&offset=2", 7),
+            [
+                f"{self.url}?a=1&limit=2&offset=2",
+                f"{self.url}?a=1&limit=2&offset=4",
+                f"{self.url}?a=1&limit=2&offset=6",
+            ],
+        )
+        self.assertIsNone(client.get_page_urls(f"{self.url}?page=2", 7))
+
+    def test_no_conditional_request_without_cache(self):
+        client = EEAPIClient()
+        client.get(self.url)
+        client.get(self.url)
+        for _, headers in self.fake_ee.requests:
+            self.assertNotIn("If-None-Match", headers)
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_conditional_request(self):
+        client = EEAPIClient()
+        first = client.get(self.url)
+        # Another client, like the next run of the importer
+        second = EEAPIClient().get(self.url)
+        self.assertEqual(first, second)
+        _, headers = self.fake_ee.requests[-1]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+
+
+class TestEveryElectionImporterRequests(FakeEveryElectionMixin, TestCase):
+    def test_children_only_requested_once(self):
+        self.fake_ee.elections = [
+            make_election(
+                "local.brent.2024-05-02",
+                children=[
+                    "local.brent.alperton.2024-05-02",
+                    "local.brent.barnhill.2024-05-02",
+                    "local.brent.brondesbury-park.2024-05-02",
+                ],
+            ),
+            make_election("local.brent.alperton.2024-05-02"),
+            make_election("local.brent.barnhill.2024-05-02"),
+            make_election("local.brent.brondesbury-park.2024-05-02"),
+        ]
+        importer = EveryElectionImporter()
+        importer.build_election_tree()
+        self.assertEqual(
+            list(importer.election_tree.keys()),
+            [e["election_id"] for e in self.fake_ee.elections],
+        )
+        child_requests = [
+            params
+            for _, params in self.request_paths()
+            if params.get("election_id_regex") == ["local.brent"]
+        ]
+        # One request for each page of the children
+        self.assertEqual(len(child_requests), 2)
+
+    def test_check_current_asks_about_many_elections_at_once(self):
+        for i in range(60):
+            slug = f"local.place-{i}.2020-05-07"
+            ElectionFactory(slug=slug, election_date="2020-05-07", current=True)
+            self.fake_ee.elections.append(
+                make_election(slug, current=i % 2 == 0)
+            )
+        ElectionFactory(
+            slug="local.deleted.2020-05-07",
+            election_date="2020-05-07",
+            current=True,
+        )
+        self.fake_ee.page_size = 100
+        self.addCleanup(setattr, self.fake_ee, "page_size", 2)
+
+        call_command(
+            "uk_create_elections_from_every_election", check_current=True
+        )
+
+        self.assertEqual(
+            len(self.fake_ee.requests),
+            2,
+            "Should ask about 50 elections in each request",
+        )
+        self.assertEqual(Election.objects.filter(current=True).count(), 31)
+        self.assertTrue(
+            Election.objects.get(slug="local.deleted.2020-05-07").current
+        )
@@ -0,0 +1,133 @@
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from elections.uk.geo_helpers import (
+    BadPostcodeException,
+    UnknownGeoException,
+    ballot_paper_ids_from_ee,
+    get_lookup_counts,
+)
+from mock import Mock, patch
+from requests.exceptions import Timeout
+
+URL = "https://elections.democracyclub.org.uk/api/elections/?postcode=se240ag"
+CACHE_KEY = "geolookup-postcodes:True:se240ag"
+
+
+def ee_response(status_code=200, json_result=None):
+    if json_result is None:
+        json_result = {
+            "results": [
+                {"election_id": "parl.2017-06-08", "group_type": "election"},
+                {"election_id": "parl.dulwich.2017-06-08", "group_type": None},
+            ]
+        }
+    return Mock(
+        **{"status_code": status_code, "json.return_value": json_result}
+    )
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+)
+@patch("elections.uk.geo_helpers.requests")
+class TestBallotPaperIdsFromEE(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def lookup(self):
+        return ballot_paper_ids_from_ee(URL, CACHE_KEY, BadPostcodeException)
+
+    def make_stale(self):
+        entry = cache.get(CACHE_KEY)
+        entry["fresh_until"] = time.time() - 1
+        cache.set(CACHE_KEY, entry)
+
+    def test_results_are_cached(self, mock_requests):
+        mock_requests.get.return_value = ee_response()
+        self.assertEqual(self.lookup(), ["parl.dulwich.2017-06-08"])
+        self.assertEqual(self.lookup(), ["parl.dulwich.2017-06-08"])
+        mock_requests.get.assert_called_once_with(URL, timeout=5)
+        counts = get_lookup_counts()
+        self.assertEqual(counts["miss"], 1)
+        self.assertEqual(counts["hit"], 1)
+
+    def test_empty_results_are_cached(self, mock_requests):
+        mock_requests.get.return_value = ee_response(
+            json_result={"results": []}
+        )
+        self.assertEqual(self.lookup(), [])
+        self.assertEqual(self.lookup(), [])
+        mock_requests.get.assert_called_once()
+
+    def test_bad_postcodes_are_cached(self, mock_requests):
+        mock_requests.get.return_value = ee_response(
+            400, {"detail": "Invalid postcode"}
+        )
+        for i in range(2):
+            with self.assertRaisesMessage(
+                BadPostcodeException, "Invalid postcode"
+            ):
+                self.lookup()
+        mock_requests.get.assert_called_once()
+        self.assertEqual(get_lookup_counts()["negative"], 1)
+
+    def test_stale_result_refreshed(self, mock_requests):
+        mock_requests.get.return_value = ee_response()
+        self.lookup()
+        self.make_stale()
+        mock_requests.get.return_value = ee_response(
+            json_result={"results": []}
+        )
+        self.assertEqual(self.lookup(), [])
+        self.assertEqual(mock_requests.get.call_count, 2)
+
+    def test_stale_result_served_while_refreshing(self, mock_requests):
+        mock_requests.get.return_value = ee_response()
+        self.lookup()
+        self.make_stale()
+        # Another request is refreshing the result
+        cache.add(f"{CACHE_KEY}:lock", True)
+        self.assertEqual(self.lookup(), ["parl.dulwich.2017-06-08"])
+        mock_requests.get.assert_called_once()
+        self.assertEqual(get_lookup_counts()["stale"], 1)
+
+    def test_stale_result_served_if_ee_times_out(self, mock_requests):
+        mock_requests.get.return_value = ee_response()
+        self.lookup()
+        self.make_stale()
+        mock_requests.get.side_effect = Timeout()
+        self.assertEqual(self.lookup(), ["parl.dulwich.2017-06-08"])
+        self.assertEqual(get_lookup_counts()["stale"], 1)
+        # The lock is released for the next request to try again
+        self.assertIsNone(cache.get(f"{CACHE_KEY}:lock"))
+
+    def test_timeout_without_cached_result(self, mock_requests):
+        mock_requests.get.side_effect = Timeout()
+        with self.assertRaises(UnknownGeoException):
+            self.lookup()
+        self.assertEqual(get_lookup_counts()["error"], 1)
+
+    def test_concurrent_lookups_are_coalesced(self, mock_requests):
+        # Another request is asking EE, and caches its result while we wait
+        cache.add(f"{CACHE_KEY}:lock", True)
+
+        def other_request_finishes(seconds):
+            cache.set(
+                CACHE_KEY,
+                {
+                    "ballot_paper_ids": ["parl.dulwich.2017-06-08"],
+                    "fresh_until": time.time() + 60,
+                },
+            )
+
+        with patch(
+            "elections.uk.geo_helpers.time.sleep",
+            side_effect=other_request_finishes,
+        ):
+            self.assertEqual(self.lookup(), ["parl.dulwich.2017-06-08"])
+        mock_requests.get.assert_not_called()
+        self.assertEqual(get_lookup_counts()["coalesced"], 1)
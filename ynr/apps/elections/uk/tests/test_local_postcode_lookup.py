@@ -0,0 +1,187 @@
+import os
+import tempfile
+from io import StringIO
+
+from candidates.tests.uk_examples import UK2015ExamplesMixin
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from elections.uk.geo_helpers import get_ballots_from_postcode
+from elections.uk.models import Postcode
+from mock import Mock, patch
+from popolo.models import Post
+
+ONSPD_SAMPLE = os.path.join(os.path.dirname(__file__), "onspd_sample.csv")
+
+
+class TestImportPostcodeDivisions(TestCase):
+    def test_import(self):
+        out = StringIO()
+        call_command("uk_import_postcode_divisions", ONSPD_SAMPLE, stdout=out)
+        self.assertEqual(out.getvalue(), "Imported 3 postcodes\n")
+        # Terminated postcodes aren't imported
+        self.assertEqual(
+            list(
+                Postcode.objects.order_by("postcode").values_list(
+                    "postcode", flat=True
+                )
+            ),
+            ["eh75aa", "me159qa", "se228dj"],
+        )
+        # Nor are pseudo codes for "no division of this type"
+        self.assertEqual(
+            Postcode.objects.get(postcode="se228dj").division_identifiers,
+            [
+                "gss:E05000538",
+                "gss:E09000028",
+                "gss:E14000673",
+                "gss:E23000001",
+            ],
+        )
+
+    def test_import_replaces_existing_postcodes(self):
+        Postcode.objects.create(
+            postcode="cb28rq", division_identifiers=["gss:E05002712"]
+        )
+        call_command(
+            "uk_import_postcode_divisions", ONSPD_SAMPLE, stdout=StringIO()
+        )
+        self.assertFalse(Postcode.objects.filter(postcode="cb28rq").exists())
+
+    def test_import_row_per_division(self):
+        """
+        A dump with a row for each postcode and division, sorted by postcode
+        """
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as f:
+            f.write(
+                "postcode,division\n"
+                "SE22 8DJ,gss:E05000538\n"
+                "SE22 8DJ,gss:E14000673\n"
+                "SE228DL,gss:E05000538\n"
+            )
+            f.flush()
+            call_command(
+                "uk_import_postcode_divisions",
+                f.name,
+                postcode_column="postcode",
+                division_columns="division",
+                stdout=StringIO(),
+            )
+        self.assertEqual(
+            dict(
+                Postcode.objects.values_list("postcode", "division_identifiers")
+            ),
+            {
+                "se228dj": ["gss:E05000538", "gss:E14000673"],
+                "se228dl": ["gss:E05000538"],
+            },
+        )
+
+
+@override_settings(USE_LOCAL_POSTCODE_LOOKUP=True)
+@patch("elections.uk.geo_helpers.requests")
+class TestLocalPostcodeLookup(UK2015ExamplesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        Post.objects.filter(pk=self.dulwich_post.pk).update(
+            identifier="gss:E14000673"
+        )
+        Post.objects.filter(pk=self.local_post.pk).update(
+            identifier="gss:E05005004"
+        )
+        call_command(
+            "uk_import_postcode_divisions", ONSPD_SAMPLE, stdout=StringIO()
+        )
+
+    def test_lookup_uses_local_index(self, mock_requests):
+        with self.assertNumQueries(1):
+            ballot_ids = get_ballots_from_postcode("SE22 8DJ", ids_only=True)
+        self.assertEqual(ballot_ids, [self.dulwich_post_ballot.ballot_paper_id])
+        self.assertEqual(
+            list(get_ballots_from_postcode("me15 9qa")), [self.local_ballot]
+        )
+        mock_requests.get.assert_not_called()
+
+    def test_lookup_not_current_only_uses_ee(self, mock_requests):
+        # Past ballots can be for divisions that aren't in the local index
+        mock_requests.get.return_value = Mock(
+            **{
+                "status_code": 200,
+                "json.return_value": {
+                    "results": [
+                        {
+                            "election_id": self.dulwich_post_ballot_earlier.ballot_paper_id,
+                            "group_type": None,
+                        },
+                        {
+                            "election_id": self.dulwich_post_ballot.ballot_paper_id,
+                            "group_type": None,
+                        },
+                    ]
+                },
+            }
+        )
+        ballot_ids = get_ballots_from_postcode(
+            "SE22 8DJ", current_only=False, ids_only=True
+        )
+        self.assertEqual(
+            ballot_ids,
+            [
+                self.dulwich_post_ballot_earlier.ballot_paper_id,
+                self.dulwich_post_ballot.ballot_paper_id,
+            ],
+        )
+        mock_requests.get.assert_called_once()
+
+    def test_known_postcode_without_ballots_falls_back_to_ee(
+        self, mock_requests
+    ):
+        # The local index might not have the divisions a ballot is for
+        mock_requests.get.return_value = Mock(
+            **{
+                "status_code": 200,
+                "json.return_value": {
+                    "results": [
+                        {
+                            "election_id": self.edinburgh_east_post_ballot.ballot_paper_id,
+                            "group_type": None,
+                        }
+                    ]
+                },
+            }
+        )
+        self.assertEqual(Postcode.objects.ballot_paper_ids("EH7 5AA"), [])
+        self.assertEqual(
+            get_ballots_from_postcode("EH7 5AA", ids_only=True),
+            [self.edinburgh_east_post_ballot.ballot_paper_id],
+        )
+        mock_requests.get.assert_called_once()
+
+    def test_unknown_postcode_falls_back_to_ee(self, mock_requests):
+        mock_requests.get.return_value = Mock(
+            **{
+                "status_code": 200,
+                "json.return_value": {
+                    "results": [
+                        {
+                            "election_id": self.camberwell_post_ballot.ballot_paper_id,
+                            "group_type": None,
+                        }
+                    ]
+                },
+            }
+        )
+        self.assertEqual(
+            list(get_ballots_from_postcode("SE15 5DQ")),
+            [self.camberwell_post_ballot],
+        )
+        mock_requests.get.assert_called_once()
+
+    @override_settings(USE_LOCAL_POSTCODE_LOOKUP=False)
+    def test_local_index_not_used_unless_enabled(self, mock_requests):
+        mock_requests.get.return_value = Mock(
+            **{"status_code": 200, "json.return_value": {"results": []}}
+        )
+        self.assertEqual(
+            get_ballots_from_postcode("SE22 8DJ", ids_only=True), []
+        )
+        mock_requests.get.assert_called_once()
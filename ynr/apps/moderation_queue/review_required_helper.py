@@ -113,13 +113,13 @@ class CandidateStatementEditDecider(BaseReviewRequiredDecider):
     def needs_review(self):
         if self.logged_action.person:
             la = self.logged_action
-            for version_diff in la.person.version_diffs:
-                if version_diff["version_id"] == la.popit_person_new_version:
-                    this_diff = version_diff["diffs"][0]["parent_diff"]
-                    for op in this_diff:
-                        if op["path"] == "biography":
-                            # this is an edit to a biography / statement
-                            return self.Status.NEEDS_REVIEW
+            this_diff = la.person.get_version_parent_diff(
+                la.popit_person_new_version
+            )
+            for op in this_diff:
+                if op["path"] == "biography":
+                    # this is an edit to a biography / statement
+                    return self.Status.NEEDS_REVIEW
         return self.Status.UNDECIDED
 
 
@@ -206,16 +206,13 @@ class CandidateCurrentNameDecider(BaseReviewRequiredDecider):
             )
             if qs.exists():
                 # This person is standing in a current election
-                for version_diff in la.person.version_diffs:
-                    if (
-                        version_diff["version_id"]
-                        == la.popit_person_new_version
-                    ):
-                        this_diff = version_diff["diffs"][0]["parent_diff"]
-                        for op in this_diff:
-                            if op["path"] == "name" and op["op"] == "replace":
-                                # this is an edit to a name
-                                return self.Status.NEEDS_REVIEW
+                this_diff = la.person.get_version_parent_diff(
+                    la.popit_person_new_version
+                )
+                for op in this_diff:
+                    if op["path"] == "name" and op["op"] == "replace":
+                        # this is an edit to a name
+                        return self.Status.NEEDS_REVIEW
             return self.Status.UNDECIDED
         return None
 
@@ -272,13 +269,13 @@ class OpenAIModerationReview(BaseReviewRequiredDecider):
 
         statement = None
         la = self.logged_action
-        for version_diff in la.person.version_diffs:
-            if version_diff["version_id"] == la.popit_person_new_version:
-                this_diff = version_diff["diffs"][0]["parent_diff"]
-                for op in this_diff:
-                    if op["path"] == "biography":
-                        # this is an edit to a biography / statement
-                        statement = op["value"]
+        this_diff = la.person.get_version_parent_diff(
+            la.popit_person_new_version
+        )
+        for op in this_diff:
+            if op["path"] == "biography":
+                # this is an edit to a biography / statement
+                statement = op["value"]
         if not statement:
             return self.Status.UNDECIDED
 
@@ -99,9 +99,10 @@ with the source: \n> {source}
         message_added_fields = []
         message_removed_fields = []
         message_replaced_fields = []
-        for diff in self.logged_action.person.version_diffs[0]["diffs"][0][
-            "parent_diff"
-        ]:
+        person = self.logged_action.person
+        for diff in person.get_version_parent_diff(
+            person.versions[0]["version_id"]
+        ):
             fields_category = None
             section_category = None
             text_data = self.format_text(diff)
@@ -7,6 +7,7 @@ class ElectionSOPNAdmin(admin.ModelAdmin):
     list_display = ("created", "election", "source_url")
     search_fields = ("ballot__ballot_paper_id", "source_url")
     ordering = ("-created",)
+    exclude = ("page_texts",)
 
 
 class BallotSOPNAdmin(admin.ModelAdmin):
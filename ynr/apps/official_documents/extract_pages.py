@@ -1,8 +1,10 @@
 import io
-from io import StringIO
-from typing import Dict, List, Optional
+from collections import defaultdict
+from functools import cached_property
+from typing import Dict, List, Optional, Set
 
 from candidates.models import Ballot
+from django.conf import settings
 from django.core.files.base import ContentFile
 from django.db import transaction
 from django.db.models.functions import Length
@@ -10,16 +12,14 @@ from official_documents.models import (
     ElectionSOPN,
     PageMatchingMethods,
     add_ballot_sopn,
+    sha256_for_file,
 )
-from pdfminer.converter import TextConverter
-from pdfminer.layout import LAParams
 from pdfminer.pdfdocument import PDFEncryptionError, PDFTextExtractionNotAllowed
-from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
-from pdfminer.pdfpage import PDFPage
 from pdfminer.pdfparser import PDFSyntaxError
 from pdfminer.pdftypes import PDFException
 from PyPDF2 import PdfReader, PdfWriter
 from PyPDF2.errors import DependencyError, PdfReadError
+from sopn_parsing.helpers.extract_text import extract_page_texts
 from sopn_parsing.helpers.text_helpers import (
     MatchedPagesError,
     NoTextInDocumentError,
@@ -28,13 +28,17 @@ from sopn_parsing.helpers.text_helpers import (
 )
 
 
-def extract_pages_for_election_sopn(election_sopn: ElectionSOPN):
+def extract_pages_for_election_sopn(
+    election_sopn: ElectionSOPN, workers: int = None
+):
     """
     Try to extract the page numbers for an ElectionSOPN
 
     """
     try:
-        election_sopn_document = ElectionSOPNDocument(election_sopn)
+        election_sopn_document = ElectionSOPNDocument(
+            election_sopn, workers=workers
+        )
 
         election_sopn_document.match_all_pages()
         if (
@@ -76,6 +80,16 @@ class SOPNPageText:
         self.post_label_to_match = None
         self.previous_page = None
 
+    @cached_property
+    def page_heading(self):
+        words = clean_page_text(self.text).split(" ")
+        threshold = int(len(words) * HEADING_SIZE)
+        return " ".join(words[0:threshold])
+
+    @cached_property
+    def page_heading_set(self):
+        return set(self.page_heading.split(" "))
+
     def get_page_heading_set(self):
         """
         Split the page heading (as defined by `get_page_heading`) on space
@@ -83,17 +97,16 @@ class SOPNPageText:
 
         This is used to compare to other sets with set.intersection.
         """
-        return set(self.get_page_heading().split(" "))
+        return self.page_heading_set
 
     def get_page_heading(self):
         """
         Get the top of each page, as defined by `HEADING_SIZE`.
 
-        Do some basic cleaning of the heading.
+        Do some basic cleaning of the heading. The heading is only worked out
+        once per page, as pages are checked against every ballot.
         """
-        words = clean_page_text(self.text).split(" ")
-        threshold = int(len(words) * HEADING_SIZE)
-        return " ".join(words[0:threshold])
+        return self.page_heading
 
     def contains_post_label(self, post_label=None):
         ward_name = post_label or self.post_label_to_match
@@ -175,8 +188,13 @@ class ElectionSOPNDocument:
 
     """
 
-    def __init__(self, election_sopn: ElectionSOPN, strict=True):
+    def __init__(
+        self, election_sopn: ElectionSOPN, strict=True, workers: int = None
+    ):
         self.election_sopn = election_sopn
+        if workers is None:
+            workers = settings.SOPN_TEXT_EXTRACTION_WORKERS
+        self.workers = workers
         try:
             self.pages = self.parse_pages()
         except (
@@ -214,6 +232,36 @@ class ElectionSOPNDocument:
             and len(self.pages[2].get_page_heading_set()) < 10
         )
 
+    @cached_property
+    def heading_index(self) -> Dict[str, Set[int]]:
+        """
+        An inverted index of each word in a page heading to the numbers of
+        the pages with that word in their heading
+        """
+        index = defaultdict(set)
+        for page in self.pages.values():
+            for word in page.get_page_heading_set():
+                index[word].add(page.page_number)
+        return index
+
+    def candidate_page_numbers(self, post_label: str) -> Set[int]:
+        """
+        The numbers of the pages that might contain `post_label` in their
+        heading, as checked by `SOPNPageText.contains_post_label`.
+
+        A post label matches if any of its "/" separated parts is anywhere in
+        the heading, so every word in that part must be inside a word of the
+        heading. Looking up pages by the longest word in each part narrows
+        down the pages that need checking.
+        """
+        page_numbers = set()
+        for ward in post_label.split("/"):
+            longest_word = max(ward.split(" "), key=len)
+            for word, word_page_numbers in self.heading_index.items():
+                if longest_word in word:
+                    page_numbers.update(word_page_numbers)
+        return page_numbers
+
     @property
     def matched_page_numbers(self) -> List[int]:
         """
@@ -269,11 +317,20 @@ class ElectionSOPNDocument:
 
         For more on this format, see https://camelot-py.readthedocs.io/en/master/user/quickstart.html?highlight=pages#specify-page-numbers
         """
+        post_label = clean_text(ballot.post.label)
+        candidate_page_numbers = self.candidate_page_numbers(post_label)
         matched_to_ballot = []
         for page in self.unmatched_pages:
+            if (
+                not matched_to_ballot
+                and page.page_number not in candidate_page_numbers
+            ):
+                # This page can't contain the post label
+                continue
+
             page.previous_page = self.pages.get(page.page_number - 1)
             page.document_heading_set = self.document_heading_set
-            page.post_label_to_match = clean_text(ballot.post.label)
+            page.post_label_to_match = post_label
 
             if matched_to_ballot and not page.is_continuation_page:
                 break
@@ -324,24 +381,43 @@ class ElectionSOPNDocument:
         Returns a dictionary where the key is the page number, and the value is
         a SOPNPageText object
         """
-        pages = {}
-        rsrcmgr = PDFResourceManager()
+        return {
+            page_no: SOPNPageText(page_no, text)
+            for page_no, text in enumerate(self.get_page_texts(), start=1)
+        }
 
-        laparams = LAParams(line_margin=0.1)
-        fp = self.election_sopn.uploaded_file.file
+    def get_page_texts(self) -> List[str]:
+        """
+        The text of each page in the document.
 
-        for page_no, page in enumerate(
-            PDFPage.get_pages(fp, check_extractable=True), start=1
-        ):
-            retstr = StringIO()
-            device = TextConverter(rsrcmgr, retstr, laparams=laparams)
-            interpreter = PDFPageInterpreter(rsrcmgr, device)
-            interpreter.process_page(page)
-            pages[page_no] = SOPNPageText(page_no, retstr.getvalue())
-            device.close()
-            retstr.close()
+        Extracting the text is slow, so it's stored on the ElectionSOPN and
+        re-used until a different file is uploaded.
+        """
+        # Historical models in migrations might not have `page_texts`
+        can_store = hasattr(self.election_sopn, "page_texts")
+        file_name = self.election_sopn.uploaded_file.name
+        stored = getattr(self.election_sopn, "page_texts", None)
+        if stored and stored.get("uploaded_file") == file_name:
+            return stored["pages"]
+
+        page_texts = self.extract_page_texts()
+        if can_store and self.election_sopn.pk:
+            self.election_sopn.page_texts = {
+                "uploaded_file": file_name,
+                "pages": page_texts,
+            }
+            self.election_sopn.save(update_fields=["page_texts"])
+        return page_texts
+
+    def extract_page_texts(self) -> List[str]:
+        """
+        Use pdfminer to get the text of each page in the uploaded file, using
+        `self.workers` processes
+        """
+        fp = self.election_sopn.uploaded_file.file
+        pdf = fp.read()
         fp.close()
-        return pages
+        return extract_page_texts(pdf, workers=self.workers)
 
 
 def clean_matcher_data(ballot_to_pages):
@@ -396,6 +472,9 @@ class ElectionSOPNPageSplitter:
         self.ballot_to_pages = ballot_to_pages
         if not self.election_sopn.uploaded_file.name.endswith("pdf"):
             raise PdfReadError("Not a PDF")
+        # Extracting the page text has already read and closed the file
+        with self.election_sopn.uploaded_file.open("rb") as uploaded_file:
+            self.content_hash = sha256_for_file(uploaded_file)
         self.reader = PdfReader(self.election_sopn.uploaded_file.open())
 
     @transaction.atomic()
@@ -436,6 +515,9 @@ class ElectionSOPNPageSplitter:
                 self.election_sopn.source_url,
                 relevant_pages,
                 parse=parse_ballots,
+                # With no matched pages `relevant_pages` doesn't describe
+                # the slice, so let the slice itself be hashed
+                content_hash=self.content_hash if matched_pages else None,
             )
 
             self.election_sopn.page_matching_method = method
@@ -15,7 +15,6 @@ from django.core.files.base import ContentFile
 from django.core.files.storage import DefaultStorage
 from django.core.management.base import BaseCommand
 from elections.models import Election
-from official_documents.extract_pages import extract_pages_for_election_sopn
 from official_documents.models import (
     ElectionSOPN,
     add_ballot_sopn,
@@ -131,10 +130,7 @@ class Command(BaseCommand):
             source_url=source_url,
             uploaded_file=sopn_upload,
         )
-        extract_pages_for_election_sopn(election_sopn)
-        for ballot in election_sopn.election.ballot_set.all():
-            if hasattr(ballot, "sopn"):
-                ballot.sopn.parse()
+        election_sopn.split()
         return election_sopn
 
     def get_mimetype_and_extension_from_file_content(self, file_content):
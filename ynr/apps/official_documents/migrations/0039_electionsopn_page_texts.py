@@ -0,0 +1,21 @@
+# Generated by Django 4.2.11 on 2026-10-16 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("official_documents", "0038_ballotsopn_replacement_reason_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="electionsopn",
+            name="page_texts",
+            field=models.JSONField(
+                blank=True,
+                help_text="The text of each page, extracted from the uploaded file",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.11 on 2026-10-16 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("official_documents", "0039_electionsopn_page_texts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="electionsopn",
+            name="processing_error",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="electionsopn",
+            name="split_status",
+            field=models.CharField(
+                choices=[
+                    ("NOT_STARTED", "Not Started"),
+                    ("QUEUED", "Queued"),
+                    ("IN_PROGRESS", "In Progress"),
+                    ("SUCCEEDED", "Succeeded"),
+                    ("FAILED", "Failed"),
+                ],
+                default="NOT_STARTED",
+                max_length=255,
+            ),
+        ),
+        migrations.AddField(
+            model_name="ballotsopn",
+            name="processing_error",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="ballotsopn",
+            name="extract_status",
+            field=models.CharField(
+                choices=[
+                    ("NOT_STARTED", "Not Started"),
+                    ("QUEUED", "Queued"),
+                    ("IN_PROGRESS", "In Progress"),
+                    ("SUCCEEDED", "Succeeded"),
+                    ("FAILED", "Failed"),
+                ],
+                default="NOT_STARTED",
+                max_length=255,
+            ),
+        ),
+        migrations.AddField(
+            model_name="ballotsopn",
+            name="parse_status",
+            field=models.CharField(
+                choices=[
+                    ("NOT_STARTED", "Not Started"),
+                    ("QUEUED", "Queued"),
+                    ("IN_PROGRESS", "In Progress"),
+                    ("SUCCEEDED", "Succeeded"),
+                    ("FAILED", "Failed"),
+                ],
+                default="NOT_STARTED",
+                max_length=255,
+            ),
+        ),
+    ]
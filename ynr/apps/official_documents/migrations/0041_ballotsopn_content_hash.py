@@ -0,0 +1,32 @@
+# Generated by Django 4.2.11 on 2026-10-16 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("official_documents", "0040_sopn_processing_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ballotsopn",
+            name="content_hash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                help_text="The sha256 of the document `relevant_pages` were taken from",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="ballotsopnhistory",
+            name="content_hash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                help_text="The sha256 of the document `relevant_pages` were taken from",
+                max_length=64,
+            ),
+        ),
+    ]
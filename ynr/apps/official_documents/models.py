@@ -1,4 +1,6 @@
 import contextlib
+import hashlib
+import logging
 import os
 import textwrap
 from pathlib import Path
@@ -9,12 +11,14 @@ from django.conf import settings
 from django.core import mail
 from django.core.files.base import ContentFile
 from django.core.validators import FileExtensionValidator
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
 from django.utils import timezone
 from django_extensions.db.models import TimeStampedModel
 from sopn_parsing.models import AWSTextractParsedSOPN
 
+logger = logging.getLogger(__name__)
+
 DOCUMENT_UPLOADERS_GROUP_NAME = "Document Uploaders"
 
 
@@ -117,7 +121,57 @@ class PageMatchingMethods(models.TextChoices):
     MANUAL_MATCHED = "Manually matched"
 
 
-class ElectionSOPN(TimeStampedModel):
+class SOPNProcessingStatus(models.TextChoices):
+    NOT_STARTED = "NOT_STARTED", "Not Started"
+    QUEUED = "QUEUED", "Queued"
+    IN_PROGRESS = "IN_PROGRESS", "In Progress"
+    SUCCEEDED = "SUCCEEDED", "Succeeded"
+    FAILED = "FAILED", "Failed"
+
+
+class SOPNProcessingStagesMixin(models.Model):
+    """
+    Records the status of each stage of processing a SOPN in the background.
+
+    Each stage has a `<stage>_status` field on the model. The error from the
+    last stage to fail is stored in `processing_error`.
+    """
+
+    processing_error = models.TextField(blank=True)
+
+    class Meta:
+        abstract = True
+
+    def set_stage_status(self, stage, status, error=""):
+        setattr(self, f"{stage}_status", status)
+        self.processing_error = error
+        self.save(
+            update_fields=[f"{stage}_status", "processing_error", "modified"]
+        )
+
+    @contextlib.contextmanager
+    def processing_stage(self, stage):
+        """
+        Mark a stage as in progress while running the wrapped code, then as
+        succeeded or (if an exception is raised) failed.
+
+        The exception is logged rather than raised, so a task that fails on
+        a bad document doesn't take down the rest of the pipeline, or the
+        request that queued it when tasks are run eagerly.
+        """
+        self.set_stage_status(stage, SOPNProcessingStatus.IN_PROGRESS)
+        try:
+            yield
+        except Exception as exception:
+            logger.exception("%s failed for %r", stage, self)
+            self.set_stage_status(
+                stage, SOPNProcessingStatus.FAILED, error=str(exception)
+            )
+            return
+        self.set_stage_status(stage, SOPNProcessingStatus.SUCCEEDED)
+
+
+class ElectionSOPN(TimeStampedModel, SOPNProcessingStagesMixin):
     """
     Stores SOPNs that contain candidate information for each ballot in an election.
 
@@ -150,6 +204,18 @@ class ElectionSOPN(TimeStampedModel):
         blank=True,
     )
 
+    page_texts = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="The text of each page, extracted from the uploaded file",
+    )
+
+    split_status = models.CharField(
+        max_length=255,
+        choices=SOPNProcessingStatus.choices,
+        default=SOPNProcessingStatus.NOT_STARTED,
+    )
+
     class Meta:
         get_latest_by = "modified"
 
@@ -171,6 +237,40 @@ class ElectionSOPN(TimeStampedModel):
             ).exists()
         )
 
+    @property
+    def splitting(self):
+        return self.split_status in (
+            SOPNProcessingStatus.QUEUED,
+            SOPNProcessingStatus.IN_PROGRESS,
+        )
+
+    def split(self, ballot_to_pages=None, method=None):
+        """
+        Split this document in to a BallotSOPN for each ballot in the
+        background, once the current transaction has been committed.
+
+        Without `ballot_to_pages`, the pages are matched to ballots
+        automatically. Each BallotSOPN is then parsed in its own task.
+        """
+        from sopn_parsing.tasks import split_election_sopn
+
+        self.set_stage_status("split", SOPNProcessingStatus.QUEUED)
+        transaction.on_commit(
+            lambda: split_election_sopn.delay(
+                self.pk, ballot_to_pages=ballot_to_pages, method=method
+            )
+        )
+
+
+def sha256_for_file(file) -> str:
+    """
+    The hex sha256 of a Django `File`, read in chunks
+    """
+    sha256 = hashlib.sha256()
+    for chunk in file.chunks():
+        sha256.update(chunk)
+    return sha256.hexdigest()
+
 
 def ballot_sopn_file_name(instance: "BaseBallotSOPN", filename):
     return (
@@ -220,6 +320,13 @@ class BaseBallotSOPN(TimeStampedModel):
         blank=True,
     )
 
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        help_text="The sha256 of the document `relevant_pages` were taken from",
+    )
+
     class Meta:
         get_latest_by = "modified"
         abstract = True
@@ -240,7 +347,18 @@ class BaseBallotSOPN(TimeStampedModel):
         return ", ".join([str(i + 1) for i in self.page_number_list])
 
 
-class BallotSOPN(BaseBallotSOPN):
+class BallotSOPN(BaseBallotSOPN, SOPNProcessingStagesMixin):
+    extract_status = models.CharField(
+        max_length=255,
+        choices=SOPNProcessingStatus.choices,
+        default=SOPNProcessingStatus.NOT_STARTED,
+    )
+    parse_status = models.CharField(
+        max_length=255,
+        choices=SOPNProcessingStatus.choices,
+        default=SOPNProcessingStatus.NOT_STARTED,
+    )
+
     def get_absolute_url(self):
         return reverse(
             "ballot_paper_sopn",
@@ -258,6 +376,29 @@ class BallotSOPN(BaseBallotSOPN):
         and async invocations) shouldn't matter here, the key point is that this is
         the front door.
 
+        The work is done in a Celery task chain (see `sopn_parsing.tasks`)
+        that's started once the current transaction has been committed, so
+        this returns straight away.
+        """
+        from sopn_parsing.tasks import ballot_sopn_pipeline
+
+        self.extract_status = SOPNProcessingStatus.QUEUED
+        self.parse_status = SOPNProcessingStatus.QUEUED
+        self.processing_error = ""
+        self.save(
+            update_fields=[
+                "extract_status",
+                "parse_status",
+                "processing_error",
+                "modified",
+            ]
+        )
+        transaction.on_commit(lambda: ballot_sopn_pipeline(self.pk).delay())
+
+    def extract_tables(self):
+        """
+        Pull the tables out of this SOPN, with every backend that's enabled.
+        This is the slow part of parsing, and is run by a Celery task.
         """
 
         from sopn_parsing.helpers.extract_tables import extract_ballot_table
@@ -298,28 +439,40 @@ def add_ballot_sopn(
     relevant_pages: str = "all",
     replacement_reason=None,
     parse=True,
+    content_hash=None,
 ):
     """
     Manage creating BallotSOPNs with history
+
+    `content_hash` is the sha256 of the document that `relevant_pages` were
+    taken from, e.g. the ElectionSOPN. If it's not given, `pdf_content` is
+    hashed. Together with `relevant_pages` this is used to re-use tables
+    extracted from identical documents.
     """
     if not replacement_reason:
         replacement_reason = ""
+    if not content_hash:
+        content_hash = sha256_for_file(pdf_content)
 
-    BallotSOPNHistory.objects.create(
+    history = BallotSOPNHistory.objects.create(
         ballot=ballot,
         relevant_pages=relevant_pages,
         uploaded_file=pdf_content,
         source_url=source_url,
         replacement_reason=replacement_reason,
+        content_hash=content_hash,
     )
 
     BallotSOPN.objects.filter(ballot=ballot).delete()
     ballot_sopn: BallotSOPN = BallotSOPN.objects.create(
         ballot=ballot,
         relevant_pages=relevant_pages,
-        uploaded_file=pdf_content,
+        # Point at the file already stored for the history entry, rather
+        # than storing a second copy
+        uploaded_file=history.uploaded_file.name,
         source_url=source_url,
         replacement_reason=replacement_reason,
+        content_hash=content_hash,
     )
     if parse:
         ballot_sopn.parse()
@@ -1,3 +1,4 @@
+import hashlib
 import json
 import textwrap
 from os.path import dirname, join, realpath
@@ -450,3 +451,9 @@ class TestElectionSOPNSplitting(TestUserMixin, WebTest):
             },
         )
         self.assertTrue(LoggedAction.objects.exists())
+        # The split document is keyed on the hash of the whole document
+        self.ballot.sopn.refresh_from_db()
+        self.assertEqual(
+            self.ballot.sopn.content_hash,
+            hashlib.sha256(EXAMPLE_PDF_PATH.read_bytes()).hexdigest(),
+        )
@@ -6,6 +6,7 @@ from candidates.models import Ballot, LoggedAction
 from candidates.models.db import ActionType, EditType
 from candidates.views.version_data import get_client_ip
 from django.core.files.base import ContentFile
+from django.db import transaction
 from django.http.response import HttpResponseRedirect
 from django.shortcuts import get_object_or_404
 from django.template.loader import render_to_string
@@ -19,7 +20,7 @@ from elections.models import Election
 from moderation_queue.models import SuggestedPostLock
 from sopn_parsing.helpers.text_helpers import NoTextInDocumentError
 
-from .extract_pages import ElectionSOPNPageSplitter, clean_matcher_data
+from .extract_pages import clean_matcher_data
 from .forms import UploadBallotSOPNForm, UploadElectionSOPNForm
 from .models import (
     DOCUMENT_UPLOADERS_GROUP_NAME,
@@ -62,12 +63,14 @@ class CreateOrUpdateBallotSOPNView(GroupRequiredMixin, UpdateView):
         context["general_election"] = self.is_general_election()
         return context
 
+    @transaction.atomic
     def form_valid(self, form):
         """
-        Saves the SOPN and attempts to parse the PDF to extract the candidate
-        information. This fails silently to avoid a 500 error if the PDF cannot
-        be parsed. We always save the file even if it cannot be parsed, then
-        create a LoggedAction and redirect the user.
+        Saves the SOPN and queues parsing the PDF to extract the candidate
+        information. Parsing happens in the background once this transaction
+        has been committed, so a PDF that can't be parsed won't cause an error
+        here. We always save the file, then create a LoggedAction and redirect
+        the user.
         """
         replacement = False
         if self.object.pk:
@@ -103,7 +106,6 @@ class CreateOrUpdateBallotSOPNView(GroupRequiredMixin, UpdateView):
             ip_address=get_client_ip(self.request),
             source=self.object.source_url,
         )
-        self.object.parse()
         return HttpResponseRedirect(self.get_success_url())
 
     def is_general_election(self):
@@ -139,6 +141,7 @@ class CreateElectionSOPNView(GroupRequiredMixin, CreateView):
             source=self.object.source_url,
             edit_type=EditType.USER,
         )
+        self.object.split()
         return ret
 
 
@@ -181,11 +184,12 @@ class ElectionSOPNMatchingView(GroupRequiredMixin, DetailView):
 
     def post(self, request, election_id):
         election = self.get_object()
-        splitter = ElectionSOPNPageSplitter(
-            election.electionsopn,
-            clean_matcher_data(json.loads(request.POST.get("matched_pages"))),
+        election.electionsopn.split(
+            ballot_to_pages=clean_matcher_data(
+                json.loads(request.POST.get("matched_pages"))
+            ),
+            method=PageMatchingMethods.MANUAL_MATCHED,
         )
-        splitter.split(method=PageMatchingMethods.MANUAL_MATCHED)
         LoggedAction.objects.create(
             user=request.user,
             election=election,
@@ -2,6 +2,7 @@ from io import StringIO
 
 from django.core.management.base import BaseCommand
 from parties.importer import ECPartyImporter
+from parties.managers import invalidate_party_choices
 from parties.models import PartyEmblem
 from utils.slack import SlackHelper
 
@@ -53,6 +54,10 @@ class Command(BaseCommand):
         if not options["skip_create_joint"]:
             importer.create_joint_parties(raise_on_error=False)
 
+        # Saving parties invalidates the cached choices as we go, but make
+        # sure nothing is missed by changes that didn't call save()
+        invalidate_party_choices()
+
         if importer.collector:
             self.stdout.write(
                 self.style.SUCCESS(
@@ -1,15 +1,39 @@
+import hashlib
 import re
+import uuid
 
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
 from django.db import models
 from django.utils import timezone
 
 from .constants import JOINT_DESCRIPTION_REGEX
 
+PARTY_CHOICES_VERSION_CACHE_KEY = "party_choices_version"
+
+
+def invalidate_party_choices():
+    """
+    Make every cached `party_choices` result stale, by changing the version
+    that's part of their cache keys.
+    """
+    cache.set(PARTY_CHOICES_VERSION_CACHE_KEY, uuid.uuid4().hex)
+
+
+def party_choices_version():
+    version = cache.get(PARTY_CHOICES_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(PARTY_CHOICES_VERSION_CACHE_KEY, uuid.uuid4().hex)
+        version = cache.get(PARTY_CHOICES_VERSION_CACHE_KEY)
+    # The cache might not keep the version, e.g. if it's a DummyCache or
+    # it's unavailable. Then it won't keep the choices either.
+    return version or "0"
+
 
 class PartyQuerySet(models.QuerySet):
     def active_for_date(self, date=None):
         if not date:
-            date = timezone.now()
+            date = timezone.localdate()
         qs = self.filter(date_registered__lte=date)
         return qs.filter(
             models.Q(date_deregistered__gte=date)
@@ -53,7 +77,48 @@ class PartyQuerySet(models.QuerySet):
 
         return qs
 
-    def party_choices(
+    def _party_choices_cache_key(self, **kwargs):
+        """
+        Make a cache key from the SQL of this queryset (so each register
+        and any other filtering gets its own entry) and the options passed
+        to `party_choices`.
+
+        Today's date is included because whether a party is deregistered
+        depends on it.
+        """
+        try:
+            sql = str(self.query)
+        except EmptyResultSet:
+            return None
+        key_parts = [
+            party_choices_version(),
+            timezone.now().date().isoformat(),
+            sql,
+            repr(sorted(kwargs.items())),
+        ]
+        digest = hashlib.md5("|".join(key_parts).encode("utf8")).hexdigest()
+        return f"party_choices:{digest}"
+
+    def party_choices(self, **kwargs):
+        """
+        The choices for a party select field, cached until a `Party` or
+        `PartyDescription` changes or `invalidate_party_choices` is called.
+
+        See `_party_choices` for the options.
+        """
+        if isinstance(kwargs.get("extra_party_ids"), (list, tuple)):
+            kwargs["extra_party_ids"] = list(kwargs["extra_party_ids"])
+        cache_key = self._party_choices_cache_key(**kwargs)
+        if cache_key:
+            result = cache.get(cache_key)
+            if result is not None:
+                return result
+        result = self._party_choices(**kwargs)
+        if cache_key:
+            cache.set(cache_key, result)
+        return result
+
+    def _party_choices(
         self,
         include_descriptions=True,
         exclude_deregistered=False,
@@ -104,7 +169,9 @@ class PartyQuerySet(models.QuerySet):
                 and exclude_deregistered
             ):
                 continue
-            if include_descriptions and party.descriptions.exists():
+            # Use the prefetched descriptions rather than `exists()`,
+            # which would make a query per party
+            if include_descriptions and party.descriptions.all():
                 names = [
                     (
                         party.ec_id,
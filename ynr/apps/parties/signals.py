@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from parties.managers import invalidate_party_choices
+from parties.models import Party, PartyDescription
+
+
+@receiver(post_save, sender=Party)
+@receiver(post_delete, sender=Party)
+@receiver(post_save, sender=PartyDescription)
+@receiver(post_delete, sender=PartyDescription)
+def party_choices_changed(sender, **kwargs):
+    """
+    Party choices are cached, so invalidate them when a party or any of its
+    descriptions change
+    """
+    invalidate_party_choices()
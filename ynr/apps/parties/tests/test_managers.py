@@ -4,12 +4,13 @@ Test some of the basic model use cases
 """
 from collections import namedtuple
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.utils import timezone
 from parties.models import Party
 from parties.tests.fixtures import DefaultPartyFixtures
 
-from .factories import PartyFactory
+from .factories import PartyDescriptionFactory, PartyFactory
 
 PartyDate = namedtuple(
     "PartyDate", ["ec_id", "name", "date_registered", "date_deregistered"]
@@ -62,3 +63,83 @@ class TestPartyManager(DefaultPartyFixtures, TestCase):
         self.assertEqual(qs.count(), 3)
         self.assertFalse(qs.filter(ec_id="PP03").exists())
         self.assertFalse(qs.filter(ec_id="PP02").exists())
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "party-choices-tests",
+        }
+    }
+)
+class TestPartyChoicesCache(DefaultPartyFixtures, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.party = PartyFactory(ec_id="PP01", name="Cached Party")
+        PartyDescriptionFactory(party=self.party, description="Cached Desc")
+        PartyDescriptionFactory(party=self.party, description="Other Desc")
+        PartyDescriptionFactory(
+            party=PartyFactory(ec_id="PP02"), description="Second Desc"
+        )
+
+    def test_descriptions_are_prefetched(self):
+        # One query for the parties and one for all of their descriptions
+        with self.assertNumQueries(2):
+            Party.objects.register("GB").party_choices()
+
+    def test_choices_are_cached(self):
+        choices = Party.objects.register("GB").default_party_choices()
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                Party.objects.register("GB").default_party_choices(), choices
+            )
+
+    def test_options_and_registers_cached_separately(self):
+        gb = Party.objects.register("GB").party_choices()
+        ni = Party.objects.register("NI").party_choices()
+        no_descriptions = Party.objects.register("GB").party_choices(
+            include_descriptions=False
+        )
+        self.assertNotEqual(gb, ni)
+        self.assertNotEqual(gb, no_descriptions)
+
+    def test_saving_party_invalidates_choices(self):
+        Party.objects.register("GB").party_choices()
+        self.party.name = "Renamed Party"
+        self.party.save()
+        labels = [
+            choice[0] for choice in Party.objects.register("GB").party_choices()
+        ]
+        self.assertIn("Renamed Party", labels)
+
+    def test_saving_description_invalidates_choices(self):
+        Party.objects.register("GB").party_choices()
+        PartyDescriptionFactory(party=self.party, description="New Desc")
+        choices = dict(Party.objects.register("GB").party_choices())
+        labels = [
+            description[1]["label"] for description in choices["Cached Party"]
+        ]
+        self.assertIn("New Desc", labels)
+
+    def test_extra_party_ids_not_modified(self):
+        extra_party_ids = ["PP02"]
+        Party.objects.party_choices(extra_party_ids=extra_party_ids)
+        self.assertEqual(extra_party_ids, ["PP02"])
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+        }
+    }
+)
+class TestPartyChoicesWithoutCache(DefaultPartyFixtures, TestCase):
+    def test_party_choices_without_cache(self):
+        PartyFactory(ec_id="PP01", name="Uncached Party")
+        labels = [
+            choice[0] for choice in Party.objects.register("GB").party_choices()
+        ]
+        self.assertIn("Uncached Party", labels)
+        self.assertTrue(Party.objects.register("GB").default_party_choices())
@@ -1,5 +1,5 @@
 import people.api.next.serializers
-from api.next.views import ResultsSetPagination
+from api.next.views import CursorPaginationMixin, ResultsSetPagination
 from candidates import models as extra_models
 from candidates.api.next.serializers import LoggedActionSerializer
 from django.db.models import Prefetch
@@ -13,7 +13,7 @@ from rest_framework.response import Response
 from rest_framework.reverse import reverse
 
 
-class PersonViewSet(viewsets.ReadOnlyModelViewSet):
+class PersonViewSet(CursorPaginationMixin, viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         return (
             Person.objects.prefetch_related(
@@ -29,23 +29,39 @@ class PersonViewSet(viewsets.ReadOnlyModelViewSet):
                 "memberships__previous_party_affiliations",
             )
             .select_related("image", "image__uploading_user")
+            .defer("name_search_vector")
             .order_by("id")
         )
 
+    def get_cursor_ordering(self):
+        if self.request.query_params.get("last_updated", None):
+            return ("modified", "id")
+        return ("id",)
+
     def filter_queryset(self, queryset):
         """
         If this is a last_updated request we return a maximum of 1000 objects.
         This is to avoid lambda timeouts when imorting in WCIVF.
+
+        With cursor pagination there's no maximum, as each page is a cheap
+        query that can be resumed from the `next` link.
         """
         queryset = super().filter_queryset(queryset)
         if not self.request.query_params.get("last_updated", None):
             return queryset
-        return queryset.order_by("modified")[:1000]
+        queryset = queryset.order_by("modified")
+        if self.uses_cursor_pagination:
+            return queryset
+        return queryset[:1000]
 
     def list(self, request, *args, **kwargs):
         """
         If the last_updated param is used, a maximum of 1000 objects are
-        returned per request.
+        returned per request, ordered by when they were modified.
+
+        Add `pagination=cursor` to page through results with a cursor rather
+        than page numbers. This is much faster for deep pages, and removes the
+        1000 object limit on last_updated requests.
         """
         # this method is defined only to add the docstring above to the API
         # documentation generated by swagger
@@ -92,7 +108,10 @@ class PersonViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=True, methods=["get"], name="Versions")
     def versions(self, request, pk=None, **kwargs):
-        return Response(self.get_object().versions)
+        person = self.get_object()
+        return Response(
+            [version.as_version_dict() for version in person.version_set.all()]
+        )
 
     serializer_class = people.api.next.serializers.PersonSerializer
     pagination_class = ResultsSetPagination
@@ -133,8 +133,14 @@ class PersonSerializer(MinimalPersonSerializer):
         except PersonImage.DoesNotExist:
             return None
 
+        if image.thumbnail_url:
+            return image.thumbnail_url
+
         return SizeLimitedHyperlinkedSorlImageField(
-            "300x300", options={"crop": "center"}, read_only=True, use_url=True
+            PersonImage.API_THUMBNAIL_GEOMETRY,
+            options={"crop": "center"},
+            read_only=True,
+            use_url=True,
         ).to_representation(image.image)
 
     def get_email(self, obj):
@@ -108,6 +108,9 @@ class VersionHistoryCheck(BaseCheck):
         if do_remove:
             self.person.versions = versions
             self.person.save()
+            # The stored diffs include the removed values, so recalculate them
+            self.person.version_diff_set.all().delete()
+            self.person.store_version_diffs()
         return sorted(version_data_to_remove, key=lambda item: item["title"])
 
     def run_remove(self):
@@ -1,10 +1,37 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from people.models import Person
 
 
 class Command(BaseCommand):
     help = "Update the vector search field on the Person model"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help=(
+                "Update this many person IDs per transaction, rather than "
+                "the whole table in one UPDATE"
+            ),
+        )
+        parser.add_argument(
+            "--start-id",
+            type=int,
+            help=(
+                "Only update people with IDs after this one. Use the last ID "
+                "reported by an interrupted batched run to resume it"
+            ),
+        )
+
+    def report_progress(self, last_id):
+        self.stdout.write(f"Updated up to person {last_id}")
+
     def handle(self, *args, **options):
+        if options["start_id"] and not options["batch_size"]:
+            raise CommandError("--start-id needs --batch-size")
         Person.objects.update_name_search_trigger()
-        Person.objects.update_name_search()
+        Person.objects.update_name_search(
+            batch_size=options["batch_size"],
+            start_id=options["start_id"],
+            callback=self.report_progress if options["verbosity"] else None,
+        )
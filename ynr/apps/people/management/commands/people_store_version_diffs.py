@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from people.models import Person
+
+
+class Command(BaseCommand):
+    help = """
+    Calculate and store the diffs for each version in a person's version
+    history. By default only people with versions that don't have stored
+    diffs are updated.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recalculate the stored diffs for every person",
+        )
+        parser.add_argument(
+            "--person-id",
+            action="append",
+            type=int,
+            dest="person_ids",
+            help="Only store diffs for this person. Can be used more than once",
+        )
+
+    def handle(self, *args, **options):
+        qs = Person.objects.filter(version_set__isnull=False).distinct()
+        if options["person_ids"]:
+            qs = qs.filter(pk__in=options["person_ids"])
+
+        updated = 0
+        for person in qs.iterator(chunk_size=500):
+            versions = person.versions or []
+            if options["all"] or options["person_ids"]:
+                version_ids = None
+            else:
+                stored_ids = set(
+                    person.version_diff_set.values_list("version_id", flat=True)
+                )
+                version_ids = [
+                    v["version_id"]
+                    for v in versions
+                    if v["version_id"] not in stored_ids
+                ]
+                if not version_ids:
+                    continue
+            try:
+                with transaction.atomic():
+                    person.store_version_diffs(version_ids=version_ids)
+            except Exception as e:
+                self.stderr.write(
+                    f"Couldn't store diffs for person {person.pk}: {e}"
+                )
+                continue
+            updated += 1
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Stored diffs for person {person.pk}")
+        self.stdout.write(f"Stored version diffs for {updated} people")
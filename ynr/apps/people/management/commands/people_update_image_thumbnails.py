@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from people.models import PersonImage
+
+
+class Command(BaseCommand):
+    help = """
+    Make the API thumbnail for each person image and store its URL. By
+    default only images without a stored thumbnail URL are updated.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Remake the thumbnail for every image",
+        )
+
+    def handle(self, *args, **options):
+        qs = PersonImage.objects.all()
+        if not options["all"]:
+            qs = qs.filter(thumbnail_url="")
+
+        updated = 0
+        for person_image in qs.iterator(chunk_size=500):
+            try:
+                person_image.update_thumbnail_url()
+            except OSError as e:
+                self.stderr.write(
+                    f"Couldn't make thumbnail for image {person_image.pk}: {e}"
+                )
+                continue
+            updated += 1
+        self.stdout.write(f"Updated thumbnails for {updated} images")
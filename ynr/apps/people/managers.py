@@ -3,7 +3,7 @@ import uuid
 from candidates.management.images import get_file_md5sum
 from candidates.models import PersonRedirect
 from django.core.files import File
-from django.db import connection, models
+from django.db import connection, models, transaction
 from ynr_refactoring.settings import PersonIdentifierFields
 
 
@@ -37,36 +37,8 @@ class PersonIdentifierQuerySet(models.query.QuerySet):
         )
 
 
-POPULATE_NAME_SEARCH_COLUMN_SQL = """
-    UPDATE people_person
-    SET name_search_vector = sq.terms
-    FROM (
-        SELECT pp.id as id,
-            ---- First and last names are weight A
-            --- First Name
-            setweight(to_tsvector('simple', split_part(pp.name, ' ', 1)), 'B')
-            ||
-            --- Last Name
-            setweight(to_tsvector('simple', regexp_replace(pp.name, '^.* ', '')), 'A')
-            ||
-            --- Full name is weight B, further boosting first and last names, adding middle names
-            setweight(to_tsvector('simple', coalesce(pp.name, '')), 'C')
-            ||
-            --- Other names are weight C
-            setweight(to_tsvector('simple', coalesce(string_agg(ppon.name, ' '), '')), 'D') as terms
-        FROM people_person pp
-        LEFT JOIN popolo_othername ppon
-        ON pp.id = ppon.object_id
-        WHERE ppon.content_type_id = (
-            select id
-            from django_content_type
-            where app_label='people'
-              and model='person')
-        GROUP BY pp.id, pp.name
-    ) as sq
-    where sq.id = people_person.id
-"""
-
+# The original trigger, kept as migration 0025 uses it. The current triggers
+# are in NAME_SEARCH_TRIGGERS_SQL
 NAME_SEARCH_TRIGGER_SQL = """
     DROP FUNCTION IF EXISTS people_person_search_trigger() CASCADE;
     CREATE FUNCTION people_person_search_trigger() RETURNS trigger AS $$
@@ -108,6 +80,129 @@ NAME_SEARCH_TRIGGER_SQL = """
 """
 
 
+NAME_SEARCH_VECTOR_FUNCTION_SQL = """
+    CREATE OR REPLACE FUNCTION people_person_name_search_vector(
+        person_id integer, person_name text
+    ) RETURNS tsvector AS $$
+        SELECT
+        --- First Name
+        setweight(to_tsvector('simple', split_part(person_name, ' ', 1)), 'B')
+        ||
+        --- Last Name
+        setweight(to_tsvector('simple', regexp_replace(person_name, '^.* ', '')), 'A')
+        ||
+        --- Full name is weight B, further boosting first and last names, adding middle names
+        setweight(to_tsvector('simple', coalesce(person_name, '')), 'C')
+        ||
+        --- Other names are weight C
+        setweight(to_tsvector('simple', coalesce((
+            SELECT string_agg(po.name, ' ')
+            FROM popolo_othername po
+            WHERE po.object_id = person_id
+            AND po.content_type_id = (
+                select id
+                from django_content_type
+                where app_label='people'
+                  and model='person')
+        ), '')), 'D')
+    $$ LANGUAGE sql STABLE;
+"""
+
+PERSON_NAME_SEARCH_TRIGGER_SQL = """
+    CREATE OR REPLACE FUNCTION people_person_search_trigger() RETURNS trigger AS $$
+    begin
+        new.name_search_vector := people_person_name_search_vector(new.id, new.name);
+        return new;
+    end
+    $$ LANGUAGE plpgsql;
+    DROP TRIGGER IF EXISTS tsvectorupdate ON people_person CASCADE;
+    CREATE TRIGGER tsvectorupdate BEFORE INSERT OR UPDATE OF name
+        ON people_person FOR EACH ROW EXECUTE PROCEDURE people_person_search_trigger();
+"""
+
+# Other names are part of the search vector, so when they change we need to
+# recalculate the vector for the person they belong to (and only that person)
+OTHER_NAME_SEARCH_TRIGGER_SQL = """
+    CREATE OR REPLACE FUNCTION popolo_othername_search_trigger() RETURNS trigger AS $$
+    declare
+        person_content_type_id integer := (
+            select id
+            from django_content_type
+            where app_label='people'
+              and model='person');
+    begin
+        if TG_OP in ('UPDATE', 'DELETE')
+            and old.content_type_id = person_content_type_id then
+            UPDATE people_person
+            SET name_search_vector = people_person_name_search_vector(id, name)
+            WHERE id = old.object_id;
+        end if;
+        if TG_OP in ('INSERT', 'UPDATE')
+            and new.content_type_id = person_content_type_id
+            and (TG_OP = 'INSERT' or new.object_id IS DISTINCT FROM old.object_id) then
+            UPDATE people_person
+            SET name_search_vector = people_person_name_search_vector(id, name)
+            WHERE id = new.object_id;
+        end if;
+        return null;
+    end
+    $$ LANGUAGE plpgsql;
+    DROP TRIGGER IF EXISTS othername_tsvectorupdate ON popolo_othername CASCADE;
+    CREATE TRIGGER othername_tsvectorupdate AFTER INSERT OR UPDATE OR DELETE
+        ON popolo_othername FOR EACH ROW EXECUTE PROCEDURE popolo_othername_search_trigger();
+"""
+
+NAME_SEARCH_TRIGGERS_SQL = (
+    NAME_SEARCH_VECTOR_FUNCTION_SQL
+    + PERSON_NAME_SEARCH_TRIGGER_SQL
+    + OTHER_NAME_SEARCH_TRIGGER_SQL
+)
+
+# Only rows where the vector has changed are written, so a rebuild doesn't
+# rewrite (and bloat) the whole table
+UPDATE_NAME_SEARCH_BATCH_SQL = """
+    UPDATE people_person
+    SET name_search_vector = people_person_name_search_vector(id, name)
+    WHERE id >= %s AND id < %s
+    AND name_search_vector IS DISTINCT FROM people_person_name_search_vector(id, name)
+"""
+
+POPULATE_NAME_SEARCH_COLUMN_SQL = """
+    UPDATE people_person
+    SET name_search_vector = people_person_name_search_vector(id, name)
+    WHERE name_search_vector IS DISTINCT FROM people_person_name_search_vector(id, name)
+"""
+
+
+def update_name_search_in_batches(batch_size, start_id=None, callback=None):
+    """
+    Recalculate `name_search_vector` for people in batches of IDs, each in
+    its own transaction, so locks are only held briefly.
+
+    `callback` is called with the last ID in each batch once it's committed.
+    Passing that as `start_id` resumes an interrupted rebuild.
+
+    This uses raw SQL so it can be used in migrations.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT min(id), max(id) FROM people_person WHERE id > %s",
+            [start_id or 0],
+        )
+        first_id, last_id = cursor.fetchone()
+    if first_id is None:
+        return
+
+    for batch_start in range(first_id, last_id + 1, batch_size):
+        batch_end = batch_start + batch_size
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                UPDATE_NAME_SEARCH_BATCH_SQL, [batch_start, batch_end]
+            )
+        if callback:
+            callback(min(batch_end, last_id + 1) - 1)
+
+
 class PersonQuerySet(models.query.QuerySet):
     def alive_now(self):
         return self.filter(death_date="")
@@ -129,8 +224,20 @@ class PersonQuerySet(models.query.QuerySet):
         with connection.cursor() as cursor:
             cursor.execute(SQL)
 
-    def update_name_search(self):
-        self._run_sql(POPULATE_NAME_SEARCH_COLUMN_SQL)
+    def update_name_search(self, batch_size=None, start_id=None, callback=None):
+        """
+        Recalculate `name_search_vector` for every person whose vector is out
+        of date.
+
+        With no `batch_size` this is a single UPDATE of the whole table,
+        otherwise see `update_name_search_in_batches`.
+        """
+        if not batch_size:
+            self._run_sql(POPULATE_NAME_SEARCH_COLUMN_SQL)
+            return
+        update_name_search_in_batches(
+            batch_size, start_id=start_id, callback=callback
+        )
 
     def update_name_search_trigger(self):
-        self._run_sql(NAME_SEARCH_TRIGGER_SQL)
+        self._run_sql(NAME_SEARCH_TRIGGERS_SQL)
@@ -85,7 +85,8 @@ class PersonMerger:
             ("delisted", "merge_person_attrs"),
             ("name_search_vector", "discard_data"),
             # Relations
-            ("versions", "merge_versions_json"),
+            ("version_set", "merge_versions_json"),
+            ("version_diff_set", "merge_versions_json"),
             ("tmp_person_identifiers", "merge_person_identifiers"),
             ("image", "merge_images"),
             ("loggedaction", "merge_logged_actions"),
@@ -166,11 +167,22 @@ class PersonMerger:
         )
 
         # Make sure the secondary person's version history is appended, so it
-        # isn't lost.
+        # isn't lost. Versions are unique per person, so where both people
+        # have a version with the same ID, the dest person's version is kept
+        # when the dest person is saved.
         dest_person_versions = self.dest_person.versions
         dest_person_versions += self.source_person.versions
         self.dest_person.versions = dest_person_versions
 
+        # The diffs of the source person's versions don't change when
+        # they're added to the dest person's history, so keep them too
+        self.source_person.version_diff_set.filter(
+            version_id__in=self.dest_person.version_diff_set.values(
+                "version_id"
+            )
+        ).delete()
+        self.source_person.version_diff_set.update(person=self.dest_person)
+
     @property
     def person_attrs_to_merge(self):
         """
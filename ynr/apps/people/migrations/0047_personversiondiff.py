@@ -0,0 +1,40 @@
+# Generated by Django 4.2.11 on 2026-10-16 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("people", "0046_alter_personidentifier_unique_together"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PersonVersionDiff",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version_id", models.CharField(max_length=32)),
+                ("diffs", models.JSONField(default=list)),
+                (
+                    "person",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="version_diff_set",
+                        to="people.person",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("person", "version_id")},
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.11 on 2026-10-16 10:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("people", "0047_personversiondiff"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PersonVersion",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version_id", models.CharField(max_length=32)),
+                ("timestamp", models.DateTimeField(null=True)),
+                ("information_source", models.TextField(blank=True)),
+                (
+                    "username",
+                    models.CharField(blank=True, max_length=150, null=True),
+                ),
+                ("data", models.JSONField(default=dict)),
+                (
+                    "extra_metadata",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="Any other keys in the version, e.g. from versions imported from PopIt",
+                    ),
+                ),
+                (
+                    "person",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="version_set",
+                        to="people.person",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": (
+                    models.OrderBy(
+                        models.F("timestamp"), descending=True, nulls_last=True
+                    ),
+                    "-id",
+                ),
+                "indexes": [
+                    models.Index(
+                        models.F("person"),
+                        models.OrderBy(
+                            models.F("timestamp"),
+                            descending=True,
+                            nulls_last=True,
+                        ),
+                        name="person_version_timestamp_idx",
+                    )
+                ],
+                "unique_together": {("person", "version_id")},
+            },
+        ),
+    ]
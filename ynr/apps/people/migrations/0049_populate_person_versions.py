@@ -0,0 +1,120 @@
+from datetime import datetime, timezone
+
+from django.db import migrations
+
+BATCH_SIZE = 5000
+
+
+def parse_timestamp(timestamp):
+    if not timestamp:
+        return None
+    return datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc)
+
+
+def dedupe_version_ids(person_id, versions):
+    """
+    Versions are unique on (person, version_id), but the JSON lists can have
+    the same version ID more than once, e.g. after merging people with a
+    shared version. Exact copies are dropped, and other versions that reuse
+    an ID are given a suffixed ID so their history is kept.
+
+    Returns the versions and a list of messages about what was changed.
+    """
+    seen = {}
+    deduped = []
+    messages = []
+    for version in versions:
+        version_id = version["version_id"]
+        if version_id not in seen:
+            seen[version_id] = version
+            deduped.append(version)
+            continue
+        if version == seen[version_id]:
+            messages.append(
+                f"Person {person_id}: dropped a copy of version {version_id}"
+            )
+            continue
+        suffix = 2
+        while f"{version_id}-{suffix}" in seen:
+            suffix += 1
+        new_version_id = f"{version_id}-{suffix}"
+        version = dict(version, version_id=new_version_id)
+        seen[new_version_id] = version
+        deduped.append(version)
+        messages.append(
+            f"Person {person_id}: version {version_id} is used more than "
+            f"once, stored the later one as {new_version_id}"
+        )
+    return deduped, messages
+
+
+def split_versions_json(apps, schema_editor):
+    Person = apps.get_model("people", "Person")
+    PersonVersion = apps.get_model("people", "PersonVersion")
+    to_create = []
+    messages = []
+    for person_id, versions in (
+        Person.objects.exclude(versions=[])
+        .values_list("pk", "versions")
+        .iterator(chunk_size=1000)
+    ):
+        versions, person_messages = dedupe_version_ids(
+            person_id, versions or []
+        )
+        messages += person_messages
+        # The JSON lists are most recent first, and versions are ordered by
+        # ID, so create the oldest first
+        for version in reversed(versions):
+            version = version.copy()
+            to_create.append(
+                PersonVersion(
+                    person_id=person_id,
+                    version_id=version.pop("version_id"),
+                    timestamp=parse_timestamp(version.pop("timestamp", None)),
+                    information_source=version.pop("information_source", ""),
+                    username=version.pop("username", None),
+                    data=version.pop("data", {}),
+                    extra_metadata=version,
+                )
+            )
+        if len(to_create) >= BATCH_SIZE:
+            PersonVersion.objects.bulk_create(to_create)
+            to_create = []
+    PersonVersion.objects.bulk_create(to_create)
+
+    if messages:
+        print(f"\nFound {len(messages)} duplicate version IDs:")
+        for message in messages:
+            print(f"  {message}")
+
+
+def join_versions_json(apps, schema_editor):
+    Person = apps.get_model("people", "Person")
+    PersonVersion = apps.get_model("people", "PersonVersion")
+    for person in Person.objects.filter(version_set__isnull=False).distinct():
+        versions = []
+        for person_version in PersonVersion.objects.filter(
+            person=person
+        ).order_by("-id"):
+            version = dict(person_version.extra_metadata)
+            version["version_id"] = person_version.version_id
+            version["timestamp"] = None
+            if person_version.timestamp:
+                version["timestamp"] = (
+                    person_version.timestamp.astimezone(timezone.utc)
+                    .replace(tzinfo=None)
+                    .strftime("%Y-%m-%dT%H:%M:%S.%f")
+                )
+            version["information_source"] = person_version.information_source
+            if person_version.username is not None:
+                version["username"] = person_version.username
+            version["data"] = person_version.data
+            versions.append(version)
+        person.versions = versions
+        person.save(update_fields=["versions"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [("people", "0048_personversion")]
+
+    operations = [migrations.RunPython(split_versions_json, join_versions_json)]
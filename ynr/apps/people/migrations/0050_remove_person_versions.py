@@ -0,0 +1,16 @@
+# Generated by Django 4.2.11 on 2026-10-16 10:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("people", "0049_populate_person_versions"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="person",
+            name="versions",
+        ),
+    ]
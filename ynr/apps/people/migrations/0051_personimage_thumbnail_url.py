@@ -0,0 +1,21 @@
+# Generated by Django 4.2.11 on 2026-10-16 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("people", "0050_remove_person_versions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="personimage",
+            name="thumbnail_url",
+            field=models.CharField(
+                blank=True,
+                help_text="The URL of the thumbnail used in the API",
+                max_length=800,
+            ),
+        ),
+    ]
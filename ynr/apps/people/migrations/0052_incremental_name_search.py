@@ -0,0 +1,45 @@
+"""
+Keep `name_search_vector` up to date when other names change, by adding a
+trigger on popolo_othername that recalculates the vector for the affected
+person only.
+
+The vector is then recalculated in batches, so only people whose vector has
+changed are written, and locks are only held for one batch at a time.
+
+"""
+
+from django.db import migrations
+from people.managers import (
+    NAME_SEARCH_TRIGGER_SQL,
+    NAME_SEARCH_TRIGGERS_SQL,
+    update_name_search_in_batches,
+)
+
+REVERSE_SQL = (
+    """
+    DROP TRIGGER IF EXISTS othername_tsvectorupdate ON popolo_othername CASCADE;
+    DROP FUNCTION IF EXISTS popolo_othername_search_trigger() CASCADE;
+    """
+    + NAME_SEARCH_TRIGGER_SQL
+    + """
+    DROP FUNCTION IF EXISTS people_person_name_search_vector(integer, text);
+    """
+)
+
+
+def update_name_search(apps, schema_editor):
+    update_name_search_in_batches(batch_size=5000)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("people", "0051_personimage_thumbnail_url"),
+        ("popolo", "0051_alter_membership_deselected_and_more"),
+    ]
+
+    operations = [
+        migrations.RunSQL(NAME_SEARCH_TRIGGERS_SQL, REVERSE_SQL),
+        migrations.RunPython(update_name_search, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.11 on 2026-10-16 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [("people", "0052_incremental_name_search")]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="personversion", options={"ordering": ("-id",)}
+        ),
+        migrations.RemoveIndex(
+            model_name="personversion", name="person_version_timestamp_idx"
+        ),
+        migrations.AddIndex(
+            model_name="personversion",
+            index=models.Index(
+                fields=["person", "-id"], name="person_version_idx"
+            ),
+        ),
+    ]
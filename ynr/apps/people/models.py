@@ -1,12 +1,14 @@
 import contextlib
-from datetime import date
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
 from enum import Enum, unique
 from urllib.parse import quote_plus, urljoin
 
 from auth_helpers.views import user_in_group
-from candidates.diffs import get_version_diffs
+from candidates.diffs import get_diffs_for_versions, get_version_diffs
 from candidates.models.db import ActionType, LoggedAction
 from candidates.models.popolo_extra import Ballot
+from candidates.models.versions import get_versions_parent_map
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.postgres.indexes import GinIndex
@@ -18,6 +20,7 @@ from django.contrib.postgres.search import (
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models, transaction
 from django.db.models import JSONField, Lookup
+from django.db.models.fields.json import KeyTextTransform
 from django.template import loader
 from django.templatetags.static import static
 from django.urls import reverse
@@ -73,9 +76,33 @@ class PersonImage(models.Model):
     md5sum = models.CharField(max_length=32, blank=True)
     user_copyright = models.CharField(max_length=128, blank=True)
     notes = models.TextField(blank=True)
+    thumbnail_url = models.CharField(
+        max_length=800,
+        blank=True,
+        help_text="The URL of the thumbnail used in the API",
+    )
 
     objects = PersonImageManager()
 
+    API_THUMBNAIL_GEOMETRY = "300x300"
+
+    def update_thumbnail_url(self, save=True):
+        """
+        Make the thumbnail used in the API and store its URL, so that
+        serialising a person doesn't need to touch the thumbnail cache or
+        storage.
+        """
+        try:
+            thumbnail = get_thumbnail(
+                self.image, self.API_THUMBNAIL_GEOMETRY, crop="center"
+            )
+            self.thumbnail_url = thumbnail.url
+        except ValueError:
+            # Chances are the image is too large
+            self.thumbnail_url = ""
+        if save:
+            self.save(update_fields=["thumbnail_url"])
+
 
 class PersonIdentifier(TimeStampedModel):
     """
@@ -288,10 +315,6 @@ class Person(TimeStampedModel, models.Model):
         "popolo.Source", help_text="URLs to source documents about the person"
     )
 
-    # Former 'extra' fields
-    # This field stores JSON data with previous version information
-    # (as it did in PopIt).
-    versions = JSONField(default=list)
     not_standing = models.ManyToManyField(
         "elections.Election", related_name="persons_not_standing_tmp"
     )
@@ -326,6 +349,104 @@ class Person(TimeStampedModel, models.Model):
 
     objects = PersonQuerySet.as_manager()
 
+    # The version history is stored as `PersonVersion` objects. These
+    # attributes are used by the `versions` property to cache them and track
+    # changes that need saving.
+    _versions = None
+    _versions_replaced = False
+    _unsaved_versions = None
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        self.save_versions(adding=adding)
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None:
+            self.reset_versions_cache()
+
+    @property
+    def versions(self):
+        """
+        The version history of this person as a list of dicts, most recent
+        first.
+
+        This is kept for compatibility with code that expects the versions
+        as a list. Assigning a new list replaces all the person's versions
+        when the person is next saved. `record_version` only adds the new
+        version, so should be used for recording edits.
+        """
+        if self._versions is None:
+            versions = list(reversed(self._unsaved_versions or []))
+            if self.pk:
+                versions += [
+                    version.as_version_dict()
+                    for version in self.version_set.all()
+                ]
+            self._versions = versions
+        return self._versions
+
+    @versions.setter
+    def versions(self, value):
+        self._versions = list(value or [])
+        self._versions_replaced = True
+
+    def reset_versions_cache(self):
+        self._versions = None
+        self._versions_replaced = False
+        self._unsaved_versions = None
+        with contextlib.suppress(AttributeError, KeyError):
+            del self._prefetched_objects_cache["version_set"]
+
+    def save_versions(self, adding=False):
+        """
+        Write any new versions to the database. If `versions` has been
+        assigned to, the stored versions are replaced.
+
+        Versions are ordered by ID, so they're created oldest first.
+        """
+        if self._versions_replaced:
+            new_versions = {}
+            for version in self._versions:
+                new_versions.setdefault(version["version_id"], version)
+            with transaction.atomic():
+                # Recreate all the versions, so they're in the order of the
+                # list that replaced them
+                if not adding:
+                    self.version_set.all().delete()
+                PersonVersion.objects.bulk_create(
+                    [
+                        PersonVersion.from_version_dict(self, version)
+                        for version in reversed(new_versions.values())
+                    ]
+                )
+        elif self._unsaved_versions:
+            PersonVersion.objects.bulk_create(
+                [
+                    PersonVersion.from_version_dict(self, version)
+                    for version in self._unsaved_versions
+                ]
+            )
+        self._versions_replaced = False
+        self._unsaved_versions = None
+
+    def get_latest_version(self):
+        """
+        Return the most recent version as a dict, without loading the whole
+        version history.
+        """
+        if self._versions is not None:
+            return self._versions[0] if self._versions else None
+        if self._unsaved_versions:
+            return self._unsaved_versions[-1]
+        if not self.pk:
+            return None
+        latest = self.version_set.first()
+        if not latest:
+            return None
+        return latest.as_version_dict()
+
     @property
     def has_locked_and_current_ballots(self):
         return bool(
@@ -392,16 +513,14 @@ class Person(TimeStampedModel, models.Model):
         # Needed because of a circular import
         from candidates.models.versions import get_person_as_version_data
 
-        versions = []
-        if self.versions:
-            versions = self.versions
+        latest_version = self.get_latest_version()
         new_version = change_metadata.copy()
         new_version["data"] = get_person_as_version_data(
             self, new_person=new_person
         )
         should_insert = True
 
-        if versions and new_version["data"] == versions[0]["data"]:
+        if latest_version and new_version["data"] == latest_version["data"]:
             # Don't create empty versions
             should_insert = False
 
@@ -409,19 +528,119 @@ class Person(TimeStampedModel, models.Model):
             # Always create a version if this is a merge
             should_insert = True
 
-        if should_insert:
-            versions.insert(0, new_version)
+        if not should_insert:
+            return
 
-        self.versions = versions
+        if self._unsaved_versions is None:
+            self._unsaved_versions = []
+        self._unsaved_versions.append(new_version)
+        if self._versions is not None:
+            self._versions.insert(0, new_version)
 
-    def version_fields(self, version_id):
-        if not self.versions:
-            return []
-        version_diffs = {
-            version["version_id"]: version["diffs"][0]["parent_diff"]
-            for version in get_version_diffs(self.versions)
+        self.store_version_diffs(version_ids=[new_version["version_id"]])
+
+    def get_versions_for_diffing(self, version_ids):
+        """
+        Return the version history with the full data for `version_ids` and
+        their parents. Only the fields needed to work out the parents of
+        each version are loaded for the other versions.
+        """
+        if self._versions is not None:
+            return self._versions
+
+        versions = list(reversed(self._unsaved_versions or []))
+        unsaved_ids = {version["version_id"] for version in versions}
+        for (
+            version_id,
+            timestamp,
+            information_source,
+            data_id,
+        ) in self.version_set.values_list(
+            "version_id",
+            "timestamp",
+            "information_source",
+            KeyTextTransform("id", "data"),
+        ):
+            versions.append(
+                {
+                    "version_id": version_id,
+                    "timestamp": PersonVersion.format_timestamp(timestamp),
+                    "information_source": information_source,
+                    "data": {"id": data_id},
+                }
+            )
+
+        if not versions:
+            return versions
+
+        parent_map = get_versions_parent_map(versions)
+        needed_ids = set(version_ids)
+        for version_id in version_ids:
+            needed_ids.update(parent_map.get(version_id, []))
+        full_versions = {
+            version.version_id: version.as_version_dict()
+            for version in self.version_set.filter(
+                version_id__in=needed_ids - unsaved_ids
+            )
         }
-        diff = version_diffs.get(version_id)
+        return [
+            full_versions.get(version["version_id"], version)
+            for version in versions
+        ]
+
+    def store_version_diffs(self, version_ids=None):
+        """
+        Calculate the diffs for versions in `self.versions` and store them as
+        `PersonVersionDiff` objects, replacing any existing diffs for those
+        versions.
+
+        If `version_ids` is None, the diffs for all versions are stored.
+        """
+        if version_ids is None:
+            versions = self.versions
+        else:
+            versions = self.get_versions_for_diffing(version_ids)
+        diffs_by_version_id = get_diffs_for_versions(
+            versions, version_ids=version_ids
+        )
+        PersonVersionDiff.objects.bulk_create(
+            [
+                PersonVersionDiff(
+                    person=self, version_id=version_id, diffs=diffs
+                )
+                for version_id, diffs in diffs_by_version_id.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["person", "version_id"],
+            update_fields=["diffs"],
+        )
+
+    def get_version_diffs_against_parents(self, version_id):
+        """
+        Return the list of diffs of a version against each of its parents,
+        or None if the version doesn't exist.
+
+        Stored diffs are used where they exist, falling back to calculating
+        the diffs for this version only.
+        """
+        with contextlib.suppress(PersonVersionDiff.DoesNotExist):
+            return self.version_diff_set.get(version_id=version_id).diffs
+        return get_diffs_for_versions(
+            self.get_versions_for_diffing([version_id]),
+            version_ids=[version_id],
+        ).get(version_id)
+
+    def get_version_parent_diff(self, version_id):
+        """
+        Return the diff of a version against its first parent
+        """
+        diffs = self.get_version_diffs_against_parents(version_id)
+        if not diffs:
+            return []
+        return diffs[0]["parent_diff"]
+
+    def version_fields(self, version_id):
+        diff = self.get_version_parent_diff(version_id)
         if not diff:
             return []
 
@@ -629,24 +848,21 @@ class Person(TimeStampedModel, models.Model):
     def version_diffs(self):
         versions = self.versions
         if not versions:
-            versions = []
-        return get_version_diffs(versions)
+            return []
+        stored_diffs = dict(
+            self.version_diff_set.values_list("version_id", "diffs")
+        )
+        return get_version_diffs(versions, stored_diffs=stored_diffs)
 
     def diff_for_version(self, version_id, inline_style=False):
-        versions = self.versions or []
-        all_version_diffs = get_version_diffs(versions)
-        right_version_diff = None
-        for version_diff in all_version_diffs:
-            if version_diff["version_id"] == version_id:
-                right_version_diff = version_diff
-                break
-        if not right_version_diff:
+        diffs = self.get_version_diffs_against_parents(version_id)
+        if diffs is None:
             msg = "Couldn't find version {0} for person with ID {1}"
             raise VersionNotFound(msg.format(version_id, self.id))
         template = loader.get_template("candidates/_diffs_against_parents.html")
         rendered = template.render(
             {
-                "diffs_against_all_parents": right_version_diff["diffs"],
+                "diffs_against_all_parents": diffs,
                 "inline_style": inline_style,
             }
         )
@@ -905,7 +1121,7 @@ class Person(TimeStampedModel, models.Model):
             self.image.delete()
 
         source = f"Uploaded by {queued_image.uploaded_by}: Approved from photo moderation queue"
-        PersonImage.objects.create_from_file(
+        person_image = PersonImage.objects.create_from_file(
             filename=cropped_image.name,
             defaults={
                 "person": self,
@@ -919,11 +1135,128 @@ class Person(TimeStampedModel, models.Model):
         )
 
         sorl_delete(self.person_image.file, delete_file=False)
+        person_image.update_thumbnail_url()
         # Update the last modified date, so this is picked up
         # as a recent edit by API consumers
         self.save()
 
 
+class PersonVersion(models.Model):
+    """
+    A single version of a person's data, recorded each time they're edited.
+
+    Versions are only ever added, so recording an edit doesn't rewrite the
+    person's whole history. `Person.versions` presents them as the list of
+    dicts that used to be stored on the person, in the order they were
+    added rather than by timestamp, as that's the order the list was in.
+    """
+
+    person = models.ForeignKey(
+        "people.Person",
+        related_name="version_set",
+        on_delete=models.CASCADE,
+    )
+    version_id = models.CharField(max_length=32)
+    timestamp = models.DateTimeField(null=True)
+    information_source = models.TextField(blank=True)
+    username = models.CharField(max_length=150, null=True, blank=True)
+    data = JSONField(default=dict)
+    extra_metadata = JSONField(
+        default=dict,
+        blank=True,
+        help_text="Any other keys in the version, e.g. from versions imported from PopIt",
+    )
+
+    VERSION_FIELDS = [
+        "timestamp",
+        "information_source",
+        "username",
+        "data",
+        "extra_metadata",
+    ]
+
+    class Meta:
+        ordering = ("-id",)
+        unique_together = ("person", "version_id")
+        indexes = [
+            models.Index(fields=["person", "-id"], name="person_version_idx")
+        ]
+
+    def __str__(self):
+        return f"{self.person_id}: {self.version_id}"
+
+    @staticmethod
+    def parse_timestamp(timestamp):
+        """
+        Version timestamps are naive UTC ISO 8601 strings
+        """
+        if not timestamp:
+            return None
+        return datetime.fromisoformat(timestamp).replace(tzinfo=dt_timezone.utc)
+
+    @staticmethod
+    def format_timestamp(timestamp):
+        if not timestamp:
+            return None
+        return (
+            timestamp.astimezone(dt_timezone.utc)
+            .replace(tzinfo=None)
+            .strftime("%Y-%m-%dT%H:%M:%S.%f")
+        )
+
+    @classmethod
+    def from_version_dict(cls, person, version):
+        version = version.copy()
+        return cls(
+            person=person,
+            version_id=version.pop("version_id"),
+            timestamp=cls.parse_timestamp(version.pop("timestamp", None)),
+            information_source=version.pop("information_source", ""),
+            username=version.pop("username", None),
+            data=version.pop("data", {}),
+            extra_metadata=version,
+        )
+
+    def as_version_dict(self):
+        version = dict(self.extra_metadata)
+        version.update(
+            {
+                "version_id": self.version_id,
+                "timestamp": self.format_timestamp(self.timestamp),
+                "information_source": self.information_source,
+                "data": self.data,
+            }
+        )
+        if self.username is not None:
+            version["username"] = self.username
+        return version
+
+
+class PersonVersionDiff(models.Model):
+    """
+    The diffs of one of the versions in `Person.versions` against its parent
+    versions.
+
+    These are calculated when a version is recorded, rather than every time
+    they're needed, as calculating the diffs for a whole version history is
+    slow for people with a lot of versions.
+    """
+
+    person = models.ForeignKey(
+        "people.Person",
+        related_name="version_diff_set",
+        on_delete=models.CASCADE,
+    )
+    version_id = models.CharField(max_length=32)
+    diffs = JSONField(default=list)
+
+    class Meta:
+        unique_together = ("person", "version_id")
+
+    def __str__(self):
+        return f"{self.person_id}: {self.version_id}"
+
+
 class PersonNameSynonym(models.Model):
     class Meta:
         ordering = ("-term",)
@@ -62,6 +62,54 @@ class TestPersonViewSet(UK2015ExamplesMixin, TestCase):
         # ordering by modified means the person we updated isnt included
         self.assertNotIn(person, result)
 
+    def test_cursor_pagination_crawls_all_objects(self):
+        """
+        Cursor pagination doesn't count or cap last_updated requests, and
+        following the `next` links returns every object once
+        """
+        client = APIClient()
+        for params in [{}, {"last_updated": self.timestamp.isoformat()}]:
+            with self.subTest(params=params):
+                url = "/api/next/people/?{}".format(
+                    urlencode(
+                        {"pagination": "cursor", "page_size": 100, **params}
+                    )
+                )
+                seen = []
+                while url:
+                    data = client.get(url, format="json").json()
+                    self.assertNotIn("count", data)
+                    seen += [person["id"] for person in data["results"]]
+                    url = data["next"]
+                self.assertEqual(len(seen), len(self.people))
+                self.assertEqual(len(set(seen)), len(self.people))
+
+    def test_cursor_pagination_last_updated_ordered_by_modified(self):
+        # Set `modified` directly so these are clearly after everyone else,
+        # and in the opposite order to their IDs
+        now = timezone.now()
+        first, second = self.people[1], self.people[0]
+        Person.objects.filter(pk=first.pk).update(
+            modified=now + timezone.timedelta(hours=1)
+        )
+        Person.objects.filter(pk=second.pk).update(
+            modified=now + timezone.timedelta(hours=2)
+        )
+        data = self.client.get(
+            "/api/next/people/",
+            data={
+                "pagination": "cursor",
+                "page_size": 100,
+                "last_updated": (
+                    now + timezone.timedelta(minutes=30)
+                ).isoformat(),
+            },
+        ).json()
+        self.assertEqual(
+            [person["id"] for person in data["results"]],
+            [first.pk, second.pk],
+        )
+
     def test_person_with_previous_party_affiliations(self):
         welsh_candidate = PersonFactory.create(id=3009, name="Foo bar")
         welsh_candidacy = MembershipFactory.create(
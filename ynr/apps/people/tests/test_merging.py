@@ -514,6 +514,24 @@ class TestMerging(TestUserMixin, UK2015ExamplesMixin, WebTest):
         # This would raise if the bug existed
         self.assertIsNotNone(person_1.version_diffs)
 
+    def test_merge_version_diffs_with_the_same_version_id(self):
+        self.dest_person.version_diff_set.create(
+            version_id="0036d8081d566648", diffs=["dest"]
+        )
+        self.source_person.version_diff_set.create(
+            version_id="0036d8081d566648", diffs=["source"]
+        )
+        self.source_person.version_diff_set.create(
+            version_id="1a2b3c4d5e6f7a8b", diffs=["source only"]
+        )
+        merger = PersonMerger(self.dest_person, self.source_person)
+        merger.merge()
+        diffs = dict(
+            self.dest_person.version_diff_set.values_list("version_id", "diffs")
+        )
+        self.assertEqual(diffs["0036d8081d566648"], ["dest"])
+        self.assertEqual(diffs["1a2b3c4d5e6f7a8b"], ["source only"])
+
     @skip("until we can mark as not standing")
     def test_conflicting_standing_in_values_regression(self):
         """
@@ -1,3 +1,4 @@
+from importlib import import_module
 from unittest.mock import patch
 
 from candidates.models import LoggedAction
@@ -6,7 +7,9 @@ from candidates.tests.auth import TestUserMixin
 from candidates.tests.factories import faker_factory
 from candidates.tests.helpers import TmpMediaRootMixin
 from candidates.tests.uk_examples import UK2015ExamplesMixin
+from candidates.views.version_data import get_change_metadata
 from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
 from django_webtest import WebTest
 from moderation_queue.models import QueuedImage
 from moderation_queue.tests.paths import EXAMPLE_IMAGE_FILENAME
@@ -172,3 +175,97 @@ class TestPersonModels(
             person.get_absolute_queued_image_url(),
             "/moderation/photo/review/{}".format(queued_image.id),
         )
+
+    def test_versions_stored_as_person_versions(self):
+        versions = [
+            {
+                "version_id": "2b6a3e2d8e9b0c8a",
+                "timestamp": "2019-03-28T14:37:30.958127",
+                "information_source": "Fixed a typo",
+                "username": "john",
+                "data": {"id": "123", "name": "Joe Bloggs"},
+            },
+            {
+                "version_id": "9c2f1b7d5e3a4f60",
+                "timestamp": "2015-03-07T05:35:15.297559",
+                "information_source": "Original imported data",
+                "user": "popit-import",
+                "data": {"id": "123", "name": "Joe Blogs"},
+            },
+        ]
+        person = PersonFactory(name="Joe Bloggs", versions=versions)
+        self.assertEqual(person.version_set.count(), 2)
+        self.assertEqual(
+            person.version_set.get(
+                version_id="9c2f1b7d5e3a4f60"
+            ).extra_metadata,
+            {"user": "popit-import"},
+        )
+
+        person = Person.objects.get(pk=person.pk)
+        self.assertEqual(person.versions, versions)
+        self.assertEqual(person.get_latest_version(), versions[0])
+
+    def test_versions_keep_their_order_not_timestamp_order(self):
+        versions = [
+            {
+                "version_id": "2b6a3e2d8e9b0c8a",
+                "timestamp": "2015-03-07T05:35:15.297559",
+                "information_source": "Reverted to an earlier version",
+                "data": {"id": "123", "name": "Joe Blogs"},
+            },
+            {
+                "version_id": "9c2f1b7d5e3a4f60",
+                "timestamp": "2019-03-28T14:37:30.958127",
+                "information_source": "Fixed a typo",
+                "data": {"id": "123", "name": "Joe Bloggs"},
+            },
+        ]
+        person = PersonFactory(name="Joe Blogs", versions=versions)
+        person = Person.objects.get(pk=person.pk)
+        self.assertEqual(person.versions, versions)
+        self.assertEqual(person.get_latest_version(), versions[0])
+
+    def test_record_version_only_inserts_new_version(self):
+        person = PersonFactory(name="Joe Bloggs")
+        person.record_version(get_change_metadata(None, "First version"))
+        person.save()
+
+        person = Person.objects.get(pk=person.pk)
+        first_version = person.version_set.get()
+        person.name = "Joe Foo Bloggs"
+        person.record_version(get_change_metadata(None, "Second version"))
+        person.save()
+
+        self.assertEqual(person.version_set.count(), 2)
+        self.assertEqual(
+            person.version_set.get(pk=first_version.pk).data,
+            first_version.data,
+        )
+        self.assertEqual(
+            [v["information_source"] for v in person.versions],
+            ["Second version", "First version"],
+        )
+
+
+class TestPopulatePersonVersionsMigration(SimpleTestCase):
+    def test_dedupe_version_ids(self):
+        migration = import_module(
+            "people.migrations.0049_populate_person_versions"
+        )
+        versions = [
+            {"version_id": "a", "data": {"name": "New"}},
+            {"version_id": "b", "data": {"name": "Old"}},
+            {"version_id": "a", "data": {"name": "New"}},
+            {"version_id": "b", "data": {"name": "Older"}},
+        ]
+        deduped, messages = migration.dedupe_version_ids(1, versions)
+        self.assertEqual(
+            deduped,
+            [
+                {"version_id": "a", "data": {"name": "New"}},
+                {"version_id": "b", "data": {"name": "Old"}},
+                {"version_id": "b-2", "data": {"name": "Older"}},
+            ],
+        )
+        self.assertEqual(len(messages), 2)
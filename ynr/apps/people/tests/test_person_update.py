@@ -1,6 +1,9 @@
+from io import StringIO
+
 from candidates.tests.factories import BallotPaperFactory, ElectionFactory
 from candidates.views.version_data import get_change_metadata
 from django.contrib.auth.models import User
+from django.core.management import call_command
 from django.urls import reverse
 from django.utils import timezone
 from freezegun import freeze_time
@@ -38,6 +41,34 @@ class TestPersonUpdate(PersonViewSharedTestsMixin):
         self.person.record_version(get_change_metadata(None, "Nothing changed"))
         self.assertEqual(len(self.person.versions), 2)
 
+    def test_record_version_stores_diffs(self):
+        self.person.record_version(get_change_metadata(None, "First update"))
+        self.person.name = "New Name"
+        self.person.record_version(get_change_metadata(None, "Name change"))
+        self.person.save()
+
+        self.assertEqual(self.person.version_diff_set.count(), 2)
+        latest_version_id = self.person.versions[0]["version_id"]
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.person.version_fields(latest_version_id), ["name"]
+            )
+
+    def test_version_fields_without_stored_diffs(self):
+        self.person.record_version(get_change_metadata(None, "First update"))
+        self.person.name = "New Name"
+        self.person.record_version(get_change_metadata(None, "Name change"))
+        self.person.save()
+        self.person.version_diff_set.all().delete()
+
+        latest_version_id = self.person.versions[0]["version_id"]
+        self.assertEqual(
+            self.person.version_fields(latest_version_id), ["name"]
+        )
+
+        call_command("people_store_version_diffs", stdout=StringIO())
+        self.assertEqual(self.person.version_diff_set.count(), 2)
+
     def test_set_birth_date_invalid_date(self):
         """
         Regression for
@@ -18,7 +18,9 @@ class Command(BaseCommand):
     @transaction.atomic
     def handle(self, *args, **options):
         for person in Person.objects.all():
-            version = person.versions[0]
+            version = person.get_latest_version()
+            if not version:
+                continue
             for ballot_paper_id, candidacy in (
                 version["data"].get("candidacies", {}).items()
             ):
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.11 on 2026-10-16 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("popolo", "0051_alter_membership_deselected_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="post",
+            name="identifier",
+            field=models.CharField(
+                db_index=True,
+                help_text="\n        The identifier used in EveryElection for this division. This might\n        change over time, as some divisions don't have official IDs at the\n        point we create them.\n        ",
+                max_length=100,
+                null=True,
+            ),
+        ),
+    ]
@@ -176,6 +176,7 @@ class Post(EEModifiedMixin, Dateframeable, models.Model):
     identifier = models.CharField(
         max_length=100,
         null=True,
+        db_index=True,
         help_text="""
         The identifier used in EveryElection for this division. This might
         change over time, as some divisions don't have official IDs at the
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from people.models import PersonNameSynonym
+from search.utils import invalidate_synonyms
+
+
+@receiver(post_save, sender=PersonNameSynonym)
+@receiver(post_delete, sender=PersonNameSynonym)
+def person_name_synonyms_changed(sender, **kwargs):
+    invalidate_synonyms()
@@ -1,11 +1,24 @@
 import re
 
+from bulk_adding.forms import BulkAddReviewFormSet
 from candidates.tests.auth import TestUserMixin
 from candidates.tests.uk_examples import UK2015ExamplesMixin
+from django.contrib.postgres.search import SearchQuery
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django_webtest import WebTest
+from official_documents.models import OfficialDocument
 from people.models import Person, PersonNameSynonym
 from people.tests.factories import PersonFactory
-from search.utils import search_person_by_name
+from popolo.models import Membership
+from search.utils import (
+    rewrite_with_synonyms,
+    search_people_by_names,
+    search_person_by_name,
+    synonym_map,
+)
 
 
 class TestSearchView(TestUserMixin, UK2015ExamplesMixin, WebTest):
@@ -111,6 +124,42 @@ class TestSearchView(TestUserMixin, UK2015ExamplesMixin, WebTest):
         self.assertEqual(qs.count(), 1)
         self.assertEqual(qs.first().name, "Henry Jekyll")
 
+    def test_other_name_changes_update_search_without_saving_person(self):
+        person = PersonFactory(name="Henry Jekyll")
+        other_name = person.other_names.create(name="Edward Hyde")
+        self.assertEqual(search_person_by_name("Edward Hyde").count(), 1)
+
+        other_name.name = "Mister Hyde"
+        other_name.save()
+        self.assertFalse(search_person_by_name("Edward").exists())
+        self.assertEqual(search_person_by_name("Mister Hyde").count(), 1)
+
+        other_name.delete()
+        self.assertFalse(search_person_by_name("Mister Hyde").exists())
+
+    def test_batched_name_search_rebuild(self):
+        people = PersonFactory.create_batch(5)
+        Person.objects.update(name_search_vector=None)
+        batches = []
+        Person.objects.update_name_search(batch_size=2, callback=batches.append)
+        self.assertEqual(batches[-1], max(person.pk for person in people))
+        self.assertFalse(
+            Person.objects.filter(name_search_vector__isnull=True).exists()
+        )
+
+    def test_batched_name_search_rebuild_resumes(self):
+        people = PersonFactory.create_batch(4)
+        Person.objects.update(name_search_vector=None)
+        Person.objects.update_name_search(batch_size=2, start_id=people[1].pk)
+        self.assertEqual(
+            set(
+                Person.objects.filter(name_search_vector__isnull=True)
+                .filter(pk__in=[p.pk for p in people])
+                .values_list("pk", flat=True)
+            ),
+            {people[0].pk, people[1].pk},
+        )
+
     def test_name_synonyms(self):
         """
         Make sure "Bertie" doesn't find "Bertram" until we add
@@ -125,6 +174,111 @@ class TestSearchView(TestUserMixin, UK2015ExamplesMixin, WebTest):
         PersonNameSynonym.objects.create(term="bertie", synonym="Bertram")
         self.assertFalse(search_person_by_name("Bertie").exists())
 
+    def test_synonyms_without_rewrite_query(self):
+        # The synonym map outlives the test's transaction
+        self.addCleanup(synonym_map.clear)
+        PersonFactory(name="Bertram Wilberforce Wooster")
+        PersonNameSynonym.objects.create(term="bertie", synonym="bertram")
+        # Load the synonyms
+        search_person_by_name("Bertie", synonym=True).exists()
+
+        with self.assertNumQueries(1):
+            qs = search_person_by_name("Bertie Wooster", synonym=True)
+            self.assertEqual(qs.count(), 1)
+
+    def test_synonym_map_matches_ts_rewrite(self):
+        # The synonym map outlives the test's transaction
+        self.addCleanup(synonym_map.clear)
+        PersonFactory(name="Bertram Wilberforce Wooster")
+        PersonFactory(name="Samantha Smith")
+        PersonFactory(name="Sam Jones")
+        PersonNameSynonym.objects.create(term="bertie", synonym="bertram")
+        PersonNameSynonym.objects.create(term="sam", synonym="samantha | sam")
+
+        for name in ["Bertie", "bertie wooster", "Sam", "Sam Smith", "Jones"]:
+            with self.subTest(name=name):
+                words = name.lower().split(" ")
+                and_name = " & ".join(words)
+                or_name = " | ".join(words)
+                in_python = synonym_map.rewrite(words)
+                in_postgres = rewrite_with_synonyms(
+                    f"({and_name}) | ({or_name})"
+                )
+                self.assertEqual(
+                    set(
+                        Person.objects.filter(
+                            name_search_vector=SearchQuery(
+                                in_python, search_type="raw", config="simple"
+                            )
+                        )
+                    ),
+                    set(
+                        Person.objects.filter(
+                            name_search_vector=SearchQuery(
+                                in_postgres, search_type="raw", config="simple"
+                            )
+                        )
+                    ),
+                )
+
+    def test_synonym_changes_invalidate_map(self):
+        # The synonym map outlives the test's transaction
+        self.addCleanup(synonym_map.clear)
+        PersonFactory(name="Bertram Wilberforce Wooster")
+        synonym = PersonNameSynonym.objects.create(
+            term="bertie", synonym="bertram"
+        )
+        self.assertTrue(search_person_by_name("Bertie", synonym=True).exists())
+        synonym.delete()
+        self.assertFalse(search_person_by_name("Bertie", synonym=True).exists())
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "person-search-tests",
+            }
+        }
+    )
+    def test_cached_results(self):
+        cache.clear()
+        PersonFactory(name="Henry Jekyll")
+        self.assertEqual(
+            search_person_by_name("Jekyll", cache_results=True).count(), 1
+        )
+        PersonFactory(name="Frank Jekyll")
+        # The cached result is used until it expires
+        self.assertEqual(
+            search_person_by_name("jekyll ", cache_results=True).count(), 1
+        )
+        self.assertEqual(search_person_by_name("Jekyll").count(), 2)
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "person-search-tests",
+            }
+        }
+    )
+    def test_cached_results_keep_rank_order_without_searching(self):
+        cache.clear()
+        henry = PersonFactory(name="Henry Jekyll")
+        frank = PersonFactory(name="Frank Jekyll")
+        expected = list(search_person_by_name("Henry Jekyll"))
+        self.assertEqual(expected, [henry, frank])
+        self.assertEqual(
+            list(search_person_by_name("Henry Jekyll", cache_results=True)),
+            expected,
+        )
+        with CaptureQueriesContext(connection) as queries:
+            results = list(
+                search_person_by_name("Henry Jekyll", cache_results=True)
+            )
+        self.assertEqual(results, expected)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("ts_rank", queries[0]["sql"])
+
     def test_double_space_regression(self):
         """
         Test that an input with more than one space in a row is valid
@@ -151,3 +305,69 @@ class TestSearchView(TestUserMixin, UK2015ExamplesMixin, WebTest):
         qs = search_person_by_name(name=person.name)
         self.assertEqual(qs.count(), 1)
         self.assertEqual(qs.first().name, person.name)
+
+    def test_search_people_by_names(self):
+        # The synonym map outlives the test's transaction
+        self.addCleanup(synonym_map.clear)
+        PersonNameSynonym.objects.create(term="bertie", synonym="bertram")
+        # Load the synonyms
+        search_person_by_name("Bertie", synonym=True).exists()
+        jekyll = PersonFactory(name="Henry Jekyll")
+        frank = PersonFactory(name="Frank Jekyll")
+        bertram = PersonFactory(name="Bertram Wilberforce Wooster")
+
+        names = ["Henry Jekyll", "Bertie Wooster", "Nobody", " $ "]
+        # One query to search, one for the people and one for memberships
+        with self.assertNumQueries(3):
+            results = search_people_by_names(names, synonym=True)
+
+        self.assertEqual(set(results.keys()), set(names))
+        self.assertEqual(results["Henry Jekyll"], [jekyll, frank])
+        self.assertEqual(results["Bertie Wooster"], [bertram])
+        self.assertEqual(results["Nobody"], [])
+        self.assertEqual(results[" $ "], [])
+
+        for name in ["Henry Jekyll", "Bertie Wooster"]:
+            with self.subTest(name=name):
+                expected = list(search_person_by_name(name, synonym=True)[:5])
+                self.assertEqual(results[name], expected)
+                self.assertEqual(
+                    [person.rank for person in results[name]],
+                    [person.rank for person in expected],
+                )
+
+    def test_search_people_by_names_limit(self):
+        for i in range(3):
+            PersonFactory(name=f"Henry Jekyll {i}")
+        results = search_people_by_names(["Jekyll"], limit=2)
+        self.assertEqual(len(results["Jekyll"]), 2)
+
+    def test_suggestion_descriptions_use_prefetched_documents(self):
+        person = PersonFactory(name="Henry Jekyll")
+        ballot = self.dulwich_post_ballot
+        Membership.objects.create(
+            person=person,
+            party=self.labour_party,
+            post=ballot.post,
+            ballot=ballot,
+        )
+        OfficialDocument.objects.create(
+            ballot=ballot,
+            document_type=OfficialDocument.NOMINATION_PAPER,
+            source_url="https://example.com/sopn.pdf",
+        )
+        # The documents are one more query
+        with self.assertNumQueries(4):
+            results = search_people_by_names(["Henry Jekyll"])
+
+        formset = BulkAddReviewFormSet(initial=[], ballot=ballot)
+        # Load the new election's organization before counting queries
+        self.assertIsNotNone(ballot.election.organization)
+        with self.assertNumQueries(0):
+            _, suggestion = formset.format_value(
+                results["Henry Jekyll"][0],
+                new_party=self.labour_party.ec_id,
+                new_election=ballot.election,
+                new_name="Henry Jekyll",
+            )
+        self.assertIn("SOPN", suggestion["previous_candidacies"][0])
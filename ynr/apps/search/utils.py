@@ -1,27 +1,100 @@
+import copy
+import hashlib
 import re
 import unicodedata
+import uuid
+from typing import Dict, List, Optional, Tuple
 
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
 from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.core.cache import cache
 from django.db import connection
-from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models import (
+    Count,
+    F,
+    Func,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Subquery,
+    Value,
+    prefetch_related_objects,
+)
+from official_documents.models import OfficialDocument
 from people.managers import PersonQuerySet
-from people.models import Person
+from people.models import Person, PersonNameSynonym
 from popolo.models import Membership
 
+SYNONYMS_VERSION_CACHE_KEY = "person_name_synonyms_version"
 
-def search_person_by_name(name: str, synonym: bool = False) -> PersonQuerySet:
-    """
-    Take a string and turn it into a Django query that uses PostgresSQLs full
-    text search.
+SINGLE_LEXEME_RE = re.compile(r"^'([^']+)'$")
+LEXEME_RE = re.compile(r"'([^']+)'")
 
-    This function manages query parsing, and prevents the user passing in
-    search logic.
 
-    The complexity arises because we use a synonyms table for common name
-    synonyms. This is done using PostgresSQLs built in `ts_rewrite`, however
-    see the comment in line about a workaround for a performance bug.
+class SynonymMap:
+    """
+    An in-process copy of the `PersonNameSynonym` table, used to add
+    synonyms to a search query without asking Postgres to `ts_rewrite` it.
 
+    The map is reloaded when `invalidate_synonyms` has been called, in this
+    or any other process.
     """
+
+    def __init__(self):
+        self.rules: Optional[List[Tuple[str, str]]] = None
+        self.version = None
+
+    def clear(self):
+        self.rules = None
+
+    def get_rules(self) -> List[Tuple[str, str]]:
+        version = cache.get(SYNONYMS_VERSION_CACHE_KEY)
+        if self.rules is None or version != self.version:
+            self.rules = list(
+                PersonNameSynonym.objects.order_by("pk").values_list(
+                    "term", "synonym"
+                )
+            )
+            self.version = version
+        return self.rules
+
+    def rewrite(self, words: List[str]) -> Optional[str]:
+        """
+        Return a query string for `words` with synonyms added, as
+        `ts_rewrite` would, or None if any rule that could apply isn't a
+        single word, in which case Postgres should do the rewriting.
+        """
+        terms = [f"'{word}'" for word in words]
+        for term, synonym in self.get_rules():
+            single = SINGLE_LEXEME_RE.match(term)
+            if not single:
+                if set(LEXEME_RE.findall(term)) <= set(words):
+                    return None
+                continue
+            # Like ts_rewrite, only use rules for terms in the original query
+            if single.group(1) not in words:
+                continue
+            terms = [
+                re.sub(
+                    rf"'{re.escape(single.group(1))}'(?!:)", f"( {synonym} )", t
+                )
+                for t in terms
+            ]
+        and_name = " & ".join(terms)
+        or_name = " | ".join(terms)
+        return f"({and_name}) | ({or_name})"
+
+
+synonym_map = SynonymMap()
+
+
+def invalidate_synonyms():
+    synonym_map.clear()
+    cache.set(SYNONYMS_VERSION_CACHE_KEY, uuid.uuid4().hex)
+
+
+def normalise_search_name(name: str) -> str:
     name = (
         unicodedata.normalize("NFKD", name)
         .encode("ascii", "ignore")
@@ -29,47 +102,83 @@ def search_person_by_name(name: str, synonym: bool = False) -> PersonQuerySet:
     )
     name = name.lower()
     name = re.sub(r"[^a-z ]", " ", name)
-    name = " ".join(name.strip().split())
-    if not name:
-        return Person.objects.none()
-    and_name = " & ".join(name.split(" "))
-    or_name = " | ".join(name.split(" "))
-    name = f"({and_name}) | ({or_name})"
-    name = name.strip()
+    return " ".join(name.strip().split())
+
 
+def rewrite_with_synonyms(name: str) -> str:
+    """
+    Ask Postgres to add synonyms to a query string with `ts_rewrite`
+    """
+    # We do this in a separate query because of a bug in Postgres and
+    # `ts_rewrite`. In theory we can use `ts_rewrite` in line, however this
+    # causes the search query to take almost 10 seconds on the full database.
+    # Doing the rewrite to add synonnyms first and then passing that query
+    # in to the actual search speeds this up, with the final search taking
+    # less than 30ms
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+        SELECT ts_rewrite(
+            to_tsquery('simple'::regconfig, %s),
+            'SELECT term, synonym
+            FROM people_personnamesynonym
+            WHERE to_tsquery(''simple''::regconfig, '%s') @> term'
+        );
+        """,
+            (name, name),
+        )
+        row = cursor.fetchone()
+    return row[0]
+
+
+def build_raw_search_query(name: str, synonym: bool = False) -> str:
+    """
+    Turn an already normalised name into a raw tsquery that matches people
+    with all or any of the words in it, optionally adding synonyms.
+    """
+    words = name.split(" ")
+    and_name = " & ".join(words)
+    or_name = " | ".join(words)
+    raw_query = f"({and_name}) | ({or_name})"
     if synonym:
-        # First perform a query that builts the final query
-        # We do this because of a bug in Postgres and `ts_rewrite`.
-        # In theory we can use `ts_rewrite` in line, however this causes the
-        # search query to take almost 10 seconds on the full database.
-        # Doing the rewrite to add synonnyms first and then passing that query
-        # in to the actual search speeds this up, with the final search taking
-        # less than 30ms
-        with connection.cursor() as cursor:
-            # This query takes the search terms and returns a query string
-            # with name synonyms attached.
-            # For example with:
-            # ```
-            # PersonNameSynonym.objects.create(term="sam", synonym="samantha")
-            # ```
-            # The search for "sam" would be transformed in to "(sam | samantha)"
-            # with `|` acting as an OR operator
-            cursor.execute(
-                """
-            SELECT ts_rewrite(
-                to_tsquery('simple'::regconfig, %s),
-                'SELECT term, synonym
-                FROM people_personnamesynonym
-                WHERE to_tsquery(''simple''::regconfig, '%s') @> term'
-            );
-            """,
-                (name, name),
-            )
-            row = cursor.fetchone()
+        raw_query = synonym_map.rewrite(words) or rewrite_with_synonyms(
+            raw_query
+        )
+    return raw_query
+
 
-        query = SearchQuery(row[0], search_type="raw", config="simple")
-    else:
-        query = SearchQuery(name, search_type="raw", config="simple")
+def search_person_by_name(
+    name: str, synonym: bool = False, cache_results: bool = False
+) -> PersonQuerySet:
+    """
+    Take a string and turn it into a Django query that uses PostgresSQLs full
+    text search.
+
+    This function manages query parsing, and prevents the user passing in
+    search logic.
+
+    The complexity arises because we use a synonyms table for common name
+    synonyms. The synonyms are added to the query in Python using
+    `synonym_map`, which works like PostgresSQLs built in `ts_rewrite` for
+    single word terms. Postgres is used for anything more complex.
+
+    For example with:
+    ```
+    PersonNameSynonym.objects.create(term="sam", synonym="samantha")
+    ```
+    "sam" in a search would be rewritten to the synonym "samantha".
+
+    With `cache_results`, the IDs of the matching people are cached in rank
+    order for `PERSON_SEARCH_CACHE_SECONDS`, keyed by the normalised query.
+    The results are then fetched by ID, without searching or ranking again.
+
+    """
+    name = normalise_search_name(name)
+    if not name:
+        return Person.objects.none()
+    raw_query = build_raw_search_query(name, synonym=synonym)
+
+    query = SearchQuery(raw_query, search_type="raw", config="simple")
 
     # Build the query
     membership_subquery = Subquery(
@@ -77,7 +186,7 @@ def search_person_by_name(name: str, synonym: bool = False) -> PersonQuerySet:
         .order_by("-pk")
         .values("party_name")[:1]
     )
-    return (
+    qs = (
         Person.objects.annotate(membership_count=Count("memberships"))
         .filter(name_search_vector=query)
         .annotate(vector=F("name_search_vector"))
@@ -92,5 +201,119 @@ def search_person_by_name(name: str, synonym: bool = False) -> PersonQuerySet:
         )
         .select_related("image")
         .order_by("-rank", "membership_count")
-        .defer("biography", "versions")
+        .defer("biography")
+    )
+    if not cache_results:
+        return qs
+
+    cache_key = "person_search:{}".format(
+        hashlib.md5(f"{synonym}|{name}".encode("utf8")).hexdigest()
+    )
+    person_ids = cache.get(cache_key)
+    if person_ids is None:
+        person_ids = list(qs.values_list("pk", flat=True))
+        cache.set(cache_key, person_ids, settings.PERSON_SEARCH_CACHE_SECONDS)
+    return (
+        Person.objects.filter(pk__in=person_ids)
+        .annotate(party_name=membership_subquery)
+        .annotate(
+            search_order=Func(
+                Value(person_ids, output_field=ArrayField(IntegerField())),
+                F("pk"),
+                function="array_position",
+                output_field=IntegerField(),
+            )
+        )
+        .select_related("image")
+        .order_by("search_order")
+        .defer("biography")
+    )
+
+
+BATCH_SEARCH_SQL = """
+    SELECT queries.ord, matches.id, matches.rank
+    FROM unnest(%(queries)s::text[]) WITH ORDINALITY AS queries(query, ord)
+    CROSS JOIN LATERAL (
+        SELECT
+            people_person.id,
+            ts_rank_cd(
+                '{0.1, 0.3, 0.4, 1.0}',
+                people_person.name_search_vector,
+                to_tsquery('simple', queries.query)
+            ) AS rank,
+            (
+                SELECT count(*) FROM popolo_membership
+                WHERE popolo_membership.person_id = people_person.id
+            ) AS membership_count
+        FROM people_person
+        WHERE people_person.name_search_vector
+            @@ to_tsquery('simple', queries.query)
+        ORDER BY rank DESC, membership_count
+        LIMIT %(limit)s
+    ) AS matches
+    ORDER BY queries.ord, matches.rank DESC, matches.membership_count
+"""
+
+
+def search_people_by_names(
+    names: List[str], synonym: bool = False, limit: int = 5
+) -> Dict[str, List[Person]]:
+    """
+    Search for lots of names at once, returning a dict of each name to a
+    list of up to `limit` matching people, ranked in the same way as
+    `search_person_by_name`.
+
+    All of the names are searched for in a single query, using a lateral
+    join over the array of search terms, then the matching people are
+    fetched in one more query. Names that are empty once normalised map to
+    an empty list.
+
+    Each person has their `rank` for the name set, like the `rank`
+    annotation from `search_person_by_name`. The same person can match more
+    than one name, so each result is a copy with its own `rank`.
+
+    The people have their memberships (and those memberships' party, ballot
+    and the ballot's official documents) prefetched, as they're used to
+    describe each suggestion.
+    """
+    results: Dict[str, List[Person]] = {name: [] for name in names}
+    queries = {}
+    for name in results:
+        normalised = normalise_search_name(name)
+        if normalised:
+            queries[name] = build_raw_search_query(normalised, synonym=synonym)
+    if not queries:
+        return results
+
+    query_names = list(queries.keys())
+    with connection.cursor() as cursor:
+        cursor.execute(
+            BATCH_SEARCH_SQL,
+            {"queries": list(queries.values()), "limit": limit},
+        )
+        rows = cursor.fetchall()
+
+    people = Person.objects.select_related("image").defer("biography")
+    people = people.in_bulk({person_id for _, person_id, _ in rows})
+    prefetch_related_objects(
+        list(people.values()),
+        Prefetch(
+            "memberships",
+            Membership.objects.select_related(
+                "party",
+                "ballot",
+                "ballot__post",
+                "ballot__election",
+                "ballot__election__organization",
+            ),
+        ),
+        Prefetch(
+            "memberships__ballot__officialdocument_set",
+            OfficialDocument.objects.order_by("pk"),
+        ),
     )
+    for ordinality, person_id, rank in rows:
+        person = copy.copy(people[person_id])
+        person.rank = rank
+        results[query_names[ordinality - 1]].append(person)
+    return results
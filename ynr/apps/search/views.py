@@ -27,7 +27,7 @@ class PersonSearch(ListView):
 
     def get_queryset(self):
         return search_person_by_name(
-            self.request.GET.get("q", ""), synonym=True
+            self.request.GET.get("q", ""), synonym=True, cache_results=True
         )
 
     def get_context_data(self, **kwargs):
@@ -2,20 +2,39 @@ import json
 
 import pandas as pd
 from sopn_parsing.helpers.text_helpers import NoTextInDocumentError, clean_text
-from sopn_parsing.models import CamelotParsedSOPN
+from sopn_parsing.models import (
+    CamelotParsedSOPN,
+    SOPNExtractionBackend,
+    SOPNExtractionResult,
+)
 
 
-def extract_ballot_table(ballot, parse_flavor="lattice"):
+def extract_ballot_table(ballot, parse_flavor="lattice", use_cache=True):
     """
     Given a OfficialDocument model, update or create a CamelotParsedSOPN model with the
     contents of the table as a JSON string.
 
+    If the same pages of the same document have been extracted before (and
+    `use_cache` is set) the earlier result is used instead of running Camelot
+    again.
+
     :type ballot: candidates.models.Ballot
 
     """
     import camelot  # import here to avoid import error running tests without pdf deps installed
 
     document = ballot.sopn
+    # Results are only stored for the default flavor
+    use_cache = use_cache and parse_flavor == "lattice"
+    if use_cache:
+        cached = SOPNExtractionResult.objects.for_sopn(
+            document, SOPNExtractionBackend.CAMELOT
+        )
+        if cached and cached.completed:
+            return store_camelot_raw_data(
+                document, cached.raw_data, cache=False
+            )
+
     try:
         tables = camelot.read_pdf(
             document.uploaded_file.path,
@@ -37,7 +56,7 @@ def extract_ballot_table(ballot, parse_flavor="lattice"):
     table_list.sort(key=lambda t: (t.page, t.order))
 
     if not table_list:
-        return None
+        return store_camelot_raw_data(document, "", cache=use_cache)
 
     table_data = table_list.pop(0).df
 
@@ -54,10 +73,28 @@ def extract_ballot_table(ballot, parse_flavor="lattice"):
         # table 1 row 1
         table_data = pd.concat([table_data, table], ignore_index=True)
 
+    raw_data = ""
     if not table_data.empty:
-        parsed, _ = CamelotParsedSOPN.objects.update_or_create(
-            sopn=document,
-            defaults={"raw_data": json.dumps(table_data.to_dict())},
+        raw_data = json.dumps(table_data.to_dict())
+    return store_camelot_raw_data(document, raw_data, cache=use_cache)
+
+
+def store_camelot_raw_data(document, raw_data, cache=True):
+    """
+    Make a CamelotParsedSOPN if any tables were found in a document, and
+    (if `cache` is set) record the result for documents with the same content
+    """
+    if cache:
+        SOPNExtractionResult.objects.store_for_sopn(
+            document,
+            SOPNExtractionBackend.CAMELOT,
+            raw_data=raw_data,
+            completed=True,
         )
-        return parsed
-    return None
+    if not raw_data:
+        return None
+    parsed, _ = CamelotParsedSOPN.objects.update_or_create(
+        sopn=document,
+        defaults={"raw_data": raw_data},
+    )
+    return parsed
@@ -0,0 +1,92 @@
+import io
+import multiprocessing
+from io import StringIO
+from typing import List, Optional
+
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+
+# Set in each worker process by `_set_worker_pdf`, so the PDF is only passed
+# to each worker once rather than with every page range
+_worker_pdf: Optional[bytes] = None
+
+
+def count_pages(pdf: bytes) -> int:
+    """
+    The number of pages in a PDF. This raises the same exceptions as
+    extracting the text would, e.g if text extraction isn't allowed.
+    """
+    return sum(
+        1 for _ in PDFPage.get_pages(io.BytesIO(pdf), check_extractable=True)
+    )
+
+
+def extract_page_range(pdf: bytes, start: int, end: int) -> List[str]:
+    """
+    Extract the text from pages `start` to `end` (0th indexed, not including
+    `end`) of a PDF, returning a list with the text of each page
+    """
+    page_texts = []
+    rsrcmgr = PDFResourceManager()
+    laparams = LAParams(line_margin=0.1)
+    pages = PDFPage.get_pages(
+        io.BytesIO(pdf), pagenos=set(range(start, end)), check_extractable=True
+    )
+    for page in pages:
+        retstr = StringIO()
+        device = TextConverter(rsrcmgr, retstr, laparams=laparams)
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        interpreter.process_page(page)
+        page_texts.append(retstr.getvalue())
+        device.close()
+        retstr.close()
+    return page_texts
+
+
+def _set_worker_pdf(pdf: bytes):
+    global _worker_pdf
+    _worker_pdf = pdf
+
+
+def _extract_worker_page_range(page_range):
+    return extract_page_range(_worker_pdf, *page_range)
+
+
+def page_ranges(page_count: int, range_count: int):
+    """
+    Split `page_count` pages in to (at most) `range_count` contiguous
+    (start, end) ranges of roughly equal size
+    """
+    range_count = max(1, min(range_count, page_count))
+    size, remainder = divmod(page_count, range_count)
+    ranges = []
+    start = 0
+    for i in range(range_count):
+        end = start + size + (1 if i < remainder else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def extract_page_texts(pdf: bytes, workers: int = 1) -> List[str]:
+    """
+    Extract the text of every page in a PDF.
+
+    With more than one worker, the pages are split in to ranges that are
+    extracted in a pool of processes. pdfminer is pure Python, so this is the
+    only way to use more than one CPU. Each worker is given a few ranges so
+    that a slow range doesn't hold up the others for long.
+    """
+    page_count = count_pages(pdf)
+    if workers <= 1 or page_count < 2:
+        return extract_page_range(pdf, 0, page_count)
+
+    ranges = page_ranges(page_count, workers * 4)
+    workers = min(workers, len(ranges))
+    with multiprocessing.get_context("fork").Pool(
+        workers, initializer=_set_worker_pdf, initargs=(pdf,)
+    ) as pool:
+        results = pool.map(_extract_worker_page_range, ranges, chunksize=1)
+    return [text for range_texts in results for text in range_texts]
@@ -12,6 +12,7 @@ from django.db.utils import DataError
 from nameparser import HumanName
 from pandas import DataFrame
 from parties.models import Party, PartyDescription
+from sopn_parsing.helpers.party_matching import PartyMatchers
 from sopn_parsing.helpers.text_helpers import clean_text
 from utils.db import Levenshtein
 
@@ -330,7 +331,7 @@ def get_name(row, name_fields):
     return clean_name(name)
 
 
-def add_previous_party_affiliations(party_str, raw_data, sopn):
+def add_previous_party_affiliations(party_str, raw_data, sopn, matcher=None):
     """
     Attempts to find previous party affiliations and add them to the data
     object. If no party can be found, returns the data unchanged.
@@ -338,9 +339,14 @@ def add_previous_party_affiliations(party_str, raw_data, sopn):
     if not party_str:
         return raw_data
 
-    party = get_party(
-        description_model=None, description_str=party_str, sopn=sopn
-    )
+    if matcher:
+        party = matcher.get_party(
+            None, party_str, sopn.sopn.ballot.election.election_date
+        )
+    else:
+        party = get_party(
+            description_model=None, description_str=party_str, sopn=sopn
+        )
 
     if not party:
         return raw_data
@@ -349,7 +355,14 @@ def add_previous_party_affiliations(party_str, raw_data, sopn):
     return raw_data
 
 
-def parse_table(sopn, data):
+def parse_table(sopn, data, matchers=None):
+    """
+    Parse the candidates in a table.
+
+    Parties and descriptions are matched in memory by a `PartyMatcher` from
+    `matchers`. Pass the same `PartyMatchers` when parsing many tables so
+    each register is only loaded once.
+    """
     data.columns = clean_row(data.columns)
 
     name_fields = get_name_fields(data.columns)
@@ -363,21 +376,25 @@ def parse_table(sopn, data):
         data=data.columns, sopn=sopn
     )
 
-    ballot_data = []
+    if matchers is None:
+        matchers = PartyMatchers()
+    ballot = sopn.sopn.ballot
+    matcher = matchers.for_ballot(ballot)
+
+    rows = []
     for row in iter_rows(data):
         name = get_name(row, name_fields)
         # if we couldnt parse a candidate name skip this row
-        if not name:
-            continue
+        if name:
+            rows.append((name, row))
 
-        description_obj = get_description(
-            description=row[description_field], sopn=sopn
-        )
-        party_obj = get_party(
-            description_model=description_obj,
-            description_str=row[description_field],
-            sopn=sopn,
-        )
+    matches = matcher.match(
+        [row[description_field] for _, row in rows],
+        ballot.election.election_date,
+    )
+
+    ballot_data = []
+    for (name, row), (description_obj, party_obj) in zip(rows, matches):
         if not party_obj:
             continue
 
@@ -390,14 +407,17 @@ def parse_table(sopn, data):
                 party_str=row[previous_party_affiliations_field],
                 raw_data=data,
                 sopn=sopn,
+                matcher=matcher,
             )
 
         ballot_data.append(data)
     return ballot_data
 
 
-def parse_raw_data_for_ballot(ballot, reparse=False):
+def parse_raw_data_for_ballot(ballot, reparse=False, matchers=None):
     """
+    Pass `matchers` (a `PartyMatchers`) when parsing many ballots, so the
+    parties for each register are only loaded once.
 
     :type ballot: candidates.models.Ballot
     """
@@ -418,10 +438,10 @@ def parse_raw_data_for_ballot(ballot, reparse=False):
     # data that matches the data in the RawPeople model? We should let the user choose
     # which one to save. In this case, we need to present the user with the two sets of
     # data and let them choose which one to save.
-    parse_raw_data(ballot, reparse=reparse)
+    parse_raw_data(ballot, reparse=reparse, matchers=matchers)
 
 
-def parse_dataframe(ballot: Ballot, df: DataFrame):
+def parse_dataframe(ballot: Ballot, df: DataFrame, matchers=None):
     # Don't parse situation of polling stations
     df.reset_index(drop=True, inplace=True)
     polling_station_index = df[
@@ -460,7 +480,7 @@ def parse_dataframe(ballot: Ballot, df: DataFrame):
     # with the columns set and other header rows removed.
     # Time to parse it in to names and parties
     try:
-        return parse_table(ballot, df)
+        return parse_table(ballot, df, matchers=matchers)
     except ValueError as e:
         # Something went wrong. This will happen a lot. let's move on
         print(f"Error attempting to parse a table for {ballot.ballot_paper_id}")
@@ -468,11 +488,14 @@ def parse_dataframe(ballot: Ballot, df: DataFrame):
         return None
 
 
-def parse_raw_data(ballot: Ballot, reparse=False):
+def parse_raw_data(ballot: Ballot, reparse=False, matchers=None):
     """
     Given a Ballot, go and get the Camelot and the AWS Textract dataframes
     and process them
     """
+    if matchers is None:
+        # Share the parties between both dataframes
+        matchers = PartyMatchers()
 
     camelot_model = getattr(ballot.sopn, "camelotparsedsopn", None)
     camelot_data = {}
@@ -483,7 +506,9 @@ def parse_raw_data(ballot: Ballot, reparse=False):
         and camelot_model.raw_data_type == "pandas"
         and (reparse or not camelot_model.parsed_data)
     ):
-        camelot_data = parse_dataframe(ballot, camelot_model.as_pandas)
+        camelot_data = parse_dataframe(
+            ballot, camelot_model.as_pandas, matchers=matchers
+        )
     if (
         textract_model
         and textract_model.raw_data
@@ -492,7 +517,9 @@ def parse_raw_data(ballot: Ballot, reparse=False):
     ):
         if not textract_model.parsed_data:
             textract_model.parse_raw_data()
-        textract_data = parse_dataframe(ballot, textract_model.as_pandas)
+        textract_data = parse_dataframe(
+            ballot, textract_model.as_pandas, matchers=matchers
+        )
 
     if camelot_data or textract_data:
         # Check there isn't a rawpeople object from another (better) source
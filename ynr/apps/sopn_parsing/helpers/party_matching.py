@@ -0,0 +1,356 @@
+"""
+Match the descriptions parsed from a SOPN to `Party` and `PartyDescription`
+objects in memory.
+
+`parse_tables.get_description` and `parse_tables.get_party` do this with
+several fuzzy queries per candidate. `PartyMatcher` loads the parties and
+descriptions once and indexes them, so a whole parse run doesn't need any
+more queries. The results should be the same as the SQL versions:
+
+* Levenshtein distances are found with a BK-tree, and match the
+  `levenshtein` function from Postgres' `fuzzystrmatch`
+* Trigram similarity is found with an inverted index of trigrams, and
+  matches the `similarity` function from Postgres' `pg_trgm`
+
+Where the SQL versions would order ties arbitrarily, the object with the
+lowest primary key is used.
+"""
+
+import time
+from collections import defaultdict
+from functools import cached_property
+from typing import Iterable, List, Optional, Tuple
+
+from django.utils import timezone
+from parties.models import Party, PartyDescription
+
+INDEPENDENT_PARTY_EC_ID = "ynmp-party:2"
+DESCRIPTION_MAX_DISTANCE = 3
+PARTY_MAX_DISTANCE = 5
+PARTY_MIN_SIMILARITY = 0.5
+# How long `get_shared_matchers` keeps using the same parties, in seconds
+SHARED_MATCHERS_TTL = 300
+
+
+def levenshtein(a: str, b: str) -> int:
+    """
+    The number of single character insertions, deletions and substitutions
+    needed to turn `a` in to `b`
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, a_char in enumerate(a, start=1):
+        current = [i]
+        for j, b_char in enumerate(b, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (a_char != b_char),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def trigrams(text: str) -> frozenset:
+    """
+    The set of trigrams in `text`, made the same way as `pg_trgm`: the text
+    is lower cased and split in to words of letters and digits, then each
+    word is padded with two spaces before and one after.
+    """
+    words = []
+    word = []
+    for char in text.lower():
+        if char.isalnum():
+            word.append(char)
+        elif word:
+            words.append("".join(word))
+            word = []
+    if word:
+        words.append("".join(word))
+
+    result = set()
+    for word in words:
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            result.add(padded[i : i + 3])
+    return frozenset(result)
+
+
+def trigram_similarity(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+def normalise(text: str) -> str:
+    """
+    The same as `Lower(Replace(text, "&", "and"))`
+    """
+    return text.replace("&", "and").lower()
+
+
+def is_active_for_date(party: Party, date) -> bool:
+    """
+    The same as `PartyQuerySet.active_for_date`
+    """
+    if party.date_registered is None or party.date_registered > date:
+        return False
+    return party.date_deregistered is None or party.date_deregistered >= date
+
+
+class BKTree:
+    """
+    A BK-tree of strings, for finding every item within a Levenshtein
+    distance of a query without comparing it to every item.
+    """
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, key: str, item):
+        if self.root is None:
+            self.root = (key, [item], {})
+            return
+        node = self.root
+        while True:
+            node_key, items, children = node
+            distance = levenshtein(key, node_key)
+            if distance == 0:
+                items.append(item)
+                return
+            if distance not in children:
+                children[distance] = (key, [item], {})
+                return
+            node = children[distance]
+
+    def search(self, key: str, max_distance: int) -> List[Tuple[int, object]]:
+        """
+        Every (distance, item) within `max_distance` of `key`
+        """
+        if self.root is None:
+            return []
+        found = []
+        to_visit = [self.root]
+        while to_visit:
+            node_key, items, children = to_visit.pop()
+            distance = levenshtein(key, node_key)
+            if distance <= max_distance:
+                found.extend((distance, item) for item in items)
+            for child_distance, child in children.items():
+                if abs(child_distance - distance) <= max_distance:
+                    to_visit.append(child)
+        return found
+
+
+class PartyMatcher:
+    """
+    Match SOPN descriptions to the parties and descriptions on a register,
+    without querying the database for each one.
+    """
+
+    def __init__(self, register: str):
+        self.register = register.upper()
+
+        self.parties = list(
+            Party.objects.register(self.register).order_by("pk")
+        )
+        self.parties_by_search_text = defaultdict(list)
+        self.parties_by_normalised_name = defaultdict(list)
+        self.party_tree = BKTree()
+        self.party_trigrams = {}
+        self.parties_by_trigram = defaultdict(set)
+        for party in self.parties:
+            search_text = party.name.replace("&", "and")
+            self.parties_by_search_text[search_text].append(party)
+            self.parties_by_normalised_name[normalise(party.name)].append(party)
+            self.party_tree.add(search_text, party)
+            party_trigrams = trigrams(party.name)
+            self.party_trigrams[party.pk] = party_trigrams
+            for trigram in party_trigrams:
+                self.parties_by_trigram[trigram].add(party)
+
+        # Levenshtein matching isn't limited to this register, so we need
+        # every description
+        self.descriptions = list(
+            PartyDescription.objects.select_related("party").order_by("pk")
+        )
+        self.register_descriptions = []
+        self.descriptions_by_search_text = defaultdict(list)
+        self.description_tree = BKTree()
+        for description in self.descriptions:
+            search_text = normalise(description.description)
+            description.search_text = search_text
+            self.description_tree.add(search_text, description)
+            if description.party.register == self.register:
+                self.register_descriptions.append(description)
+                self.descriptions_by_search_text[search_text].append(
+                    description
+                )
+        # The order `first()` would use
+        self.register_descriptions.sort(key=lambda d: (not d.active, d.pk))
+
+    @cached_property
+    def independent_party(self) -> Party:
+        return Party.objects.get(ec_id=INDEPENDENT_PARTY_EC_ID)
+
+    def get_description(self, description) -> Optional[PartyDescription]:
+        """
+        The same as `parse_tables.get_description`
+        """
+        from sopn_parsing.helpers.parse_tables import (
+            INDEPENDENT_VALUES,
+            clean_description,
+        )
+
+        description = clean_description(description)
+        if not description:
+            return None
+        if description.lower() in INDEPENDENT_VALUES:
+            return None
+
+        description_value = normalise(description)
+
+        # If the description is a party name, the party is matched by
+        # `get_party` instead
+        today = timezone.localdate()
+        if any(
+            is_active_for_date(party, today)
+            for party in self.parties_by_normalised_name.get(
+                description_value, []
+            )
+        ):
+            return None
+
+        exact = self.descriptions_by_search_text.get(description_value, [])
+        if len(exact) == 1:
+            return exact[0]
+
+        # `parse_tables.get_description` finds a description that starts
+        # with `description_value` here, but always replaces it with the
+        # result of the Levenshtein search, so prefixes alone don't match
+        close = self.description_tree.search(
+            description_value, DESCRIPTION_MAX_DISTANCE
+        )
+        if close:
+            return min(close, key=lambda match: (match[0], match[1].pk))[1]
+
+        # Welsh versions of descriptions are at the end
+        return next(
+            (
+                d
+                for d in self.register_descriptions
+                if d.search_text.endswith(f"| {description}")
+            ),
+            None,
+        )
+
+    def get_party(
+        self, description_model, description_str, election_date
+    ) -> Optional[Party]:
+        """
+        The same as `parse_tables.get_party`
+        """
+        from sopn_parsing.helpers.parse_tables import (
+            INDEPENDENT_VALUES,
+            clean_description,
+        )
+
+        if description_model:
+            return description_model.party
+
+        party_name = clean_description(description_str)
+        if not party_name or party_name.lower() in INDEPENDENT_VALUES:
+            return self.independent_party
+
+        def active(parties):
+            return [p for p in parties if is_active_for_date(p, election_date)]
+
+        exact = active(self.parties_by_search_text.get(party_name, []))
+        if len(exact) > 1:
+            raise Party.MultipleObjectsReturned()
+        if exact:
+            return exact[0]
+
+        close = [
+            (distance, party)
+            for distance, party in self.party_tree.search(
+                party_name, PARTY_MAX_DISTANCE
+            )
+            if is_active_for_date(party, election_date)
+        ]
+        if close:
+            return min(close, key=lambda match: (match[0], match[1].pk))[1]
+
+        # Parties that share a trigram with the name are the only ones that
+        # can have a similarity above zero
+        name_trigrams = trigrams(party_name)
+        candidates = set()
+        for trigram in name_trigrams:
+            candidates.update(self.parties_by_trigram.get(trigram, ()))
+        similar = [
+            (
+                trigram_similarity(name_trigrams, self.party_trigrams[p.pk]),
+                p,
+            )
+            for p in active(candidates)
+        ]
+        similar = [
+            match for match in similar if match[0] >= PARTY_MIN_SIMILARITY
+        ]
+        if not similar:
+            print(f"Couldn't find party for {party_name}.")
+            return None
+        return min(similar, key=lambda match: (-match[0], match[1].pk))[1]
+
+    def match(
+        self, descriptions: Iterable[str], election_date
+    ) -> List[Tuple[Optional[PartyDescription], Optional[Party]]]:
+        """
+        The (PartyDescription, Party) for each description, as
+        `parse_table` would find with `get_description` and `get_party`
+        """
+        results = []
+        for description in descriptions:
+            description_obj = self.get_description(description)
+            party_obj = self.get_party(
+                description_obj, description, election_date
+            )
+            results.append((description_obj, party_obj))
+        return results
+
+
+class PartyMatchers(dict):
+    """
+    A `PartyMatcher` for each register, made when it's first needed. Use one
+    of these for a parse run so each register is only loaded once.
+    """
+
+    def __missing__(self, register):
+        matcher = self[register] = PartyMatcher(register)
+        return matcher
+
+    def for_ballot(self, ballot) -> PartyMatcher:
+        return self[ballot.post.party_set.slug.upper()]
+
+
+_shared_matchers = None
+_shared_matchers_expire_at = 0
+
+
+def get_shared_matchers() -> PartyMatchers:
+    """
+    A `PartyMatchers` shared by everything parsing in this process, such as
+    the parse task run for each ballot. It's replaced after
+    `SHARED_MATCHERS_TTL` seconds, so new parties and descriptions are
+    picked up.
+    """
+    global _shared_matchers, _shared_matchers_expire_at
+    now = time.monotonic()
+    if _shared_matchers is None or now >= _shared_matchers_expire_at:
+        _shared_matchers = PartyMatchers()
+        _shared_matchers_expire_at = now + SHARED_MATCHERS_TTL
+    return _shared_matchers
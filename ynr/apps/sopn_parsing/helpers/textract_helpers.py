@@ -1,20 +1,28 @@
 import json
+from datetime import timedelta
 from typing import Optional
 
 import boto3
 from botocore.config import Config
 from django.conf import settings
 from django.db import IntegrityError
+from django.utils import timezone
 from official_documents.models import BallotSOPN
 from PIL import Image
 from sopn_parsing.models import (
     AWSTextractParsedSOPN,
     AWSTextractParsedSOPNImage,
+    AWSTextractParsedSOPNStatus,
+    SOPNExtractionBackend,
+    SOPNExtractionResult,
 )
 from textractor import Textractor
 from textractor.data.constants import TextractAPI, TextractFeatures
 from textractor.entities.lazy_document import LazyDocument
 
+# Textract keeps the results of a job for 7 days
+TEXTRACT_JOB_EXPIRY = timedelta(days=7)
+
 config = Config(retries={"max_attempts": 5})
 textract_client = boto3.client(
     "textract", region_name=settings.TEXTRACT_S3_BUCKET_REGION, config=config
@@ -51,13 +59,32 @@ class TextractSOPNHelper:
         parsed_sopn = getattr(self.ballot_sopn, "awstextractparsedsopn", None)
         if parsed_sopn and not replace:
             return None
-        print("Starting analysis")
-        document = self.textract_start_document_analysis()
+
+        defaults = None
+        if not replace:
+            defaults = self.get_cached_defaults()
+        if defaults:
+            print("Re-using analysis of a document with the same content")
+        else:
+            print("Starting analysis")
+            document = self.textract_start_document_analysis()
+            SOPNExtractionResult.objects.store_for_sopn(
+                self.ballot_sopn,
+                SOPNExtractionBackend.TEXTRACT,
+                job_id=document.job_id,
+                raw_data="",
+                completed=False,
+            )
+            defaults = {
+                "raw_data": "",
+                "job_id": document.job_id,
+                "status": AWSTextractParsedSOPNStatus.NOT_STARTED,
+            }
         print("Saving results")
         try:
             textract_result, _ = AWSTextractParsedSOPN.objects.update_or_create(
                 sopn=self.ballot_sopn,
-                defaults={"raw_data": "", "job_id": document.job_id},
+                defaults=defaults,
             )
             textract_result.save()
             textract_result.refresh_from_db()
@@ -70,6 +97,34 @@ class TextractSOPNHelper:
                 f"Failed to create AWSTextractParsedSOPN for {self.ballot_sopn.ballot.ballot_paper_id}: error {e}"
             )
 
+    def get_cached_defaults(self) -> Optional[dict]:
+        """
+        If a document with the same content has already been sent to
+        Textract, return the fields needed to re-use that job.
+
+        Images aren't made for re-used results.
+        """
+        cached = SOPNExtractionResult.objects.for_sopn(
+            self.ballot_sopn, SOPNExtractionBackend.TEXTRACT
+        )
+        if not cached or not cached.job_id:
+            return None
+        if cached.completed:
+            return {
+                "raw_data": cached.raw_data,
+                "job_id": cached.job_id,
+                "status": AWSTextractParsedSOPNStatus.SUCCEEDED,
+            }
+        if cached.modified < timezone.now() - TEXTRACT_JOB_EXPIRY:
+            # The job's results won't be available any more
+            return None
+        # The job is still running, so wait for it to finish
+        return {
+            "raw_data": "",
+            "job_id": cached.job_id,
+            "status": AWSTextractParsedSOPNStatus.NOT_STARTED,
+        }
+
     def textract_start_document_analysis(self) -> LazyDocument:
         document: LazyDocument = self.extractor.start_document_analysis(
             file_source=f"s3://{self.bucket_name}{settings.MEDIA_URL}{self.ballot_sopn.uploaded_file.name}",
@@ -137,8 +192,28 @@ class TextractSOPNHelper:
         textract_result.status = textract_document.response["JobStatus"]
         textract_result.raw_data = json.dumps(textract_document.response)
         textract_result.save()
+        self.update_cached_result(textract_result)
         return textract_result
 
+    def update_cached_result(self, textract_result: AWSTextractParsedSOPN):
+        """
+        Store successful results for documents with the same content, and
+        forget about failed jobs so they're tried again next time
+        """
+        if textract_result.status == AWSTextractParsedSOPNStatus.SUCCEEDED:
+            SOPNExtractionResult.objects.store_for_sopn(
+                self.ballot_sopn,
+                SOPNExtractionBackend.TEXTRACT,
+                job_id=textract_result.job_id,
+                raw_data=textract_result.raw_data,
+                completed=True,
+            )
+        elif textract_result.status == AWSTextractParsedSOPNStatus.FAILED:
+            SOPNExtractionResult.objects.filter(
+                backend=SOPNExtractionBackend.TEXTRACT,
+                job_id=textract_result.job_id,
+            ).delete()
+
 
 class TextractSOPNParsingHelper:
     """Helper class to extract the AWS Textract blocks for a given SOPN
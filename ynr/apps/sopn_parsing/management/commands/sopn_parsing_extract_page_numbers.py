@@ -15,6 +15,17 @@ class Command(BaseSOPNParsingCommand):
 
     """
 
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help=(
+                "How many processes to extract text with. Defaults to the "
+                "SOPN_TEXT_EXTRACTION_WORKERS setting"
+            ),
+        )
+
     def handle(self, *args, **options):
         qs = Election.objects.all().exclude(electionsopn=None)
 
@@ -32,7 +43,9 @@ class Command(BaseSOPNParsingCommand):
 
         for election in qs:
             try:
-                extract_pages_for_election_sopn(election.electionsopn)
+                extract_pages_for_election_sopn(
+                    election.electionsopn, workers=options["workers"]
+                )
             except (
                 ValueError,
                 NoTextInDocumentError,
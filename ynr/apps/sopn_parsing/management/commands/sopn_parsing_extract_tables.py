@@ -18,7 +18,7 @@ class Command(BaseSOPNParsingCommand):
             qs = qs.filter(**filter_kwargs)
         for ballot in qs:
             try:
-                extract_ballot_table(ballot)
+                extract_ballot_table(ballot, use_cache=not options["reparse"])
             except NoTextInDocumentError:
                 self.stdout.write(
                     f"{ballot} raised a NoTextInDocumentError trying to extract tables"
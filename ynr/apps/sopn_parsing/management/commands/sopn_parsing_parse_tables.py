@@ -1,6 +1,7 @@
 from bulk_adding.models import RawPeople
 from sopn_parsing.helpers.command_helpers import BaseSOPNParsingCommand
 from sopn_parsing.helpers.parse_tables import parse_raw_data_for_ballot
+from sopn_parsing.helpers.party_matching import PartyMatchers
 
 
 class Command(BaseSOPNParsingCommand):
@@ -60,8 +61,11 @@ class Command(BaseSOPNParsingCommand):
 
             self.stderr.write("\n".join(msg))
 
+        matchers = PartyMatchers()
         for ballot in qs:
             try:
-                parse_raw_data_for_ballot(ballot, options["reparse"])
+                parse_raw_data_for_ballot(
+                    ballot, options["reparse"], matchers=matchers
+                )
             except ValueError as e:
                 print(str(e))
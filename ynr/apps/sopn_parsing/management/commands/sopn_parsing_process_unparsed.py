@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.core.management.base import BaseCommand
 from sopn_parsing.helpers.parse_tables import parse_raw_data_for_ballot
+from sopn_parsing.helpers.party_matching import PartyMatchers
 from sopn_parsing.helpers.textract_helpers import (
     NotUsingAWSException,
     TextractSOPNHelper,
@@ -16,10 +17,12 @@ class Command(BaseCommand):
     """
     When we call BallotSOPN.parse we only actually half process the BallotSOPN.
 
-    This is because we want to be able to call `parse` as part of the request/response cycle
-    without blocking users too much.
+    `parse` queues a Celery pipeline (see `sopn_parsing.tasks`) that extracts
+    tables and parses the Camelot output, but Textract is async so its results
+    aren't ready by the time that pipeline finishes.
 
-    This script picks up where `parse` left off. It manages two cases:
+    This script picks up where `parse` left off, and catches anything the
+    pipeline missed. It manages two cases:
 
     # Camelot
 
@@ -40,6 +43,7 @@ class Command(BaseCommand):
     """
 
     def handle(self, *args, **options):
+        self.matchers = PartyMatchers()
         current_ballot_kwargs = {
             "sopn__ballot__election__current": True,
             "sopn__ballot__candidates_locked": False,
@@ -81,6 +85,8 @@ class Command(BaseCommand):
     def parse_tables_for_qs(self, qs):
         for parsed_sopn_model in qs:
             try:
-                parse_raw_data_for_ballot(parsed_sopn_model.sopn.ballot)
+                parse_raw_data_for_ballot(
+                    parsed_sopn_model.sopn.ballot, matchers=self.matchers
+                )
             except ValueError as e:
                 print(str(e))
@@ -0,0 +1,72 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from sopn_parsing.helpers.extract_text import count_pages, extract_page_texts
+
+TEST_DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+
+class Command(BaseCommand):
+    help = """
+    Time extracting the text from PDFs with different numbers of worker
+    processes, and check that every worker count extracts the same text.
+
+    Defaults to the SOPN PDFs in the sopn_parsing test data.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths",
+            nargs="*",
+            help="PDFs to extract text from",
+        )
+        parser.add_argument(
+            "--workers",
+            default="1,2,4",
+            help="Comma separated worker counts to compare",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="How many times to extract each PDF. The fastest is used",
+        )
+
+    def time_extraction(self, pdf, workers, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            page_texts = extract_page_texts(pdf, workers=workers)
+            timings.append(time.perf_counter() - start)
+        return min(timings), page_texts
+
+    def handle(self, *args, **options):
+        paths = [Path(path) for path in options["paths"]]
+        if not paths:
+            paths = sorted(TEST_DATA_DIR.glob("*.pdf"))
+        worker_counts = [int(w) for w in options["workers"].split(",")]
+
+        self.stdout.write("file\tpages\tworkers\tseconds\tspeedup")
+        for path in paths:
+            pdf = path.read_bytes()
+            page_count = count_pages(pdf)
+            baseline_seconds, baseline_texts = self.time_extraction(
+                pdf, 1, options["repeat"]
+            )
+            for workers in worker_counts:
+                if workers == 1:
+                    seconds = baseline_seconds
+                else:
+                    seconds, page_texts = self.time_extraction(
+                        pdf, workers, options["repeat"]
+                    )
+                    if page_texts != baseline_texts:
+                        raise CommandError(
+                            f"{path.name}: text extracted with {workers} "
+                            "workers doesn't match one worker"
+                        )
+                self.stdout.write(
+                    f"{path.name}\t{page_count}\t{workers}\t"
+                    f"{seconds:.3f}\t{baseline_seconds / seconds:.2f}x"
+                )
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.11 on 2026-10-16 12:20
+
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        (
+            "sopn_parsing",
+            "0009_alter_awstextractparsedsopn_official_document_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SOPNExtractionResult",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                ("content_hash", models.CharField(max_length=64)),
+                ("relevant_pages", models.CharField(max_length=20)),
+                (
+                    "backend",
+                    models.CharField(
+                        choices=[
+                            ("CAMELOT", "Camelot"),
+                            ("TEXTRACT", "AWS Textract"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("job_id", models.CharField(blank=True, max_length=100)),
+                ("raw_data", models.TextField(blank=True)),
+                ("completed", models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="sopnextractionresult",
+            constraint=models.UniqueConstraint(
+                fields=("content_hash", "relevant_pages", "backend"),
+                name="unique_extraction_per_content",
+            ),
+        ),
+    ]
@@ -140,3 +140,76 @@ class AWSTextractParsedSOPN(TimeStampedModel):
 
     def as_textractor_document(self):
         return response_parser.parse(json.loads(self.raw_data))
+
+
+class SOPNExtractionBackend(models.TextChoices):
+    CAMELOT = "CAMELOT", "Camelot"
+    TEXTRACT = "TEXTRACT", "AWS Textract"
+
+
+class SOPNExtractionResultQuerySet(models.QuerySet):
+    def for_sopn(self, sopn, backend):
+        """
+        The stored result for a BallotSOPN with the same content, if there is
+        one
+        """
+        if not sopn.content_hash:
+            return None
+        return self.filter(
+            content_hash=sopn.content_hash,
+            relevant_pages=sopn.relevant_pages,
+            backend=backend,
+        ).first()
+
+    def store_for_sopn(self, sopn, backend, **defaults):
+        """
+        Store (or update) the result for a BallotSOPN's content
+        """
+        if not sopn.content_hash:
+            return None
+        result, _ = self.update_or_create(
+            content_hash=sopn.content_hash,
+            relevant_pages=sopn.relevant_pages,
+            backend=backend,
+            defaults=defaults,
+        )
+        return result
+
+
+class SOPNExtractionResult(TimeStampedModel):
+    """
+    The tables extracted from a document, keyed on the sha256 of the document
+    and the pages used.
+
+    Extracting tables with Camelot is slow and Textract costs money, and the
+    same document is often uploaded (or split out of an ElectionSOPN) again.
+    This lets us re-use the `raw_data` from an earlier extraction.
+
+    Unlike `CamelotParsedSOPN` and `AWSTextractParsedSOPN` these aren't
+    deleted when a BallotSOPN is replaced.
+    """
+
+    content_hash = models.CharField(max_length=64)
+    relevant_pages = models.CharField(max_length=20)
+    backend = models.CharField(
+        max_length=20, choices=SOPNExtractionBackend.choices
+    )
+    # Only used by Textract. Set when the job is started, so other documents
+    # with the same content can wait for the same job.
+    job_id = models.CharField(max_length=100, blank=True)
+    raw_data = models.TextField(blank=True)
+    # Extraction might have run and not found any tables
+    completed = models.BooleanField(default=False)
+
+    objects = SOPNExtractionResultQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_hash", "relevant_pages", "backend"],
+                name="unique_extraction_per_content",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.backend}: {self.content_hash} ({self.relevant_pages})"
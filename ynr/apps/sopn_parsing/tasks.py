@@ -1,13 +1,94 @@
-from candidates.models import Ballot
-from celery import shared_task
-from official_documents.extract_pages import extract_pages_for_election_sopn
-from sopn_parsing.helpers.extract_tables import extract_ballot_table
+"""
+Celery tasks for processing SOPNs in the background.
+
+An ElectionSOPN is split in to a BallotSOPN per ballot by
+`split_election_sopn`. Each BallotSOPN then has its own pipeline (see
+`ballot_sopn_pipeline`) that extracts the tables from the document and then
+parses them, so the ballots in an election are processed in parallel across
+workers.
+
+The status of each stage is stored on the SOPN models, see
+`SOPNProcessingStagesMixin`. Failures are recorded there rather than
+raised, so the parse task checks that the tables were extracted first.
+"""
+
+from celery import chain, shared_task
+from official_documents.extract_pages import (
+    ElectionSOPNPageSplitter,
+    extract_pages_for_election_sopn,
+)
+from official_documents.models import (
+    BallotSOPN,
+    ElectionSOPN,
+    PageMatchingMethods,
+    SOPNProcessingStatus,
+)
 from sopn_parsing.helpers.parse_tables import parse_raw_data_for_ballot
+from sopn_parsing.helpers.party_matching import get_shared_matchers
 
 
 @shared_task
-def extract_and_parse_tables_for_ballot(ballot_str):
-    ballot = Ballot.objects.get(ballot_paper_id=ballot_str)
-    extract_pages_for_election_sopn(ballot)
-    extract_ballot_table(ballot)
-    parse_raw_data_for_ballot(ballot)
+def split_election_sopn(election_sopn_id, ballot_to_pages=None, method=None):
+    """
+    Make a BallotSOPN for each ballot in an ElectionSOPN.
+
+    If `ballot_to_pages` isn't given the pages are matched to ballots
+    automatically.
+    """
+    try:
+        election_sopn = ElectionSOPN.objects.get(pk=election_sopn_id)
+    except ElectionSOPN.DoesNotExist:
+        # The document was replaced before we got to it
+        return
+
+    with election_sopn.processing_stage("split"):
+        if ballot_to_pages is None:
+            extract_pages_for_election_sopn(election_sopn)
+        else:
+            splitter = ElectionSOPNPageSplitter(election_sopn, ballot_to_pages)
+            splitter.split(method=method or PageMatchingMethods.MANUAL_MATCHED)
+
+
+@shared_task
+def extract_ballot_sopn_tables(ballot_sopn_id):
+    try:
+        ballot_sopn = BallotSOPN.objects.get(pk=ballot_sopn_id)
+    except BallotSOPN.DoesNotExist:
+        return
+
+    with ballot_sopn.processing_stage("extract"):
+        ballot_sopn.extract_tables()
+
+
+@shared_task
+def parse_ballot_sopn_tables(ballot_sopn_id):
+    try:
+        ballot_sopn = BallotSOPN.objects.select_related("ballot").get(
+            pk=ballot_sopn_id
+        )
+    except BallotSOPN.DoesNotExist:
+        return
+
+    if ballot_sopn.extract_status != SOPNProcessingStatus.SUCCEEDED:
+        # There are no tables to parse. Keep the extract stage's error.
+        ballot_sopn.parse_status = SOPNProcessingStatus.NOT_STARTED
+        ballot_sopn.save(update_fields=["parse_status", "modified"])
+        return
+
+    with ballot_sopn.processing_stage("parse"):
+        parse_raw_data_for_ballot(
+            ballot_sopn.ballot, matchers=get_shared_matchers()
+        )
+
+
+def ballot_sopn_pipeline(ballot_sopn_id):
+    """
+    The chain of tasks needed to parse a BallotSOPN.
+
+    Textract results arrive later, and are parsed by
+    `sopn_parsing_process_unparsed`.
+    """
+    return chain(
+        extract_ballot_sopn_tables.si(ballot_sopn_id),
+        parse_ballot_sopn_tables.si(ballot_sopn_id),
+    )
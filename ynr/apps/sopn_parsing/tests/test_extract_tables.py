@@ -1,14 +1,20 @@
 from os.path import abspath, dirname, join
 from unittest import skipIf
+from unittest.mock import patch
 
 from candidates.tests.helpers import TmpMediaRootMixin
 from candidates.tests.uk_examples import UK2015ExamplesMixin
+from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.management import call_command
 from django.test import TestCase
-from official_documents.models import BallotSOPN
+from official_documents.models import BallotSOPN, add_ballot_sopn
 from sopn_parsing.helpers.extract_tables import extract_ballot_table
-from sopn_parsing.models import CamelotParsedSOPN
+from sopn_parsing.models import (
+    CamelotParsedSOPN,
+    SOPNExtractionBackend,
+    SOPNExtractionResult,
+)
 from sopn_parsing.tests import should_skip_pdf_tests
 
 
@@ -176,3 +182,59 @@ class TestSOPNHelpers(TmpMediaRootMixin, UK2015ExamplesMixin, TestCase):
         self.assertEqual(CamelotParsedSOPN.objects.count(), 0)
         call_command("sopn_parsing_extract_tables", current=True)
         self.assertEqual(CamelotParsedSOPN.objects.count(), 0)
+
+
+class TestExtractionCache(TmpMediaRootMixin, UK2015ExamplesMixin, TestCase):
+    def setUp(self):
+        example_doc_path = abspath(
+            join(
+                dirname(__file__),
+                "data/parl.dulwich-and-west-norwood.2015-05-07.pdf",
+            )
+        )
+        with open(example_doc_path, "rb") as f:
+            self.sopn_file = f.read()
+
+    def add_sopn(self, ballot):
+        return add_ballot_sopn(
+            ballot,
+            ContentFile(self.sopn_file, "sopn.pdf"),
+            "example.com",
+            parse=False,
+        )
+
+    def test_history_shares_file_and_hash(self):
+        sopn = self.add_sopn(self.dulwich_post_ballot)
+        history = self.dulwich_post_ballot.sopn_history.get()
+        self.assertEqual(len(sopn.content_hash), 64)
+        self.assertEqual(sopn.content_hash, history.content_hash)
+        self.assertEqual(sopn.uploaded_file.name, history.uploaded_file.name)
+
+    @skipIf(should_skip_pdf_tests(), "Required PDF libs not installed")
+    def test_identical_document_reuses_tables(self):
+        self.add_sopn(self.dulwich_post_ballot)
+        extract_ballot_table(self.dulwich_post_ballot)
+        cached = SOPNExtractionResult.objects.get(
+            backend=SOPNExtractionBackend.CAMELOT
+        )
+        self.assertTrue(cached.completed)
+
+        self.add_sopn(self.camberwell_post_ballot)
+        with patch("camelot.read_pdf") as read_pdf:
+            parsed = extract_ballot_table(self.camberwell_post_ballot)
+        read_pdf.assert_not_called()
+        self.assertEqual(parsed.raw_data, cached.raw_data)
+        self.assertEqual(CamelotParsedSOPN.objects.count(), 2)
+
+    @skipIf(should_skip_pdf_tests(), "Required PDF libs not installed")
+    def test_reparse_ignores_stored_tables(self):
+        self.add_sopn(self.dulwich_post_ballot)
+        SOPNExtractionResult.objects.store_for_sopn(
+            self.dulwich_post_ballot.sopn,
+            SOPNExtractionBackend.CAMELOT,
+            raw_data="",
+            completed=True,
+        )
+        self.assertIsNone(extract_ballot_table(self.dulwich_post_ballot))
+        parsed = extract_ballot_table(self.dulwich_post_ballot, use_cache=False)
+        self.assertIsNotNone(parsed)
@@ -0,0 +1,51 @@
+from io import StringIO
+from os.path import abspath, dirname, join
+from unittest import skipIf
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from sopn_parsing.helpers.extract_text import (
+    count_pages,
+    extract_page_range,
+    extract_page_texts,
+    page_ranges,
+)
+from sopn_parsing.tests import should_skip_pdf_tests
+
+EXAMPLE_DOC_PATH = abspath(
+    join(dirname(__file__), "data/NI-Assembly-Election-2016.pdf")
+)
+
+
+class TestExtractText(SimpleTestCase):
+    def test_page_ranges(self):
+        self.assertEqual(page_ranges(9, 4), [(0, 3), (3, 5), (5, 7), (7, 9)])
+        self.assertEqual(page_ranges(2, 8), [(0, 1), (1, 2)])
+        self.assertEqual(page_ranges(0, 4), [(0, 0)])
+
+    @skipIf(should_skip_pdf_tests(), "Required PDF libs not installed")
+    def test_parallel_extraction_matches_serial(self):
+        with open(EXAMPLE_DOC_PATH, "rb") as f:
+            pdf = f.read()
+        self.assertEqual(count_pages(pdf), 9)
+
+        page_texts = extract_page_texts(pdf)
+        self.assertEqual(len(page_texts), 9)
+        self.assertEqual(extract_page_texts(pdf, workers=3), page_texts)
+        self.assertEqual(extract_page_range(pdf, 4, 9), page_texts[4:])
+
+    @skipIf(should_skip_pdf_tests(), "Required PDF libs not installed")
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command(
+            "sopn_tooling_benchmark_text_extraction",
+            EXAMPLE_DOC_PATH,
+            workers="1,2",
+            repeat=1,
+            stdout=out,
+        )
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(
+            lines[2].startswith("NI-Assembly-Election-2016.pdf\t9\t2\t")
+        )
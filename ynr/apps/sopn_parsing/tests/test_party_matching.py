@@ -0,0 +1,196 @@
+from unittest.mock import patch
+
+from candidates.tests.uk_examples import UK2015ExamplesMixin
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from official_documents.models import BallotSOPN
+from parties.models import PartyDescription
+from parties.tests.factories import PartyFactory
+from parties.tests.fixtures import DefaultPartyFixtures
+from sopn_parsing.helpers import parse_tables
+from sopn_parsing.helpers.party_matching import (
+    SHARED_MATCHERS_TTL,
+    BKTree,
+    PartyMatcher,
+    PartyMatchers,
+    get_shared_matchers,
+    levenshtein,
+    trigram_similarity,
+    trigrams,
+)
+
+
+class TestMatchingFunctions(SimpleTestCase):
+    def test_levenshtein(self):
+        cases = [
+            ("", "", 0),
+            ("abc", "", 3),
+            ("", "abc", 3),
+            ("kitten", "sitting", 3),
+            ("labour party", "labour party", 0),
+            ("labour party", "labor party", 1),
+            ("sinn féin", "sinn fein", 1),
+        ]
+        for a, b, expected in cases:
+            with self.subTest(a=a, b=b):
+                self.assertEqual(levenshtein(a, b), expected)
+
+    def test_trigrams(self):
+        # Matches `SELECT show_trgm('Cat')`
+        self.assertEqual(trigrams("Cat"), {"  c", " ca", "cat", "at "})
+        self.assertEqual(trigrams("a-b"), {"  a", " a ", "  b", " b "})
+        self.assertEqual(trigrams(" - "), frozenset())
+
+    def test_trigram_similarity(self):
+        self.assertEqual(trigram_similarity(trigrams("cat"), trigrams("")), 0)
+        self.assertEqual(
+            trigram_similarity(trigrams("Cat"), trigrams("cat")), 1
+        )
+        # Matches `SELECT similarity('cat', 'cart')`
+        self.assertAlmostEqual(
+            trigram_similarity(trigrams("cat"), trigrams("cart")), 2 / 7
+        )
+
+    def test_bk_tree_search(self):
+        words = ["labour", "labor", "liberal", "green", "greens", "ukip"]
+        tree = BKTree()
+        for word in words:
+            tree.add(word, word)
+        # Items with the same key are all returned
+        tree.add("green", "green again")
+        for query in ["labour", "grean", "xyz", "liberals"]:
+            for max_distance in range(4):
+                with self.subTest(query=query, max_distance=max_distance):
+                    expected = {
+                        (levenshtein(query, word), word)
+                        for word in words
+                        if levenshtein(query, word) <= max_distance
+                    }
+                    if (1, "green") in expected:
+                        expected.add((1, "green again"))
+                    self.assertEqual(
+                        set(tree.search(query, max_distance)), expected
+                    )
+
+
+class TestPartyMatcherMatchesSQL(
+    DefaultPartyFixtures, UK2015ExamplesMixin, TestCase
+):
+    """
+    `PartyMatcher` should give the same results as the SQL versions of
+    `get_description` and `get_party`
+    """
+
+    def setUp(self):
+        super().setUp()
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS fuzzystrmatch;")
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+        BallotSOPN.objects.create(
+            ballot=self.dulwich_post_ballot, source_url="example.com"
+        )
+        PartyFactory(ec_id="PP85", name="UK Independence Party (UKIP)")
+        barnsley = PartyFactory(ec_id="PP2", name="Barnsley Independent Group")
+        PartyFactory(
+            ec_id="PP3",
+            name="Old Deregistered Party",
+            date_deregistered="2005-01-01",
+        )
+        PartyFactory(ec_id="PP4", name="Trade Unionist & Socialist Coalition")
+        PartyDescription.objects.create(
+            party=self.labour_party, description="Labour and Co-operative Party"
+        )
+        PartyDescription.objects.create(
+            party=self.ld_party,
+            description="Liberal Democrat Focus Team | Tîm Ffocws y Democratiaid Rhyddfrydol",
+        )
+        PartyDescription.objects.create(
+            party=self.green_party, description="The Green Party Candidate"
+        )
+        PartyDescription.objects.create(
+            party=barnsley, description="Barnsley Independent Group & Friends"
+        )
+        PartyDescription.objects.create(
+            party=self.sinn_fein, description="Sinn Féin Candidate"
+        )
+
+    def get_descriptions(self):
+        return [
+            "",
+            "Independent",
+            "INDEPENDENT",
+            "Annibynnol",
+            "Labour Party",
+            "Labour Party ",
+            "Labour and Co-operative Party",
+            "Labour & Co-operative Party",
+            "Labour and Co-operative Pary",
+            "Labour and Co",
+            "Liberal Democrats",
+            "Liberal Democrat",
+            "Liberal Democrat \nFocus Team",
+            # Only the start of a description
+            "Liberal Democrat Focus",
+            "tîm ffocws y democratiaid rhyddfrydol",
+            "The Green Party",
+            "The Green Party Candidate",
+            "Green",
+            "Conservative Party",
+            "The Conservative \nParty Candidate",
+            "Conservativ Party",
+            "UK Independence \nParty (UKIP)",
+            "Barnsley IndependentGroup",
+            "Barnsley Independent Group & Friends",
+            "Trade Unionist and Socialist Coalition",
+            "Trade Unionist \nand Socialist \nCoalition",
+            "Old Deregistered Party",
+            "Sinn Féin Candidate",
+            "Some Party We Don't Know About",
+        ]
+
+    def test_match_is_the_same_as_sql(self):
+        ballot = self.dulwich_post_ballot
+        matcher = PartyMatchers().for_ballot(ballot)
+        descriptions = self.get_descriptions()
+        matches = matcher.match(descriptions, ballot.election.election_date)
+
+        for description, (description_obj, party_obj) in zip(
+            descriptions, matches
+        ):
+            with self.subTest(description=description):
+                sql_description = parse_tables.get_description(
+                    description, ballot
+                )
+                sql_party = parse_tables.get_party(
+                    sql_description, description, ballot
+                )
+                self.assertEqual(description_obj, sql_description)
+                self.assertEqual(party_obj, sql_party)
+
+    def test_match_makes_no_queries(self):
+        ballot = self.dulwich_post_ballot
+        election_date = ballot.election.election_date
+        matcher = PartyMatcher("gb")
+        # Loaded the first time it's needed
+        self.assertEqual(matcher.independent_party.ec_id, "ynmp-party:2")
+        with self.assertNumQueries(0):
+            matcher.match(self.get_descriptions(), election_date)
+
+    def test_one_matcher_per_register(self):
+        matchers = PartyMatchers()
+        self.assertIs(
+            matchers.for_ballot(self.dulwich_post_ballot),
+            matchers.for_ballot(self.camberwell_post_ballot),
+        )
+        self.assertEqual(list(matchers.keys()), ["GB"])
+
+    @patch("sopn_parsing.helpers.party_matching._shared_matchers", None)
+    @patch("sopn_parsing.helpers.party_matching.time.monotonic")
+    def test_shared_matchers_are_replaced_after_ttl(self, monotonic):
+        monotonic.return_value = 1000
+        matchers = get_shared_matchers()
+        monotonic.return_value += SHARED_MATCHERS_TTL - 1
+        self.assertIs(get_shared_matchers(), matchers)
+        monotonic.return_value += 1
+        self.assertIsNot(get_shared_matchers(), matchers)
@@ -1,10 +1,11 @@
 import contextlib
 import json
 import os
+from datetime import timedelta
 from os.path import abspath, dirname, join
 from pathlib import Path
 from unittest import skipIf
-from unittest.mock import PropertyMock
+from unittest.mock import PropertyMock, patch
 
 import pytest
 from candidates.tests.factories import (
@@ -16,13 +17,20 @@ from candidates.tests.uk_examples import UK2015ExamplesMixin
 from django.core.files import File
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from django.utils import timezone
 from mock import Mock
 from official_documents.models import BallotSOPN, ElectionSOPN
 from sopn_parsing.helpers.text_helpers import NoTextInDocumentError, clean_text
 from sopn_parsing.helpers.textract_helpers import (
+    TEXTRACT_JOB_EXPIRY,
     TextractSOPNHelper,
 )
-from sopn_parsing.models import AWSTextractParsedSOPN
+from sopn_parsing.models import (
+    AWSTextractParsedSOPN,
+    AWSTextractParsedSOPNStatus,
+    SOPNExtractionBackend,
+    SOPNExtractionResult,
+)
 from sopn_parsing.tests import should_skip_pdf_tests
 from textractor.entities.lazy_document import LazyDocument
 
@@ -220,6 +228,58 @@ class TestSOPNHelpers(UK2015ExamplesMixin, TestCase):
         document_obj.match_all_pages()
         self.assertEqual(strensall.sopn.relevant_pages, "all")
 
+    @skipIf(should_skip_pdf_tests(), "Required PDF libs not installed")
+    def test_page_texts_are_stored(self):
+        example_doc_path = abspath(
+            join(dirname(__file__), "data/sopn-berkeley-vale.pdf")
+        )
+        with open(example_doc_path, "rb") as f:
+            election_sopn = ElectionSOPN.objects.create(
+                election=self.local_election,
+                uploaded_file=SimpleUploadedFile("sopn.pdf", f.read()),
+            )
+        doc = ElectionSOPNDocument(election_sopn=election_sopn)
+        election_sopn.refresh_from_db()
+        self.assertEqual(
+            election_sopn.page_texts["pages"],
+            [page.raw_text for page in doc.pages.values()],
+        )
+
+        # Retries don't extract the text again
+        with patch.object(
+            ElectionSOPNDocument, "extract_page_texts"
+        ) as extract_page_texts:
+            retry = ElectionSOPNDocument(election_sopn=election_sopn)
+        extract_page_texts.assert_not_called()
+        self.assertEqual(retry.document_heading_set, doc.document_heading_set)
+
+    def test_match_ballot_to_pages_with_heading_index(self):
+        filler = " ".join(["candidate"] * 14)
+        election_sopn = ElectionSOPN.objects.create(
+            election=self.local_election,
+            uploaded_file=SimpleUploadedFile("sopn.pdf", b"%PDF-1.4"),
+        )
+        election_sopn.page_texts = {
+            "uploaded_file": election_sopn.uploaded_file.name,
+            "pages": [
+                f"Statement of persons nominated {ward} ward {filler}"
+                for ward in ["North Park", "Parkside", "South"]
+            ],
+        }
+        election_sopn.save()
+        doc = ElectionSOPNDocument(election_sopn=election_sopn)
+
+        self.assertEqual(doc.candidate_page_numbers("park"), {1, 2})
+        self.assertEqual(doc.candidate_page_numbers("north park"), {1})
+        self.assertEqual(doc.candidate_page_numbers("bridge/south"), {3})
+        self.assertEqual(doc.candidate_page_numbers("bridge"), set())
+
+        ballot = BallotPaperFactory(
+            election=self.local_election, post__label="South"
+        )
+        self.assertEqual(doc.match_ballot_to_pages(ballot), [2])
+        self.assertTrue(doc.pages[3].matched)
+
 
 @pytest.fixture
 def aws_credentials():
@@ -346,3 +406,144 @@ def test_update_job_status_failed(
     textract_sopn_helper.update_job_status(blocking=True)
     ballot_sopn.awstextractparsedsopn.refresh_from_db()
     assert ballot_sopn.awstextractparsedsopn.status == "FAILED"
+
+
+@pytest.fixture
+def hashed_textract_sopn_helper(textract_sopn_helper):
+    ballot_sopn = textract_sopn_helper.ballot_sopn
+    ballot_sopn.content_hash = "a" * 64
+    ballot_sopn.save()
+    return textract_sopn_helper
+
+
+def store_textract_result(ballot_sopn, **defaults):
+    return SOPNExtractionResult.objects.store_for_sopn(
+        ballot_sopn, SOPNExtractionBackend.TEXTRACT, **defaults
+    )
+
+
+def test_get_cached_defaults_no_hash(textract_sopn_helper):
+    assert textract_sopn_helper.get_cached_defaults() is None
+
+
+def test_get_cached_defaults_nothing_stored(hashed_textract_sopn_helper):
+    assert hashed_textract_sopn_helper.get_cached_defaults() is None
+
+
+def test_get_cached_defaults_completed(hashed_textract_sopn_helper):
+    store_textract_result(
+        hashed_textract_sopn_helper.ballot_sopn,
+        job_id="1234",
+        raw_data='{"Blocks": []}',
+        completed=True,
+    )
+    assert hashed_textract_sopn_helper.get_cached_defaults() == {
+        "raw_data": '{"Blocks": []}',
+        "job_id": "1234",
+        "status": AWSTextractParsedSOPNStatus.SUCCEEDED,
+    }
+
+
+def test_get_cached_defaults_running_job(hashed_textract_sopn_helper):
+    store_textract_result(
+        hashed_textract_sopn_helper.ballot_sopn,
+        job_id="1234",
+        raw_data="",
+        completed=False,
+    )
+    assert hashed_textract_sopn_helper.get_cached_defaults() == {
+        "raw_data": "",
+        "job_id": "1234",
+        "status": AWSTextractParsedSOPNStatus.NOT_STARTED,
+    }
+
+
+def test_get_cached_defaults_expired_job(hashed_textract_sopn_helper):
+    result = store_textract_result(
+        hashed_textract_sopn_helper.ballot_sopn,
+        job_id="1234",
+        raw_data="",
+        completed=False,
+    )
+    # `modified` is set on save, so change it with an update
+    SOPNExtractionResult.objects.filter(pk=result.pk).update(
+        modified=timezone.now() - TEXTRACT_JOB_EXPIRY - timedelta(hours=1)
+    )
+    assert hashed_textract_sopn_helper.get_cached_defaults() is None
+
+
+def test_start_detection_reuses_cached_job(hashed_textract_sopn_helper):
+    store_textract_result(
+        hashed_textract_sopn_helper.ballot_sopn,
+        job_id="1234",
+        raw_data='{"Blocks": []}',
+        completed=True,
+    )
+    mock_document_analysis = Mock()
+    hashed_textract_sopn_helper.textract_start_document_analysis = (
+        mock_document_analysis
+    )
+
+    textract_result = hashed_textract_sopn_helper.start_detection()
+    mock_document_analysis.assert_not_called()
+    assert textract_result.job_id == "1234"
+    assert textract_result.status == "SUCCEEDED"
+    assert textract_result.raw_data == '{"Blocks": []}'
+
+
+def test_update_cached_result_succeeded(hashed_textract_sopn_helper):
+    ballot_sopn = hashed_textract_sopn_helper.ballot_sopn
+    store_textract_result(
+        ballot_sopn, job_id="1234", raw_data="", completed=False
+    )
+    textract_result = AWSTextractParsedSOPN.objects.create(
+        sopn=ballot_sopn,
+        job_id="1234",
+        raw_data='{"Blocks": []}',
+        status=AWSTextractParsedSOPNStatus.SUCCEEDED,
+    )
+
+    hashed_textract_sopn_helper.update_cached_result(textract_result)
+    cached = SOPNExtractionResult.objects.get(
+        backend=SOPNExtractionBackend.TEXTRACT
+    )
+    assert cached.completed
+    assert cached.job_id == "1234"
+    assert cached.raw_data == '{"Blocks": []}'
+
+
+def test_update_cached_result_failed(hashed_textract_sopn_helper):
+    ballot_sopn = hashed_textract_sopn_helper.ballot_sopn
+    store_textract_result(
+        ballot_sopn, job_id="1234", raw_data="", completed=False
+    )
+    textract_result = AWSTextractParsedSOPN.objects.create(
+        sopn=ballot_sopn,
+        job_id="1234",
+        raw_data="",
+        status=AWSTextractParsedSOPNStatus.FAILED,
+    )
+
+    hashed_textract_sopn_helper.update_cached_result(textract_result)
+    assert not SOPNExtractionResult.objects.filter(
+        backend=SOPNExtractionBackend.TEXTRACT
+    ).exists()
+
+
+def test_update_cached_result_in_progress(hashed_textract_sopn_helper):
+    ballot_sopn = hashed_textract_sopn_helper.ballot_sopn
+    store_textract_result(
+        ballot_sopn, job_id="1234", raw_data="", completed=False
+    )
+    textract_result = AWSTextractParsedSOPN.objects.create(
+        sopn=ballot_sopn,
+        job_id="1234",
+        raw_data="",
+        status=AWSTextractParsedSOPNStatus.IN_PROGRESS,
+    )
+
+    hashed_textract_sopn_helper.update_cached_result(textract_result)
+    cached = SOPNExtractionResult.objects.get(
+        backend=SOPNExtractionBackend.TEXTRACT
+    )
+    assert not cached.completed
@@ -0,0 +1,127 @@
+from unittest.mock import patch
+
+from candidates.tests.helpers import TmpMediaRootMixin
+from candidates.tests.uk_examples import UK2015ExamplesMixin
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from official_documents.models import (
+    BallotSOPN,
+    ElectionSOPN,
+    PageMatchingMethods,
+    SOPNProcessingStatus,
+)
+from sopn_parsing.helpers.party_matching import get_shared_matchers
+
+
+@patch("sopn_parsing.tasks.parse_raw_data_for_ballot")
+class TestBallotSOPNPipeline(TmpMediaRootMixin, UK2015ExamplesMixin, TestCase):
+    def setUp(self):
+        self.sopn = BallotSOPN.objects.create(
+            ballot=self.dulwich_post_ballot,
+            uploaded_file=SimpleUploadedFile("sopn.pdf", b"%PDF-1.4"),
+            source_url="example.com",
+        )
+
+    @patch.object(BallotSOPN, "extract_tables")
+    def test_parse_is_queued_until_commit(self, extract_tables, parse_tables):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.sopn.parse()
+        extract_tables.assert_not_called()
+        parse_tables.assert_not_called()
+        self.assertEqual(len(callbacks), 1)
+        self.sopn.refresh_from_db()
+        self.assertEqual(self.sopn.extract_status, SOPNProcessingStatus.QUEUED)
+        self.assertEqual(self.sopn.parse_status, SOPNProcessingStatus.QUEUED)
+
+    @patch.object(BallotSOPN, "extract_tables")
+    def test_pipeline_runs_each_stage(self, extract_tables, parse_tables):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sopn.parse()
+        extract_tables.assert_called_once()
+        parse_tables.assert_called_once_with(
+            self.dulwich_post_ballot, matchers=get_shared_matchers()
+        )
+        self.sopn.refresh_from_db()
+        self.assertEqual(
+            self.sopn.extract_status, SOPNProcessingStatus.SUCCEEDED
+        )
+        self.assertEqual(self.sopn.parse_status, SOPNProcessingStatus.SUCCEEDED)
+        self.assertEqual(self.sopn.processing_error, "")
+
+    @patch.object(
+        BallotSOPN, "extract_tables", side_effect=ValueError("Bad PDF")
+    )
+    def test_failed_stage_is_recorded(self, extract_tables, parse_tables):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sopn.parse()
+        parse_tables.assert_not_called()
+        self.sopn.refresh_from_db()
+        self.assertEqual(self.sopn.extract_status, SOPNProcessingStatus.FAILED)
+        self.assertEqual(
+            self.sopn.parse_status, SOPNProcessingStatus.NOT_STARTED
+        )
+        self.assertEqual(self.sopn.processing_error, "Bad PDF")
+
+
+@patch("sopn_parsing.tasks.ElectionSOPNPageSplitter")
+@patch("sopn_parsing.tasks.extract_pages_for_election_sopn")
+class TestSplitElectionSOPN(TmpMediaRootMixin, UK2015ExamplesMixin, TestCase):
+    def setUp(self):
+        self.election_sopn = ElectionSOPN.objects.create(
+            election=self.election,
+            uploaded_file=SimpleUploadedFile("sopn.pdf", b"%PDF-1.4"),
+            source_url="example.com",
+        )
+
+    def test_split_is_queued_until_commit(self, extract_pages, splitter):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.election_sopn.split()
+        extract_pages.assert_not_called()
+        self.assertEqual(len(callbacks), 1)
+        self.election_sopn.refresh_from_db()
+        self.assertEqual(
+            self.election_sopn.split_status, SOPNProcessingStatus.QUEUED
+        )
+        self.assertTrue(self.election_sopn.splitting)
+
+    def test_split_matches_pages(self, extract_pages, splitter):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.election_sopn.split()
+        extract_pages.assert_called_once_with(self.election_sopn)
+        splitter.assert_not_called()
+        self.election_sopn.refresh_from_db()
+        self.assertEqual(
+            self.election_sopn.split_status, SOPNProcessingStatus.SUCCEEDED
+        )
+        self.assertFalse(self.election_sopn.splitting)
+
+    def test_split_with_given_pages(self, extract_pages, splitter):
+        ballot_to_pages = {self.dulwich_post_ballot.ballot_paper_id: [0, 1]}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.election_sopn.split(ballot_to_pages=ballot_to_pages)
+        extract_pages.assert_not_called()
+        splitter.assert_called_once_with(self.election_sopn, ballot_to_pages)
+        splitter.return_value.split.assert_called_once_with(
+            method=PageMatchingMethods.MANUAL_MATCHED
+        )
+        self.election_sopn.refresh_from_db()
+        self.assertEqual(
+            self.election_sopn.split_status, SOPNProcessingStatus.SUCCEEDED
+        )
+
+    def test_failed_split_is_recorded(self, extract_pages, splitter):
+        extract_pages.side_effect = ValueError("No text")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.election_sopn.split()
+        self.election_sopn.refresh_from_db()
+        self.assertEqual(
+            self.election_sopn.split_status, SOPNProcessingStatus.FAILED
+        )
+        self.assertEqual(self.election_sopn.processing_error, "No text")
+
+    def test_replaced_document_is_ignored(self, extract_pages, splitter):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.election_sopn.split()
+        self.election_sopn.delete()
+        callbacks[0]()
+        extract_pages.assert_not_called()
@@ -0,0 +1,53 @@
+from candidates.models import LoggedAction
+from candidates.models.db import ActionType
+from candidates.tests.auth import TestUserMixin
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase
+from freezegun import freeze_time
+from wombles.context_processors import action_counts_processor
+
+
+class TestActionCountsProcessor(TestUserMixin, TestCase):
+    def make_action(self, action_type):
+        LoggedAction.objects.create(
+            user=self.user, action_type=action_type, ip_address="127.0.0.1"
+        )
+
+    def get_action_counts(self, user):
+        request = RequestFactory().get("/")
+        request.user = user
+        return action_counts_processor(request)
+
+    def test_anonymous(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_action_counts(AnonymousUser()), {})
+
+    def test_action_counts(self):
+        with freeze_time("2024-05-01 12:00"):
+            self.make_action(ActionType.CANDIDACY_CREATE)
+        with freeze_time("2024-06-01 12:00"):
+            self.make_action(ActionType.CANDIDACY_CREATE)
+            self.make_action(ActionType.PERSON_UPDATE)
+
+        with freeze_time("2024-06-10 12:00"):
+            context = self.get_action_counts(self.user)
+            with self.assertNumQueries(1):
+                self.assertEqual(
+                    dict(context["action_counts"]),
+                    {
+                        "candidacy_create": 2,
+                        "person_update": 1,
+                        "total_actions": 3,
+                        "last_months_actions": 2,
+                    },
+                )
+
+        # A new action is counted straight away
+        self.make_action(ActionType.PERSON_UPDATE)
+        context = self.get_action_counts(self.user)
+        self.assertEqual(context["action_counts"]["person_update"], 2)
+        self.assertEqual(context["action_counts"]["last_months_actions"], 1)
+
+    def test_not_fetched_unless_used(self):
+        with self.assertNumQueries(0):
+            self.get_action_counts(self.user)
@@ -327,6 +327,36 @@ SOURCE_HINTS = """
 
 # By default, cache successful results from MapIt for a day
 EE_CACHE_SECONDS = 86400
+# After that, keep serving them for another day while they're refreshed
+EE_CACHE_STALE_SECONDS = 86400
+# Cache unknown postcodes and coordinates for five minutes
+EE_NEGATIVE_CACHE_SECONDS = 300
+# How long a postcode or coordinates lookup waits for EE
+EE_LOOKUP_TIMEOUT = 5
+
+# How many requests the EveryElection importer makes at once, and how long
+# it waits for each one
+EE_MAX_CONCURRENT_REQUESTS = 4
+EE_REQUEST_TIMEOUT = 30
+
+# Look up the current ballots for a postcode in the local index imported by
+# `uk_import_postcode_divisions` before asking EveryElection
+USE_LOCAL_POSTCODE_LOOKUP = False
+
+# How long the results of a search by name are cached for
+PERSON_SEARCH_CACHE_SECONDS = 60
+
+# The leaderboards shown on the home page (the first one) and the leaderboard
+# page (all of them, after "All Time"). Each covers either the last `days`
+# days including today, or the days from `since` to `until` (or today)
+LEADERBOARD_WINDOWS = [
+    {"title": "In the last week", "days": 7},
+    {
+        "title": "Since the 4 July 2024 General Election Announcement",
+        "since": "2024-05-22",
+    },
+]
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -454,11 +484,17 @@ LOGGING = {
 CANDIDATE_BOT_USERNAME = "CandidateBot"
 RESULTS_BOT_USERNAME = "ResultsBot"
 TWITTER_BOT_USERNAME = "TwitterBot"
+DUPLICATE_BOT_USERNAME = "DuplicateBot"
 
 TEXTRACT_CONCURRENT_QUOTA = 30
 TEXTRACT_STAT_JOBS_PER_SECOND_QUOTA = 1
 TEXTRACT_BACKOFF_TIME = 10
 
+# How many processes to extract the text from election SOPN pages with
+SOPN_TEXT_EXTRACTION_WORKERS = int(
+    os.environ.get("SOPN_TEXT_EXTRACTION_WORKERS", 1)
+)
+
 SOPN_UPDATE_NOTIFICATION_EMAILS = os.environ.get(
     "SOPN_UPDATE_NOTIFICATION_EMAILS", "hello@democracyclub.org.uk"
 ).split(",")